@@ -71,10 +71,10 @@ keywords_graph = create_graph()
 
 async def extract_medical_keywords(query: str, session_id: str) -> Union[list[str], None]:
     """Public entry point to generate medical keywords from user input."""
+    # Single-shot extraction: no per-session state, so no checkpointer or thread_id
     messages = {'messages': [HumanMessage(content=query)]}
-    config = {'configurable': {'thread_id': session_id}}
 
-    async for output in keywords_graph.astream(messages, config, stream_mode='values'):
+    async for output in keywords_graph.astream(messages, stream_mode='values'):
         content = output['messages'][-1].content.strip()
 
     try:
@@ -9,13 +9,19 @@ It supports:
 - Chart generation (e.g., age distribution, recovery trends)
 """
 
+import asyncio
+import os
 import re
 from typing import List, Union
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage, AIMessageChunk
 
+from algorithms.llm.chat.checkpointer import get_checkpointer
+from algorithms.llm.chat.stream_parser import StreamClassifier
 from algorithms.llm.data_analysis.data_analysis import gen_analysis_graph, DataAnalysisState
+from algorithms.llm.data_analysis.executor import analysis_executor
+from algorithms.llm.data_analysis.profiler import load_profile, render_schema
 from config.settings import settings
 
 
@@ -37,7 +43,10 @@ class AnalysisChatService:
                 num_predict=2560,
             )
             graph = gen_analysis_graph(ollama_chat)
-            self._app = graph.compile()
+            # aget_state after the run needs a checkpointer
+            self._app = graph.compile(checkpointer=await get_checkpointer())
+            # Warm the sandbox pool so the first analysis does not pay interpreter startup
+            await analysis_executor.start()
 
     @property
     def app(self):
@@ -55,34 +64,46 @@ async def get_analysis_chat_service():
     yield analysis_chat_service
 
 
-async def analysis_graph_generate(query: str, session_id: str, file_path: Union[str, List[str]]):
+def _schema_block(path: str) -> str:
+    return render_schema(load_profile(path), os.path.basename(path))
+
+
+async def analysis_graph_generate(
+    query: str,
+    session_id: str,
+    file_path: Union[str, List[str]],
+    cancel_event: asyncio.Event | None = None,
+):
     async with get_analysis_chat_service() as service:
-        config = {'configurable': {'thread_id': session_id}}
-        state = DataAnalysisState(
-            messages=HumanMessage(content=query),
-            question=query,
-            file_path=file_path,
-            execution_result={}
-        )
+        config = {'configurable': {'thread_id': f'analysis:{session_id}'}}
+        paths = [file_path] if isinstance(file_path, str) else file_path
         try:
-            content_type = 'text'
-            code_flag = 1
-            async for msg in service.app.astream(state, config, stream_mode='messages'):
-                if msg[1].get("langgraph_node") == "judge":
-                    continue
-                if isinstance(msg[0], AIMessageChunk):
-                    chunk = msg[0].content
-                    if chunk.startswith('<think>'):
-                        yield {'type': 'think', 'content': chunk[8:]}
-                        continue
-                    elif chunk.endswith('</think>'):
-                        yield {'type': 'think', 'content': chunk[:-8]}
-                        continue
-                    if '```' in chunk:
-                        code_flag += 1
-                        yield {'type': 'code' if code_flag % 2 == 0 else 'text', 'content': chunk.replace('```python', '').replace('```', '').strip()}
+            # Compact per-column schema instead of raw rows keeps the prompt small; a missing or
+            # corrupt profile becomes the error frame below like any other failure
+            data_schema = '\n\n'.join(
+                await asyncio.gather(*[asyncio.to_thread(_schema_block, p) for p in paths])
+            )
+            state = DataAnalysisState(
+                messages=HumanMessage(content=query),
+                question=query,
+                file_path=file_path,
+                data_schema=data_schema,
+                execution_result={}
+            )
+            # Markers may span chunks, so classification is stateful across the whole answer
+            classifier = StreamClassifier()
+            # Closing the graph stream cancels the running node and its Ollama HTTP request
+            async with aclosing(service.app.astream(state, config, stream_mode='messages')) as stream:
+                async for msg in stream:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+                    if msg[1].get("langgraph_node") == "judge":
                         continue
-                    yield {'type': content_type, 'content': chunk}
+                    if isinstance(msg[0], AIMessageChunk):
+                        for frame in classifier.feed(msg[0].content):
+                            yield frame
+            for frame in classifier.flush():
+                yield frame
 
             final_state = await service.app.aget_state(config)
             if final_state.values['should_analysis']:
@@ -10,14 +10,19 @@ Key Features:
 - Async streaming reply generation
 """
 
+import asyncio
 from langgraph.graph import StateGraph, START, END
 from typing import Union
 from langchain_core.messages import AIMessageChunk
 from langchain_ollama import ChatOllama
-from contextlib import asynccontextmanager
+from contextlib import aclosing, asynccontextmanager
 
 from algorithms.llm.agent.rag_agent import gen_rag_graph  # defines the LangGraph pipeline
+from app.admin.crud.crud_chat_file import chat_file_dao  # legacy inline file text
+from algorithms.llm.chat.checkpointer import get_checkpointer  # bounded per-session graph state
 from config.settings import settings  # environment config loader
+from database.db_mysql import async_read_session
+from utils.blob_store import chat_blob_store  # parsed file text, referenced by hash
 
 # Set up model endpoint (from environment)
 OLLAMA_API_URL = settings.OLLAMA_API_URL
@@ -42,7 +47,7 @@ class ChatService:
                 num_predict=2560,
             )
             graph = gen_rag_graph(ollama_chat)
-            self._app = graph.compile()
+            self._app = graph.compile(checkpointer=await get_checkpointer())
 
     @property
     def app(self):
@@ -62,24 +67,36 @@ async def get_chat_service():
     yield chat_service
 
 
-def rewrite_query(query: dict) -> str:
+async def _file_text(f: dict) -> str:
+    """Parsed text of an attached file, loaded only when a turn needs it."""
+    if f.get('content_hash'):
+        return chat_blob_store.get(f['content_hash'])
+    # Rows created before the blob store carry inline file_content (a deferred column) and no content_hash
+    async with async_read_session() as db:
+        row = await chat_file_dao.get_with_content(db, f['file_id'])
+    return (row.file_content if row else None) or ''
+
+
+async def rewrite_query(query: dict) -> str:
     """Inject retrieved content into prompt (if any)"""
     if query.get('search_results'):
         search = '\n'.join([f['title'] + f['text'] for f in query['search_results']])
         query['content'] = f"Based on the following search results:\n{search}\n\nQuestion: {query['content']}"
     elif query.get('files'):
-        files = '\n'.join([f['file_content'] for f in query['files']])
+        files = '\n'.join([await _file_text(f) for f in query['files']])
         query['content'] = f"Based on the uploaded documents:\n{files}\n\nQuestion: {query['content']}"
     return query['content']
 
 
-async def chat_generate(session_id: str, query: dict, kb_data: Union[dict, None]):
+async def chat_generate(session_id: str, query: dict, kb_data: Union[dict, None], cancel_event: asyncio.Event | None = None):
     """
     Async generator that streams AI responses using LangGraph and Ollama.
+    Stops as soon as `cancel_event` is set (e.g. the SSE client went away).
     """
-    input_message = rewrite_query(query)
+    input_message = await rewrite_query(query)
 
     async with get_chat_service() as service:
+        config = {'configurable': {'thread_id': f'chat:{session_id}'}}
         state = {
             "messages": [input_message],
             "history": [],
@@ -93,8 +110,12 @@ async def chat_generate(session_id: str, query: dict, kb_data: Union[dict, None]
             "retrieve_retry": 0,
         }
 
-        async for msg in service.app.astream(state, stream_mode="messages"):
-            if msg[1].get("langgraph_node") == "judge":
-                continue
-            if isinstance(msg[0], AIMessageChunk):
-                yield msg[0].content
+        # Closing the graph stream cancels the running node and its Ollama HTTP request
+        async with aclosing(service.app.astream(state, config, stream_mode="messages")) as stream:
+            async for msg in stream:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                if msg[1].get("langgraph_node") == "judge":
+                    continue
+                if isinstance(msg[0], AIMessageChunk):
+                    yield msg[0].content
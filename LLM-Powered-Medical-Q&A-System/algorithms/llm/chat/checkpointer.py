@@ -0,0 +1,180 @@
+"""
+📍 Path: backend/algorithms/llm/chat/checkpointer.py
+
+📌 Shared, bounded LangGraph checkpointer for chat and analysis sessions
+
+Graph state is checkpointed per `thread_id` in two tiers. Each graph namespaces its thread ids
+(`chat:<session_id>`, `analysis:<session_id>`) so the two graphs never read each other's state
+for the same session:
+- a hot in-memory tier holding at most CHECKPOINT_MAX_THREADS sessions (LRU)
+- an optional durable tier (SQLite or Redis) written through on every put
+
+Sessions this worker has not touched for CHECKPOINT_TTL_SECONDS are dropped from its memory
+tier. The durable tier is never expired from here: another worker may still be serving the
+session, and only the store itself knows when it was last used. Redis expires idle keys
+natively (refreshed on read); SQLite keeps sessions until they are deleted.
+With a durable tier, a session that falls out of memory is read back from it; with
+CHECKPOINT_BACKEND=memory there is nothing to fall back to, and a session evicted for
+capacity or idleness loses its history.
+
+The in-memory tier assumes a session keeps talking to the same worker. Without sticky
+sessions across several workers, set CHECKPOINT_MAX_THREADS=0 to always read the durable tier.
+Only the async API is implemented; graphs are driven with `astream` / `aget_state`.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from urllib.parse import quote_plus
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from config.settings import settings
+
+
+class TieredCheckpointSaver(BaseCheckpointSaver):
+    def __init__(self, backing: BaseCheckpointSaver | None, max_threads: int, ttl_seconds: int):
+        super().__init__()
+        self.memory = InMemorySaver()
+        self.backing = backing
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        # Without a durable tier memory is the only store, so it is always used
+        self.use_memory = bool(max_threads) or backing is None
+        self._threads: OrderedDict[str, float] = OrderedDict()  # thread_id -> last access
+
+    def _touch(self, thread_id: str) -> None:
+        if not self.use_memory:
+            return
+        self._threads[thread_id] = time.monotonic()
+        self._threads.move_to_end(thread_id)
+        # With a durable tier this only frees memory; without one the evicted session is gone
+        while self.max_threads and len(self._threads) > self.max_threads:
+            evicted, _ = self._threads.popitem(last=False)
+            self.memory.delete_thread(evicted)
+
+    async def _expire(self) -> None:
+        now = time.monotonic()
+        while self._threads:
+            thread_id, last_access = next(iter(self._threads.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            # Memory only: this worker's last access says nothing about other workers'
+            del self._threads[thread_id]
+            self.memory.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        await self._expire()
+        thread_id = config['configurable']['thread_id']
+        checkpoint = None
+        if thread_id in self._threads:
+            checkpoint = await self.memory.aget_tuple(config)
+        if checkpoint is None and self.backing is not None:
+            checkpoint = await self.backing.aget_tuple(config)
+        if checkpoint is not None:
+            self._touch(thread_id)
+        return checkpoint
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        # The durable tier has the full history; memory may only hold recent checkpoints
+        source = self.backing or self.memory
+        async for checkpoint in source.alist(config, filter=filter, before=before, limit=limit):
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config['configurable']['thread_id']
+        if self.use_memory:
+            self._touch(thread_id)
+            next_config = await self.memory.aput(config, checkpoint, metadata, new_versions)
+        if self.backing is not None:
+            next_config = await self.backing.aput(config, checkpoint, metadata, new_versions)
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = '',
+    ) -> None:
+        if self.use_memory:
+            await self.memory.aput_writes(config, writes, task_id, task_path)
+        if self.backing is not None:
+            await self.backing.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self._threads.pop(thread_id, None)
+        self.memory.delete_thread(thread_id)
+        if self.backing is not None:
+            await self.backing.adelete_thread(thread_id)
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        return self.memory.get_next_version(current, channel)
+
+
+async def _create_backing() -> BaseCheckpointSaver | None:
+    if settings.CHECKPOINT_BACKEND == 'sqlite':
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        conn = await aiosqlite.connect(settings.CHECKPOINT_SQLITE_PATH)
+        saver = AsyncSqliteSaver(conn)
+        await saver.setup()
+        return saver
+
+    if settings.CHECKPOINT_BACKEND == 'redis':
+        from langgraph.checkpoint.redis.aio import AsyncRedisSaver
+
+        redis_url = (
+            f'redis://:{quote_plus(settings.REDIS_PASSWORD)}@{settings.REDIS_HOST}:'
+            f'{settings.REDIS_PORT}/{settings.REDIS_DATABASE}'
+        )
+        # Redis expires idle sessions natively, including ones this worker never saw
+        saver = AsyncRedisSaver(
+            redis_url=redis_url,
+            ttl={'default_ttl': settings.CHECKPOINT_TTL_SECONDS / 60, 'refresh_on_read': True},
+        )
+        await saver.asetup()
+        return saver
+
+    return None
+
+
+_checkpointer: TieredCheckpointSaver | None = None
+_checkpointer_lock = asyncio.Lock()
+
+
+async def get_checkpointer() -> TieredCheckpointSaver:
+    """Return the process-wide checkpointer, creating the durable tier on first use."""
+    global _checkpointer
+    async with _checkpointer_lock:
+        if _checkpointer is None:
+            _checkpointer = TieredCheckpointSaver(
+                await _create_backing(),
+                max_threads=settings.CHECKPOINT_MAX_THREADS,
+                ttl_seconds=settings.CHECKPOINT_TTL_SECONDS,
+            )
+    return _checkpointer
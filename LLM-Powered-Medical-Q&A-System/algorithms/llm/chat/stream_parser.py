@@ -0,0 +1,113 @@
+"""
+📍 Path: backend/algorithms/llm/chat/stream_parser.py
+
+📌 Incremental classifier for streamed model output
+
+Reasoning models stream `<think>...</think>` blocks, Markdown code fences and plain text
+as arbitrary token chunks, so a marker can be split across chunks (e.g. `<thi` + `nk>`).
+`StreamClassifier` is a small state machine that:
+- finds markers with `str.find` on the unconsumed text (no per-character loop)
+- holds back only a trailing partial marker until the next chunk decides it
+- drops the fence language tag (```python followed by a newline) and the markers themselves;
+  a first line that could not be a tag (spaces, brackets, `=`) is kept as code
+- merges consecutive same-type spans into one frame per chunk
+"""
+
+import re
+from typing import List, Tuple
+
+TEXT, THINK, CODE = 'text', 'think', 'code'
+
+# state -> [(marker, next state)]
+_TRANSITIONS = {
+    TEXT: [('<think>', THINK), ('```', CODE)],
+    THINK: [('</think>', TEXT)],
+    CODE: [('```', TEXT)],
+}
+# A fence language tag is a single short word like python, c++, c#, objective-c or .net;
+# anything else on the opening line is code
+_LANG_TAG = re.compile(r'[\w+#.-]*')
+_MAX_LANG_TAG = 32
+
+
+def _could_be_lang_tag(text: str) -> bool:
+    return len(text) <= _MAX_LANG_TAG and _LANG_TAG.fullmatch(text) is not None
+
+
+def _partial_marker_len(buf: str, markers: List[Tuple[str, str]]) -> int:
+    """Length of the longest suffix of buf that is a proper prefix of a marker."""
+    longest = 0
+    for marker, _ in markers:
+        for size in range(min(len(marker) - 1, len(buf)), longest, -1):
+            if buf.endswith(marker[:size]):
+                longest = size
+                break
+    return longest
+
+
+class StreamClassifier:
+    def __init__(self):
+        self.state = TEXT
+        self._pending = ''
+        self._in_lang_tag = False
+
+    @staticmethod
+    def _emit(frames: list, kind: str, content: str) -> None:
+        if not content:
+            return
+        if frames and frames[-1]['type'] == kind:
+            frames[-1]['content'] += content
+        else:
+            frames.append({'type': kind, 'content': content})
+
+    def feed(self, chunk: str) -> List[dict]:
+        """Consume one streamed chunk and return the frames it completes."""
+        buf = self._pending + chunk if self._pending else chunk
+        self._pending = ''
+        frames: List[dict] = []
+
+        while buf:
+            if self._in_lang_tag:
+                newline = buf.find('\n')
+                fence = buf.find('```')
+                if fence != -1 and (newline == -1 or fence < newline):
+                    # Fence closed on its opening line (```x = 1```): there was no tag, it was code
+                    self._in_lang_tag = False
+                    continue
+                if newline == -1 and _could_be_lang_tag(buf):
+                    self._pending = buf
+                    return frames
+                self._in_lang_tag = False
+                if newline != -1 and _could_be_lang_tag(buf[:newline].rstrip('\r')):
+                    buf = buf[newline + 1:]
+                    continue
+
+            markers = _TRANSITIONS[self.state]
+            hit, hit_at = None, -1
+            for marker, next_state in markers:
+                at = buf.find(marker)
+                if at != -1 and (hit_at == -1 or at < hit_at):
+                    hit, hit_at = (marker, next_state), at
+
+            if hit is None:
+                keep = _partial_marker_len(buf, markers)
+                self._emit(frames, self.state, buf[: len(buf) - keep])
+                self._pending = buf[len(buf) - keep:]
+                return frames
+
+            marker, next_state = hit
+            self._emit(frames, self.state, buf[:hit_at])
+            buf = buf[hit_at + len(marker):]
+            self._in_lang_tag = marker == '```' and next_state == CODE
+            self.state = next_state
+        return frames
+
+    def flush(self) -> List[dict]:
+        """Emit whatever is still held back at the end of the stream."""
+        frames: List[dict] = []
+        # Text held as a possible language tag never saw its newline, so it was code
+        if self._pending:
+            self._emit(frames, self.state, self._pending)
+        self._pending = ''
+        self._in_lang_tag = False
+        return frames
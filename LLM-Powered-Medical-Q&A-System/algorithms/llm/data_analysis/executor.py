@@ -0,0 +1,279 @@
+"""
+📍 Path: backend/algorithms/llm/data_analysis/executor.py
+
+📌 Sandboxed execution engine for model-generated analysis code
+
+Generated Pandas/Matplotlib code never runs inside the serving process. It is sent to a
+pool of pre-warmed worker processes that:
+- import pandas / numpy / matplotlib (Agg backend) once at startup, then drop their environment
+  so credentials passed to the server are not visible to generated code
+- run each snippet under an address-space limit and a per-run CPU-time budget
+- give snippets a reduced set of builtins: no open / eval / exec / compile, and imports limited
+  to the analysis stack (_ALLOWED_MODULES)
+- hand figures and large results back through shared memory instead of the pipe
+
+A worker that exceeds its limits (or hangs past the wall-clock timeout) is killed and replaced,
+so one slow `groupby` on a large hospital export cannot block the API.
+The builtin restrictions stop accidental or casual misuse; they are not a security boundary
+on their own, which is why the code also runs in a separate, resource-limited process.
+
+Contract for generated code:
+- the uploaded table is available as `df` (a list of frames when several files are given),
+  loaded from the per-session Arrow cache (see frame_cache.py) when a session id is passed
+- assign the answer to `result`; any open Matplotlib figure is returned as PNG
+"""
+
+import asyncio
+import base64
+import builtins
+import io
+import multiprocessing as mp
+import os
+import resource
+import traceback
+from multiprocessing import shared_memory
+from typing import List, Union
+
+from loguru import logger
+
+from config.settings import settings
+
+_ctx = mp.get_context('spawn')
+
+_ALLOWED_MODULES = frozenset({
+    'pandas', 'numpy', 'matplotlib', 'math', 'statistics', 'datetime', 're', 'collections', 'itertools',
+    'functools', 'json',
+})
+_BLOCKED_BUILTINS = frozenset({
+    'open', 'eval', 'exec', 'compile', 'input', 'breakpoint', 'help', 'exit', 'quit', 'globals', 'locals', 'vars',
+})
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or name.partition('.')[0] not in _ALLOWED_MODULES:
+        raise ImportError(f'Importing {name!r} is not allowed in analysis code')
+    return builtins.__import__(name, globals, locals, fromlist, level)
+
+
+def _restricted_builtins() -> dict:
+    allowed = {name: value for name, value in vars(builtins).items() if name not in _BLOCKED_BUILTINS}
+    allowed['__import__'] = _restricted_import
+    return allowed
+
+
+def _load_frame(path: str, session_id: str | None):
+    from algorithms.llm.data_analysis.frame_cache import frame_cache, read_table
+
+    if session_id:
+        return frame_cache.load(session_id, path)
+    return read_table(path)
+
+
+def _to_shm(data: bytes) -> str:
+    shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    shm.buf[: len(data)] = data
+    name = shm.name
+    shm.close()
+    return name
+
+
+def _run_one(
+    code: str, file_path: Union[str, List[str]], session_id: str | None, cpu_seconds: int, safe_builtins: dict
+) -> dict:
+    import matplotlib.pyplot as plt
+    import numpy as np
+    import pandas as pd
+
+    # RLIMIT_CPU is cumulative for the process, so grant the budget on top of what was used so far
+    used = int(resource.getrusage(resource.RUSAGE_SELF).ru_utime + resource.getrusage(resource.RUSAGE_SELF).ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds if hard == resource.RLIM_INFINITY else min(used + cpu_seconds, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+    paths = [file_path] if isinstance(file_path, str) else list(file_path)
+    frames = [_load_frame(p, session_id) for p in paths]
+    scope = {
+        '__builtins__': safe_builtins,
+        'pd': pd,
+        'np': np,
+        'plt': plt,
+        'df': frames[0] if len(frames) == 1 else frames,
+    }
+    plt.close('all')
+    exec(compile(code, '<analysis>', 'exec'), scope)
+
+    if plt.get_fignums():
+        buf = io.BytesIO()
+        plt.gcf().savefig(buf, format='png', bbox_inches='tight')
+        plt.close('all')
+        png = buf.getvalue()
+        return {'type': 'image', 'shm': _to_shm(png), 'size': len(png)}
+
+    result = scope.get('result')
+    text = result.to_string() if isinstance(result, (pd.DataFrame, pd.Series)) else str(result)
+    data = text.encode('utf-8')
+    return {'type': 'text', 'shm': _to_shm(data), 'size': len(data)}
+
+
+def _worker_main(conn, memory_limit: int) -> None:
+    """Worker loop: warm imports once, then execute snippets until the pipe closes."""
+    import matplotlib
+
+    matplotlib.use('Agg')
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import pyarrow  # noqa: F401
+
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    os.environ.clear()
+    safe_builtins = _restricted_builtins()
+    conn.send({'ready': True})
+
+    while True:
+        try:
+            code, file_path, session_id, cpu_seconds = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = _run_one(code, file_path, session_id, cpu_seconds, safe_builtins)
+        except MemoryError:
+            reply = {'type': 'error', 'value': 'Analysis exceeded the memory limit'}
+        except Exception:
+            reply = {'type': 'error', 'value': traceback.format_exc(limit=3)}
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child_conn = _ctx.Pipe()
+        self.process = _ctx.Process(
+            target=_worker_main,
+            args=(child_conn, settings.ANALYSIS_MEMORY_LIMIT_MB * 1024 * 1024),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self) -> None:
+        if not self.ready:
+            self.conn.recv()
+            self.ready = True
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class AnalysisExecutor:
+    """Pool of pre-warmed worker processes for running generated analysis code."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: asyncio.Queue[_Worker] | None = None
+        self._workers: set[_Worker] = set()  # idle and busy
+        self._start_lock = asyncio.Lock()
+        self._respawns: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _spawn() -> _Worker:
+        worker = _Worker()
+        worker.wait_ready()
+        return worker
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            # Process start and warm-up imports block, so keep them off the event loop
+            workers = await asyncio.gather(*[asyncio.to_thread(self._spawn) for _ in range(self.size)])
+            self._workers.update(workers)
+            self._idle = asyncio.Queue()
+            for worker in workers:
+                self._idle.put_nowait(worker)
+        logger.info(f'Analysis executor started with {self.size} workers')
+
+    async def _replace(self, worker: _Worker) -> None:
+        """Kill a worker that hit its limits and put a fresh one in the pool."""
+        self._workers.discard(worker)
+        await asyncio.to_thread(worker.kill)
+        if self._idle is None:
+            return
+        fresh = await asyncio.to_thread(_Worker)
+        if self._idle is None:
+            # Shut down while the replacement was starting
+            await asyncio.to_thread(fresh.kill)
+            return
+        self._workers.add(fresh)
+        self._idle.put_nowait(fresh)
+
+    def _give_back(self, worker: _Worker) -> None:
+        if self._idle is None:
+            # Shut down while this worker was busy
+            self._workers.discard(worker)
+            worker.kill()
+        else:
+            self._idle.put_nowait(worker)
+
+    async def shutdown(self) -> None:
+        """Kill every worker, including ones still running a snippet."""
+        if self._idle is None:
+            return
+        self._idle = None
+        workers, self._workers = list(self._workers), set()
+        await asyncio.gather(*[asyncio.to_thread(worker.kill) for worker in workers])
+
+    @staticmethod
+    def _read_shm(name: str, size: int) -> bytes:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            return bytes(shm.buf[:size])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _call(self, worker: _Worker, code: str, file_path: Union[str, List[str]], session_id: str | None) -> dict | None:
+        worker.wait_ready()
+        worker.conn.send((code, file_path, session_id, settings.ANALYSIS_CPU_SECONDS))
+        if not worker.conn.poll(settings.ANALYSIS_TIMEOUT_SECONDS):
+            return None
+        try:
+            return worker.conn.recv()
+        except EOFError:
+            # Worker was killed by the kernel (CPU limit hit)
+            return None
+
+    async def run(self, code: str, file_path: Union[str, List[str]], session_id: str | None = None) -> dict:
+        """Execute generated code and return {'type': 'text'|'image'|'error', 'value': ...}.
+
+        Images are returned as base64-encoded PNG so the result can go straight into an SSE frame.
+        With a session_id, tables are loaded through the per-session columnar frame cache.
+        """
+        await self.start()
+        worker = await self._idle.get()
+        try:
+            reply = await asyncio.to_thread(self._call, worker, code, file_path, session_id)
+        except BaseException:
+            # Don't await while being cancelled; respawn in the background
+            task = asyncio.create_task(self._replace(worker))
+            self._respawns.add(task)
+            task.add_done_callback(self._respawns.discard)
+            raise
+
+        if reply is None:
+            await self._replace(worker)
+            return {'type': 'error', 'value': 'Analysis exceeded the time limit'}
+        self._give_back(worker)
+
+        if reply['type'] == 'error':
+            return reply
+        data = self._read_shm(reply['shm'], reply['size'])
+        if reply['type'] == 'image':
+            return {'type': 'image', 'value': base64.b64encode(data).decode('ascii')}
+        return {'type': 'text', 'value': data.decode('utf-8')}
+
+
+analysis_executor = AnalysisExecutor(size=settings.ANALYSIS_WORKERS)
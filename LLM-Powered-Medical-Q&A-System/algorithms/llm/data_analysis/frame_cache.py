@@ -0,0 +1,144 @@
+"""
+📍 Path: backend/algorithms/llm/data_analysis/frame_cache.py
+
+📌 Columnar cache for uploaded analysis tables
+
+Hospital exports are parsed from CSV/XLSX once per session, their dtypes tightened,
+and written as uncompressed Arrow IPC (Feather v2). Later analysis turns memory-map
+the Arrow file instead of re-parsing the spreadsheet.
+
+- Cache key: session id + source path + source mtime/size, so re-uploading a file invalidates it
+- Eviction: least-recently-used files are removed once the cache exceeds its byte budget
+- Safe across the executor's worker processes: writes are atomic renames on local disk
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from pyarrow import feather
+
+from config.path_conf import LLM_CHAT_DIR
+from config.settings import settings
+
+# Object columns with at most this share of distinct values become categoricals
+_CATEGORY_RATIO = 0.5
+
+
+def infer_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Tighten pandas' default object columns into numeric, datetime or categorical dtypes.
+
+    A column is converted only when every non-null value parses; a single stray value would
+    otherwise be silently replaced by NaN/NaT. Zero-padded codes (MRNs, ZIP codes) stay text.
+    """
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object:
+            continue
+        non_null = series.notna().sum()
+        if not non_null:
+            continue
+
+        zero_padded = series.dropna().astype(str).str.strip().str.fullmatch(r'[+-]?0\d+').any()
+        if not zero_padded:
+            numeric = pd.to_numeric(series, errors='coerce')
+            if numeric.notna().sum() == non_null:
+                df[col] = numeric
+                continue
+
+            datetimes = pd.to_datetime(series, errors='coerce', format='mixed')
+            if datetimes.notna().sum() == non_null:
+                df[col] = datetimes
+                continue
+
+        if series.nunique(dropna=True) <= non_null * _CATEGORY_RATIO:
+            df[col] = series.astype('category')
+        else:
+            df[col] = series.astype(str).where(series.notna(), None)
+    return df
+
+
+def read_table(path: str) -> pd.DataFrame:
+    """Read a CSV/XLSX upload into a DataFrame with inferred dtypes."""
+    # Read every column as text so infer_dtypes sees the raw values (e.g. leading zeros)
+    if path.lower().endswith(('.xls', '.xlsx')):
+        df = pd.read_excel(path, dtype=str)
+    else:
+        df = pd.read_csv(path, dtype=str)
+    # Arrow requires string column names
+    df.columns = [str(c) for c in df.columns]
+    return infer_dtypes(df)
+
+
+class FrameCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _entry(self, session_id: str, path: str) -> tuple[str, str]:
+        """Return (session dir, cache file path) for the current version of the source file."""
+        stat = os.stat(path)
+        source_key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        session_dir = os.path.join(self.root, session_id)
+        return session_dir, os.path.join(session_dir, f'{source_key}-{stat.st_mtime_ns}-{stat.st_size}.arrow')
+
+    def load(self, session_id: str, path: str) -> pd.DataFrame:
+        """Return the table at path, converting it to the columnar cache on first use."""
+        session_dir, cached = self._entry(session_id, path)
+        if os.path.exists(cached):
+            # Touch for LRU ordering; the file may have been evicted by another worker meanwhile
+            try:
+                os.utime(cached)
+                return feather.read_table(cached, memory_map=True).to_pandas()
+            except FileNotFoundError:
+                pass
+
+        df = read_table(path)
+        os.makedirs(session_dir, exist_ok=True)
+        # A changed upload leaves older versions of the same source behind
+        prefix = os.path.basename(cached).split('-')[0]
+        for name in os.listdir(session_dir):
+            if name.startswith(prefix) and name != os.path.basename(cached):
+                os.remove(os.path.join(session_dir, name))
+
+        fd, tmp_path = tempfile.mkstemp(dir=session_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, cached)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._evict()
+        return df
+
+    def _evict(self) -> None:
+        entries = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith('.arrow'):
+                    full = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(full)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, full))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, full in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(full)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def drop_session(self, session_id: str) -> None:
+        shutil.rmtree(os.path.join(self.root, session_id), ignore_errors=True)
+
+
+frame_cache = FrameCache(os.path.join(LLM_CHAT_DIR, 'frame_cache'), settings.ANALYSIS_CACHE_MAX_BYTES)
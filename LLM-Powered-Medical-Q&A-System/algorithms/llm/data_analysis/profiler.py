@@ -0,0 +1,107 @@
+"""
+📍 Path: backend/algorithms/llm/data_analysis/profiler.py
+
+📌 Schema profiling for uploaded analysis tables
+
+Instead of pasting raw rows into the prompt, the analysis graph receives a compact
+schema summary of each uploaded table:
+- column dtype, null rate and distinct count
+- quantiles for numeric columns, min/max for datetime columns
+- a few representative sample values
+
+The profile is computed once at upload time with column-wise (vectorized) pandas
+operations and stored next to the file as `<file>.schema.json`.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from algorithms.llm.data_analysis.frame_cache import read_table
+
+_QUANTILES = [0, 0.25, 0.5, 0.75, 1]
+_SAMPLES = 3
+
+
+def _clean(value):
+    """Make numpy / pandas scalars JSON-friendly."""
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, 4)
+    return value
+
+
+def profile_frame(df: pd.DataFrame) -> dict:
+    """Build a schema profile with one pass per statistic over all columns."""
+    null_rates = df.isna().mean()
+    distinct = df.nunique(dropna=True)
+    numeric = df.select_dtypes('number')
+    quantiles = numeric.quantile(_QUANTILES) if not numeric.empty else pd.DataFrame()
+    datetimes = df.select_dtypes('datetime')
+    dt_min, dt_max = datetimes.min(), datetimes.max()
+
+    columns = []
+    for col in df.columns:
+        info = {
+            'name': str(col),
+            'dtype': str(df[col].dtype),
+            'null_rate': round(float(null_rates[col]), 4),
+            'distinct': int(distinct[col]),
+        }
+        if col in quantiles.columns:
+            info['quantiles'] = [_clean(v) for v in quantiles[col].tolist()]
+            info['samples'] = []
+        elif col in datetimes.columns:
+            info['range'] = [_clean(dt_min[col]), _clean(dt_max[col])]
+            info['samples'] = []
+        else:
+            # Most frequent values are more representative than the first rows
+            info['samples'] = [_clean(v) for v in df[col].value_counts(dropna=True).index[:_SAMPLES]]
+        columns.append(info)
+    return {'rows': len(df), 'columns': columns}
+
+
+def _profile_path(file_path: str) -> str:
+    return f'{file_path}.schema.json'
+
+
+def profile_table(file_path: str) -> dict:
+    """Profile an uploaded table and persist the result next to it."""
+    profile = profile_frame(read_table(file_path))
+    profile['source_mtime_ns'] = os.stat(file_path).st_mtime_ns
+    with open(_profile_path(file_path), 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False)
+    return profile
+
+
+def load_profile(file_path: str) -> dict:
+    """Return the stored profile, recomputing it when missing or stale."""
+    try:
+        with open(_profile_path(file_path), encoding='utf-8') as f:
+            profile = json.load(f)
+        if profile.get('source_mtime_ns') == os.stat(file_path).st_mtime_ns:
+            return profile
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return profile_table(file_path)
+
+
+def render_schema(profile: dict, name: str) -> str:
+    """Render a profile as a compact prompt block, one line per column."""
+    lines = [f'Table {name}: {profile["rows"]} rows, {len(profile["columns"])} columns']
+    for col in profile['columns']:
+        parts = [f'- {col["name"]} ({col["dtype"]})', f'nulls={col["null_rate"]:.1%}', f'distinct={col["distinct"]}']
+        if 'quantiles' in col:
+            parts.append(f'min/q1/median/q3/max={col["quantiles"]}')
+        if 'range' in col:
+            parts.append(f'range={col["range"][0]}..{col["range"][1]}')
+        if col['samples']:
+            parts.append(f'e.g. {col["samples"]}')
+        lines.append(' '.join(parts))
+    return '\n'.join(lines)
@@ -15,6 +15,7 @@ Supported formats:
 - Image files (.png, .jpg, .tiff) via OCR
 """
 
+import mmap
 import os
 import pandas as pd
 
@@ -70,13 +71,19 @@ def file_parse(file_path: str) -> str:
 
     elif file_type == 'csv':
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = [line.strip().split(',') for line in f if line.strip()]
-            if not lines:
+            if os.path.getsize(file_path) == 0:
                 return 'Warning: empty file'
 
-            max_cols = max(len(line) for line in lines)
-            df = pd.read_csv(file_path, header=None, dtype=str, names=range(max_cols))
+            # Scan the memory-mapped file for the widest row without decoding it into Python strings
+            max_cols = 0
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b''):
+                    if line.strip():
+                        max_cols = max(max_cols, line.count(b',') + 1)
+            if not max_cols:
+                return 'Warning: empty file'
+
+            df = pd.read_csv(file_path, header=None, dtype=str, names=range(max_cols), memory_map=True)
             df_cleaned = df.dropna(how='all').dropna(axis=1, how='all')
             if df_cleaned.empty:
                 return 'Warning: no valid data'
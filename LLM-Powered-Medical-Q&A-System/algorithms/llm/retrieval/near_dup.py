@@ -0,0 +1,313 @@
+"""
+📍 Path: backend/algorithms/llm/retrieval/near_dup.py
+
+📌 Chunk-level near-duplicate detection for knowledge bases (MinHash + LSH)
+
+Guideline revisions and re-uploaded copies share most of their text. Each chunk gets a
+MinHash signature over word 5-shingles (CJK characters count as words), and an LSH
+index over the banded signatures finds earlier chunks whose estimated Jaccard
+similarity reaches the threshold in roughly constant time per chunk.
+
+- Index time: a near-duplicate chunk is collapsed onto the first chunk seen with that
+  content (its canonical chunk) and does not need to be embedded
+- Retrieval time: hits from the same duplicate group are suppressed so they don't take
+  several top-k slots
+- Documents whose chunks are mostly duplicates of another document are reported
+
+Signatures are 128 x uint32 (512 bytes) per chunk. An index is tied to its MinHash
+parameters (permutations, shingle size, seed); `load` refuses files built with others.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import unicodedata
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+
+import numpy as np
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# One CJK character or one run of letters/digits is a token
+_CJK = r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]'
+_TOKEN = re.compile(rf'{_CJK}|(?:(?!{_CJK})[^\W_])+')
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(unicodedata.normalize('NFKC', text).lower())
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set[str]:
+        tokens = tokenize(text)
+        k = self.shingle_size
+        if len(tokens) <= k:
+            return {' '.join(tokens)} if tokens else set()
+        return {' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """MinHash signature of the text, or None when it has no tokens at all."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        # Universal hashing (a*x + b) mod p, one permutation per column; overflow wraps like datasketch
+        permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Jaccard similarity estimated from two MinHash signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def _integrate(f: Callable[[float], float], lo: float, hi: float, steps: int = 200) -> float:
+    width = (hi - lo) / steps
+    return sum(f(lo + (i + 0.5) * width) for i in range(steps)) * width
+
+
+def lsh_params(num_perm: int, threshold: float, false_neg_weight: float = 0.9) -> tuple[int, int]:
+    """Bands x rows minimizing weighted false positives below and false negatives above the threshold.
+
+    Candidates are verified against the full signature, so a false positive only costs one
+    comparison while a false negative is a missed duplicate; misses are weighted higher.
+    """
+    best, best_error = (num_perm, 1), float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        false_pos = _integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+        false_neg = _integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+        error = (1 - false_neg_weight) * false_pos + false_neg_weight * false_neg
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDupIndex:
+    """MinHash LSH over the chunks of one knowledge base.
+
+    Only canonical chunks are placed in the LSH buckets; collapsed chunks keep their
+    signature so they can take over when their canonical chunk is removed.
+    """
+
+    def __init__(self, num_perm: int = 128, threshold: float = 0.85, shingle_size: int = 5, seed: int = 1):
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        self._buckets: dict[tuple[int, bytes], list[str]] = defaultdict(list)
+        self._signatures: dict[str, np.ndarray] = {}
+        self._doc_of: dict[str, str] = {}
+        self._chunks_of: dict[str, list[str]] = defaultdict(list)
+        self.canonical: dict[str, str] = {}  # collapsed chunk -> chunk that carries the embedding
+        self._promoted: list[str] = []  # promoted by re-adds, not yet handed out by take_promoted()
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def _band_keys(self, sig: np.ndarray) -> Iterable[tuple[int, bytes]]:
+        r = self.rows
+        return ((i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands))
+
+    def _insert(self, chunk_id: str, sig: np.ndarray) -> None:
+        for key in self._band_keys(sig):
+            self._buckets[key].append(chunk_id)
+
+    def _unbucket(self, chunk_id: str, sig: np.ndarray) -> None:
+        for key in self._band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket and chunk_id in bucket:
+                bucket.remove(chunk_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _best_match(self, sig: np.ndarray, exclude: str) -> str | None:
+        candidates = {c for key in self._band_keys(sig) for c in self._buckets.get(key, ())}
+        candidates.discard(exclude)
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            score = jaccard(sig, self._signatures[candidate])
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def add(self, doc_id: str, chunk_id: str, text: str) -> str | None:
+        """Register a chunk; returns the canonical chunk id if it is a near-duplicate, else None.
+
+        Adding a chunk id that is already indexed replaces the old entry. Chunks that were
+        collapsed onto it and now stand alone are reported by `take_promoted()`.
+        """
+        return self._add(doc_id, chunk_id, self.hasher.signature(text))
+
+    def _add(self, doc_id: str, chunk_id: str, sig: np.ndarray | None) -> str | None:
+        if chunk_id in self._doc_of:
+            self._promoted.extend(self.remove_chunks([chunk_id]))
+        self._doc_of[chunk_id] = doc_id
+        self._chunks_of[doc_id].append(chunk_id)
+        if sig is None:
+            # Nothing to compare (no tokens); keep the chunk as its own group
+            return None
+        self._signatures[chunk_id] = sig
+        match = self._best_match(sig, chunk_id)
+        if match is not None:
+            self.canonical[chunk_id] = match
+            return match
+        self._insert(chunk_id, sig)
+        return None
+
+    def take_promoted(self) -> list[str]:
+        """Chunks promoted to canonical by re-adds since the last call; the caller has to embed them."""
+        promoted = [c for c in dict.fromkeys(self._promoted) if c in self._doc_of and c not in self.canonical]
+        self._promoted.clear()
+        return promoted
+
+    def remove_chunks(self, chunk_ids: Iterable[str]) -> list[str]:
+        """Forget chunks (unknown ids are ignored).
+
+        Returns the chunks that became canonical because the chunk they were collapsed onto
+        was removed; the caller has to embed those now.
+        """
+        removed = {chunk_id for chunk_id in chunk_ids if chunk_id in self._doc_of}
+        if not removed:
+            return []
+        by_doc: dict[str, set[str]] = defaultdict(set)
+        for chunk_id in removed:
+            by_doc[self._doc_of.pop(chunk_id)].add(chunk_id)
+            sig = self._signatures.pop(chunk_id, None)
+            if sig is not None and chunk_id not in self.canonical:
+                self._unbucket(chunk_id, sig)
+            self.canonical.pop(chunk_id, None)
+        for doc_id, chunks in by_doc.items():
+            remaining = [c for c in self._chunks_of[doc_id] if c not in chunks]
+            if remaining:
+                self._chunks_of[doc_id] = remaining
+            else:
+                del self._chunks_of[doc_id]
+
+        promoted = []
+        for chunk_id in [c for c, canon in self.canonical.items() if canon in removed]:
+            del self.canonical[chunk_id]
+            sig = self._signatures[chunk_id]
+            match = self._best_match(sig, chunk_id)
+            if match is not None:
+                self.canonical[chunk_id] = match
+            else:
+                self._insert(chunk_id, sig)
+                promoted.append(chunk_id)
+        return promoted
+
+    def remove_document(self, doc_id: str) -> list[str]:
+        """Forget a document's chunks; returns the chunks promoted to canonical (see remove_chunks)."""
+        return self.remove_chunks(list(self._chunks_of.get(doc_id, ())))
+
+    def group_of(self, chunk_id: str) -> str:
+        return self.canonical.get(chunk_id, chunk_id)
+
+    def suppress(self, hits: list, key: Callable = lambda hit: hit['chunk_id']) -> list:
+        """Drop retrieval hits that duplicate a better-ranked hit; order is preserved."""
+        kept, groups, signatures = [], set(), []
+        for hit in hits:
+            chunk_id = key(hit)
+            group = self.group_of(chunk_id)
+            if group in groups:
+                continue
+            # Canonical chunks can still be near each other (e.g. after a document was removed)
+            sig = self._signatures.get(chunk_id)
+            if sig is not None and any(jaccard(sig, other) >= self.threshold for other in signatures):
+                continue
+            groups.add(group)
+            if sig is not None:
+                signatures.append(sig)
+            kept.append(hit)
+        return kept
+
+    def duplicate_report(self, min_ratio: float = 0.5) -> list[dict]:
+        """Documents whose chunks are mostly near-duplicates of one other document."""
+        report = []
+        for doc_id, chunks in self._chunks_of.items():
+            shared: dict[str, int] = defaultdict(int)
+            for chunk_id in chunks:
+                canon = self.canonical.get(chunk_id)
+                if canon is not None and self._doc_of[canon] != doc_id:
+                    shared[self._doc_of[canon]] += 1
+            if not shared:
+                continue
+            other, count = max(shared.items(), key=lambda item: item[1])
+            ratio = count / len(chunks)
+            if ratio >= min_ratio:
+                report.append({
+                    'doc_id': doc_id,
+                    'duplicate_of': other,
+                    'shared_chunks': count,
+                    'total_chunks': len(chunks),
+                    'ratio': round(ratio, 3),
+                })
+        return sorted(report, key=lambda r: (-r['ratio'], r['doc_id']))
+
+    def stats(self) -> dict:
+        return {'chunks': len(self._doc_of), 'collapsed': len(self.canonical), 'documents': len(self._chunks_of)}
+
+    def save(self, path: str) -> None:
+        """Write the index atomically (temp file + rename), so readers never see a partial file."""
+        chunk_ids = list(self._doc_of)
+        has_sig = np.array([c in self._signatures for c in chunk_ids], dtype=bool)
+        signatures = np.stack([self._signatures[c] for c in chunk_ids if c in self._signatures]) if has_sig.any() \
+            else np.empty((0, self.hasher.num_perm), dtype=np.uint32)
+        h = self.hasher
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    params=np.array([h.num_perm, h.shingle_size, h.seed], dtype=np.int64),
+                    chunk_ids=np.array(chunk_ids, dtype=str),
+                    doc_ids=np.array([self._doc_of[c] for c in chunk_ids], dtype=str),
+                    canonical=np.array([self.canonical.get(c, '') for c in chunk_ids], dtype=str),
+                    has_sig=has_sig,
+                    signatures=signatures,
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, num_perm: int = 128, threshold: float = 0.85, shingle_size: int = 5,
+             seed: int = 1) -> 'NearDupIndex':
+        """Restore an index written by `save`, keeping its collapse decisions as they were."""
+        with np.load(path) as data:
+            if data['params'].tolist() != [num_perm, shingle_size, seed]:
+                raise ValueError(f'{path} was built with different MinHash parameters; rebuild it')
+            index = cls(num_perm, threshold, shingle_size, seed)
+            rows = iter(data['signatures'])
+            for chunk_id, doc_id, canon, has_sig in zip(
+                data['chunk_ids'].tolist(), data['doc_ids'].tolist(), data['canonical'].tolist(), data['has_sig']
+            ):
+                index._doc_of[chunk_id] = doc_id
+                index._chunks_of[doc_id].append(chunk_id)
+                if has_sig:
+                    sig = next(rows)
+                    index._signatures[chunk_id] = sig
+                    if not canon:
+                        index._insert(chunk_id, sig)
+                if canon:
+                    index.canonical[chunk_id] = canon
+        return index
@@ -0,0 +1,396 @@
+"""
+📍 Path: backend/algorithms/llm/retrieval/vector_index.py
+
+📌 Quantized, memory-mapped vector storage for knowledge base retrieval
+
+Keeping a float32 copy of every chunk embedding in each worker's heap does not scale with
+the corpus. This index keeps compact codes for scanning and the float vectors only on disk:
+- flat: exact inner product over float32 (the reference path, 4 bytes per dimension)
+- sq8:  per-dimension int8 scalar quantization, 1 byte per dimension (4x smaller)
+- pq:   product quantization, one byte per sub-vector of KB_VECTOR_PQ_SUBVECTOR_DIM dimensions
+        (8x smaller with 2-dim sub-vectors, 16x with 4)
+
+A query scans the codes for `k * rerank` candidates, then re-scores just those rows
+against the float32 vectors, which restores most of the recall lost to quantization.
+
+Storage is immutable segments under one directory per knowledge base:
+    <root>/manifest.json           names of the live segments, replaced atomically
+    <root>/quantizer.npz           trained once, shared by every segment
+    <root>/seg-<ns>/ids.npy        chunk ids
+    <root>/seg-<ns>/codes.npy      uint8 codes (empty until the quantizer is trained)
+    <root>/seg-<ns>/vectors.npy    float32 vectors, only touched when re-scoring
+    <root>/write.lock              flock held by writers, so exactly one worker trains the quantizer
+    <root>/swap.lock               flock held while the manifest changes and replaced segments are deleted
+The quantizer is trained once the index holds enough vectors to be representative; the
+segments written before that are scanned exactly, then re-encoded into one segment.
+Every add() writes one segment, so writers also merge segments of similar size (see
+QuantizedIndex._compact) to keep the number scanned per query, and of open mmaps, small.
+Segments are opened with np.load(mmap_mode='r'), so all server workers share one copy
+through the page cache instead of each holding their own.
+Vectors are compared by inner product; normalize them first for cosine similarity.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+_BLOCK = 4096  # rows decoded per step, bounds the float32 scratch memory
+
+
+class FlatQuantizer:
+    kind = 'flat'
+    code_axis = 0  # axis of the codes array that runs over vectors
+
+    @classmethod
+    def train(cls, vectors: np.ndarray) -> 'FlatQuantizer':
+        return cls()
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        # No codes: the float vectors are scanned directly
+        return np.empty((len(vectors), 0), dtype=np.uint8)
+
+    def state(self) -> dict:
+        return {}
+
+
+class ScalarQuantizer:
+    """One 8-bit code per dimension: x ≈ vmin + scale * code."""
+
+    kind = 'sq8'
+    code_axis = 0
+
+    def __init__(self, vmin: np.ndarray, scale: np.ndarray):
+        self.vmin = vmin.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray) -> 'ScalarQuantizer':
+        vmin, vmax = vectors.min(axis=0), vectors.max(axis=0)
+        return cls(vmin, np.maximum(vmax - vmin, 1e-12) / 255)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint((vectors - self.vmin) / self.scale), 0, 255).astype(np.uint8)
+
+    def scores(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        # q·x ≈ q·vmin + (q*scale)·code; codes are widened to float32 a block at a time
+        weighted = queries * self.scale
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        buf = np.empty((min(_BLOCK, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), _BLOCK):
+            block = buf[:min(_BLOCK, len(codes) - start)]
+            block[...] = codes[start:start + len(block)]
+            out[:, start:start + len(block)] = weighted @ block.T
+        return out + (queries @ self.vmin)[:, None]
+
+    def state(self) -> dict:
+        return {'vmin': self.vmin, 'scale': self.scale}
+
+
+class ProductQuantizer:
+    """Vectors split into sub-vectors, each replaced by the id of its nearest k-means centroid.
+
+    Codes are stored sub-vector major, shape (m, n): scoring gathers one contiguous row per
+    sub-vector, which is several times faster in numpy than strided columns.
+    """
+
+    kind = 'pq'
+    code_axis = 1
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = centroids.astype(np.float32)  # (m, ks, dsub)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, subvector_dim: int = 2, iterations: int = 12, sample: int = 256 * 40,
+              seed: int = 0) -> 'ProductQuantizer':
+        n, d = vectors.shape
+        if d % subvector_dim:
+            raise ValueError(f'dimension {d} is not divisible by the sub-vector size {subvector_dim}')
+        rng = np.random.default_rng(seed)
+        train = vectors[rng.choice(n, min(n, sample), replace=False)] if n > sample else vectors
+        m, ks = d // subvector_dim, min(256, len(train))
+        centroids = np.empty((m, ks, subvector_dim), dtype=np.float32)
+        for j in range(m):
+            centroids[j] = cls._kmeans(train[:, j * subvector_dim:(j + 1) * subvector_dim], ks, iterations, rng)
+        return cls(centroids)
+
+    @staticmethod
+    def _kmeans(x: np.ndarray, ks: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        centers = x[rng.choice(len(x), ks, replace=False)].copy()
+        for _ in range(iterations):
+            assign = ProductQuantizer._nearest(x, centers)
+            counts = np.bincount(assign, minlength=ks)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, assign, x)
+            filled = counts > 0
+            centers[filled] = sums[filled] / counts[filled, None]
+            # Re-seed empty clusters on random points so every code stays in use
+            if not filled.all():
+                centers[~filled] = x[rng.choice(len(x), int((~filled).sum()), replace=False)]
+        return centers
+
+    @staticmethod
+    def _nearest(x: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||² = argmin (||c||² - 2 x·c)
+        return np.argmin((centers * centers).sum(axis=1) - 2 * x @ centers.T, axis=1)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        m, _, dsub = self.centroids.shape
+        codes = np.empty((m, len(vectors)), dtype=np.uint8)
+        for start in range(0, len(vectors), _BLOCK):
+            block = vectors[start:start + _BLOCK].astype(np.float32)
+            for j in range(m):
+                codes[j, start:start + len(block)] = self._nearest(block[:, j * dsub:(j + 1) * dsub], self.centroids[j])
+        return codes
+
+    def scores(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        # Asymmetric distance: per query, a (m, ks) table of sub-vector dot products, summed by lookup
+        m, ks, dsub = self.centroids.shape
+        tables = np.einsum('qmd,mkd->qmk', queries.reshape(len(queries), m, dsub), self.centroids)
+        out = np.zeros((len(queries), codes.shape[1]), dtype=np.float32)
+        for i, table in enumerate(tables):
+            for j in range(m):
+                out[i] += table[j].take(codes[j])
+        return out
+
+    def state(self) -> dict:
+        return {'centroids': self.centroids}
+
+
+QUANTIZERS = {q.kind: q for q in (FlatQuantizer, ScalarQuantizer, ProductQuantizer)}
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition, then sort only those)."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class VectorSegment:
+    """One immutable, memory-mapped batch of vectors.
+
+    A segment written before the quantizer was trained has no codes and is scanned exactly.
+    """
+
+    def __init__(self, path: str, quantizer):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.ids = np.load(os.path.join(path, 'ids.npy'), mmap_mode='r')
+        self.codes = np.load(os.path.join(path, 'codes.npy'), mmap_mode='r')
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        self.quantizer = quantizer if self.codes.size else FlatQuantizer()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def write(path: str, parts: list[tuple], quantizer) -> None:
+        """Write the (ids, vectors) parts as one segment into a temp directory and rename it into place."""
+        parent = os.path.dirname(path)
+        tmp = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+        try:
+            n, dim = sum(len(vectors) for _, vectors in parts), parts[0][1].shape[1]
+            np.save(os.path.join(tmp, 'ids.npy'), np.concatenate([np.asarray(ids, dtype=str) for ids, _ in parts]))
+            # Parts may be memory-mapped segments being merged, so copy them through without a full in-memory stack
+            vectors = np.lib.format.open_memmap(os.path.join(tmp, 'vectors.npy'), mode='w+', dtype=np.float32,
+                                                shape=(n, dim))
+            codes, start = [], 0
+            for _, part in parts:
+                vectors[start:start + len(part)] = part
+                codes.append(quantizer.encode(vectors[start:start + len(part)]))
+                start += len(part)
+            vectors.flush()
+            del vectors
+            np.save(os.path.join(tmp, 'codes.npy'), np.concatenate(codes, axis=quantizer.code_axis))
+            os.rename(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def search(self, query: np.ndarray, k: int, rerank: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k (scores, row indices) for one query."""
+        if self.quantizer.kind == 'flat':
+            exact = np.asarray(self.vectors @ query)
+            top = _top_k(exact, k)
+            return exact[top], top
+        approx = self.quantizer.scores(self.codes, query[None, :])[0]
+        candidates = _top_k(approx, k * max(rerank, 1))
+        if rerank <= 1:
+            return approx[candidates[:k]], candidates[:k]
+        # Sorted row order turns the re-score gather into mostly sequential page reads
+        rows = np.sort(candidates)
+        exact = np.asarray(self.vectors[rows]) @ query
+        top = _top_k(exact, k)
+        return exact[top], rows[top]
+
+
+class QuantizedIndex:
+    """Append-only set of segments for one knowledge base, sharing a single trained quantizer.
+
+    Training waits for `min_train_vectors` vectors (enough for 256 PQ centroids to see ~40
+    points each); until then segments are stored without codes and scanned exactly.
+    """
+
+    def __init__(self, root: str, kind: str = 'sq8', subvector_dim: int = 2, rerank: int = 4,
+                 min_train_vectors: int = 256 * 40, merge_factor: int = 8):
+        if kind not in QUANTIZERS:
+            raise ValueError(f'unknown quantization {kind!r}; expected one of {", ".join(QUANTIZERS)}')
+        if merge_factor < 2:
+            raise ValueError(f'merge_factor must be at least 2, got {merge_factor}')
+        self.root = root
+        self.kind = kind
+        self.subvector_dim = subvector_dim
+        self.rerank = rerank
+        self.min_train_vectors = min_train_vectors
+        self.merge_factor = merge_factor
+        self.quantizer = None
+        self.segments: list[VectorSegment] = []
+        self._manifest_version = None
+
+    def _quantizer_path(self) -> str:
+        return os.path.join(self.root, 'quantizer.npz')
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, 'manifest.json')
+
+    @contextmanager
+    def _lock(self, name: str, operation: int):
+        with open(os.path.join(self.root, name), 'w') as f:
+            fcntl.flock(f, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_quantizer(self):
+        with np.load(self._quantizer_path()) as data:
+            kind = str(data['kind'])
+            if kind != self.kind:
+                raise ValueError(f'{self.root} holds {kind} codes, not {self.kind}')
+            state = {key: data[key] for key in data.files if key != 'kind'}
+        return QUANTIZERS[kind](**state)
+
+    def refresh(self) -> None:
+        """Pick up segments published by other workers (one stat when nothing changed)."""
+        try:
+            stat = os.stat(self._manifest_path())
+        except FileNotFoundError:
+            return
+        # The manifest is replaced, never rewritten in place, so a new inode means a new version
+        if (stat.st_ino, stat.st_mtime_ns) == self._manifest_version:
+            return
+        # Shared lock: a writer can't delete the segments it replaced while they are being opened
+        with self._lock('swap.lock', fcntl.LOCK_SH):
+            stat = os.stat(self._manifest_path())
+            with open(self._manifest_path()) as f:
+                names = json.load(f)['segments']
+            if self.quantizer is None and os.path.exists(self._quantizer_path()):
+                self.quantizer = self._load_quantizer()
+            known = {s.name: s for s in self.segments}
+            self.segments = [known.get(name) or VectorSegment(os.path.join(self.root, name), self.quantizer)
+                             for name in names]
+        self._manifest_version = (stat.st_ino, stat.st_mtime_ns)
+
+    def _publish(self, segments: list[str], replaced: list[VectorSegment]) -> None:
+        """Atomically switch the manifest to `segments`, then delete the segments they replace."""
+        tmp = self._manifest_path() + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'segments': segments}, f)
+        with self._lock('swap.lock', fcntl.LOCK_EX):
+            os.replace(tmp, self._manifest_path())
+            for segment in replaced:
+                # Workers that already mapped these files keep reading them until their next refresh
+                shutil.rmtree(segment.path, ignore_errors=True)
+        self.refresh()
+
+    def _train(self, vectors: np.ndarray):
+        if self.kind == 'pq':
+            return ProductQuantizer.train(vectors, self.subvector_dim)
+        return QUANTIZERS[self.kind].train(vectors)
+
+    def _write_segment(self, parts: list[tuple]) -> str:
+        name = f'seg-{time.time_ns()}'
+        VectorSegment.write(os.path.join(self.root, name), parts, self.quantizer or FlatQuantizer())
+        return name
+
+    def add(self, ids: list[str], vectors: np.ndarray) -> None:
+        """Write a new segment; the batch that brings the index to `min_train_vectors` trains the quantizer."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or not len(vectors):
+            raise ValueError('add() needs a non-empty 2-D batch of vectors')
+        if len(ids) != len(vectors):
+            raise ValueError(f'{len(ids)} ids for {len(vectors)} vectors')
+        os.makedirs(self.root, exist_ok=True)
+        # Serialize writers across workers: otherwise two workers could each train and write a
+        # quantizer, leaving one worker's segments encoded with a codebook nobody loads
+        with self._lock('write.lock', fcntl.LOCK_EX):
+            self.refresh()
+            parts, replaced = [(ids, vectors)], []
+            total = len(vectors) + sum(len(s) for s in self.segments)
+            if self.quantizer is None and (self.kind == 'flat' or total >= self.min_train_vectors):
+                # Train on everything stored so far, then re-encode it all into one segment
+                replaced = list(self.segments)
+                parts = [(s.ids, s.vectors) for s in replaced] + parts
+                quantizer = self._train(np.concatenate([np.asarray(v) for _, v in parts]))
+                tmp = self._quantizer_path() + '.tmp'
+                with open(tmp, 'wb') as f:
+                    np.savez(f, kind=np.array(self.kind), **quantizer.state())
+                os.replace(tmp, self._quantizer_path())
+                self.quantizer = quantizer
+            name = self._write_segment(parts)
+            kept = [s.name for s in self.segments if s not in replaced]
+            self._publish(kept + [name], replaced)
+            self._compact()
+
+    def _tier(self, size: int) -> int:
+        tier = 0
+        while size >= self.merge_factor:
+            size //= self.merge_factor
+            tier += 1
+        return tier
+
+    def _compact(self) -> None:
+        """Merge `merge_factor` segments of the same size tier into one, cascading upwards.
+
+        A merged segment lands at least one tier higher, so each vector is rewritten about
+        log_merge_factor(n) times and at most merge_factor - 1 segments stay in any tier.
+        Called with the write lock held.
+        """
+        while True:
+            tiers = defaultdict(list)
+            for segment in self.segments:
+                tiers[self._tier(len(segment))].append(segment)
+            group = next((group for group in tiers.values() if len(group) >= self.merge_factor), None)
+            if group is None:
+                return
+            name = self._write_segment([(s.ids, s.vectors) for s in group])
+            self._publish([s.name for s in self.segments if s not in group] + [name], group)
+
+    def search(self, query: np.ndarray, k: int = 10) -> list[tuple[str, float]]:
+        """Best k (chunk id, inner product) pairs over all segments."""
+        self.refresh()
+        query = np.asarray(query, dtype=np.float32)
+        hits = []
+        for segment in self.segments:
+            scores, rows = segment.search(query, k, self.rerank)
+            hits.extend(zip(segment.ids[rows].tolist(), scores.tolist()))
+        hits.sort(key=lambda hit: -hit[1])
+        return hits[:k]
+
+    def resident_bytes_per_vector(self) -> float:
+        """Bytes per vector scanned on every query (codes, or floats for the flat path)."""
+        n = sum(len(s) for s in self.segments)
+        if not n:
+            return 0.0
+        arrays = [s.vectors if s.quantizer.kind == 'flat' else s.codes for s in self.segments]
+        return sum(a.nbytes for a in arrays) / n
+
@@ -7,11 +7,13 @@ It enables an LLM agent to retrieve domain knowledge from curated files.
 Main Features:
 - List available knowledge bases
 - Upload, update, and delete medical documents
+- Report documents that are near-duplicates (copies / revisions) of other documents
 - Public-safe annotations only; internal business logic abstracted
 
 🔗 Related Components:
 - knowledge_base_service: Handles CRUD logic for knowledge base
 - chat_file_service: Handles file upload and file metadata operations
+- kb_dedup_service: Chunk-level near-duplicate index per knowledge base
 - schema.knowledge: Pydantic models for request/response
 
 This demo is part of the ongoing AI for Medicine showcase.
@@ -23,6 +25,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Request, Path, UploadFile, File
 
+from app.admin.service.kb_dedup_service import kb_dedup_service
 from app.admin.service.knowledge_service import knowledge_base_service
 from app.admin.service.llm_service import chat_file_service
 from app.admin.schema.knowledge import (
@@ -71,3 +74,14 @@ async def delete_file(request: Request, obj: KBFileSchema):
     await knowledge_base_service.delete_file(obj.kb_id, obj.file_id, request.user.id)
     return {"success": True}
 
+# Report near-duplicate documents in a knowledge base
+@router.get('/base/{kb_id}/duplicates')
+async def get_duplicate_report(kb_id: Annotated[int, Path(...)]):
+    report = await kb_dedup_service.report(kb_id)
+    duplicated = report['documents_duplicated']
+    file_ids = list({d['doc_id'] for d in duplicated} | {d['duplicate_of'] for d in duplicated})
+    names = {f.file_id: f.file_name for f in await chat_file_service.get_by_ids(file_ids=file_ids)} if file_ids else {}
+    for d in duplicated:
+        d['file_name'] = names.get(d['doc_id'])
+        d['duplicate_of_name'] = names.get(d['duplicate_of'])
+    return {"success": True, "data": report}
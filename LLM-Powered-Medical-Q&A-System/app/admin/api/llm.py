@@ -1,9 +1,23 @@
 # app/admin/api/llm.py — Core API endpoints for medical LLM Q&A demo
 
-from fastapi import APIRouter, Request
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
 import asyncio
+import os
+from contextlib import aclosing
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Header, Path
+from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
+
+from algorithms.llm.chat.analysis_chat import analysis_graph_generate
+from algorithms.llm.chat.chat_base import chat_generate
+from app.admin.schema.user import CurrentUserIns
+from app.admin.service.admission_service import Ticket, admission_controller, priority_for
+from app.admin.service.llm_service import chat_file_service
+from app.admin.service.stream_service import StreamSession, stream_service
+from common.security.jwt import DependsJwtAuth
+from config.path_conf import LLM_CHAT_DIR
+from config.settings import settings
 
 router = APIRouter()
 
@@ -12,6 +26,15 @@ class ChatRequest(BaseModel):
     question: str
     session_id: str
 
+
+# 🌊 Streaming chat input schema
+class ChatStreamRequest(ChatRequest):
+    mode: Literal['chat', 'analysis'] = 'chat'
+    kb_id: int | None = None
+    kb_name: str | None = None
+    kb_info: str | None = None
+    file_ids: list[str] = []
+
 # 📩 Multi-turn chat simulation (non-streaming)
 @router.post("/chat/completion")
 async def chat_completion(data: ChatRequest):
@@ -22,15 +45,83 @@ async def chat_completion(data: ChatRequest):
         "answer": "This is a demo response from the medical assistant."
     }
 
+
+async def _chat_source(data: ChatStreamRequest, files: list, cancel_event: asyncio.Event):
+    """Adapt chat_generate's plain text chunks to typed frames."""
+    query = {
+        'content': data.question,
+        'files': [{'file_id': f.file_id, 'content_hash': f.content_hash} for f in files],
+    }
+    kb_data = {'kb_id': data.kb_id or '', 'kb_name': data.kb_name or '', 'kb_info': data.kb_info or ''}
+    async with aclosing(chat_generate(data.session_id, query, kb_data, cancel_event)) as stream:
+        async for chunk in stream:
+            yield {'type': 'text', 'content': chunk}
+
+
+async def _admitted(ticket: Ticket, make_source, cancel_event: asyncio.Event):
+    """Report queue positions until a generation slot is granted, then run the generation."""
+    try:
+        async for position in ticket.wait():
+            yield {'event': 'queue', 'position': position}
+        async with aclosing(make_source(cancel_event)) as stream:
+            async for frame in stream:
+                yield frame
+    finally:
+        ticket.release()
+
+
+def _event_response(session: StreamSession, after_seq: int = 0) -> EventSourceResponse:
+    return EventSourceResponse(
+        session.subscribe(after_seq),
+        ping=settings.SSE_HEARTBEAT_SECONDS,
+        headers={'X-Stream-Id': session.stream_id},
+    )
+
 # 🌊 Streaming chat generation via SSE
-@router.get("/generate")
-async def generate_stream():
-    """Stream generated tokens one by one using SSE (for demo)."""
+@router.post("/generate", summary="Stream an answer via SSE")
+async def generate_stream(
+    data: ChatStreamRequest,
+    user: CurrentUserIns = DependsJwtAuth,
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> EventSourceResponse:
+    """
+    Start a chat or data-analysis generation and stream it as SSE.
+    Sending `Last-Event-ID` resumes the buffered stream instead of generating again.
+    While waiting for a free LLM slot the client receives `queue` events with its position;
+    overload is rejected up front with 429 and `Retry-After`.
+    """
+    if last_event_id:
+        session, seq = stream_service.resume(last_event_id, user.id)
+        return _event_response(session, seq)
+
+    # Shed load before doing any work for this request
+    ticket = admission_controller.admit(user.id, priority_for(user))
+    try:
+        files = await chat_file_service.get_by_ids(file_ids=data.file_ids) if data.file_ids else []
+    except BaseException:
+        ticket.release()
+        raise
+    if data.mode == 'analysis':
+        file_path = [os.path.join(LLM_CHAT_DIR, f.file_path) for f in files]
+
+        def make_source(cancel_event):
+            return analysis_graph_generate(data.question, data.session_id, file_path, cancel_event)
+    else:
+        def make_source(cancel_event):
+            return _chat_source(data, files, cancel_event)
 
-    async def event_generator():
-        words = ["This", "is", "a", "real-time", "response", "streamed", "by", "LLM."]
-        for word in words:
-            await asyncio.sleep(0.3)
-            yield f"data: {word} \n\n"
+    session = stream_service.start(lambda cancel_event: _admitted(ticket, make_source, cancel_event), user.id)
+    # Also free the slot if the task ends before the generator ever ran
+    session.task.add_done_callback(lambda _: ticket.release())
+    return _event_response(session)
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+# 🔁 Resume a stream (EventSource reconnects with GET)
+@router.get("/generate/{stream_id}", summary="Resume an SSE answer stream")
+async def resume_stream(
+    stream_id: Annotated[str, Path(...)],
+    user: CurrentUserIns = DependsJwtAuth,
+    last_event_id: Annotated[str | None, Header()] = None,
+) -> EventSourceResponse:
+    seq = last_event_id.partition(':')[2] if last_event_id else '0'
+    session, seq = stream_service.resume(f'{stream_id}:{seq}', user.id)
+    return _event_response(session, seq)
@@ -5,6 +5,7 @@ Overview:
 This file defines three simple API routes for managing user login logs in the system.
 It includes:
 - Fetching login logs (with optional filters)
+- Exporting every matching log as one streamed JSON list
 - Deleting selected logs by primary key
 - Clearing all logs
 
@@ -22,15 +23,27 @@ from common.response.response_schema import ResponseModel, response_base
 
 router = APIRouter()
 
-# Endpoint to fetch login logs (optionally filter by username, status, or IP)
+# Endpoint to fetch login logs page by page, newest first (username / IP match by prefix)
 @router.get("", summary="Fetch login logs with optional filters")
 async def get_login_logs(
     username: Annotated[str | None, Query()] = None,
     status: Annotated[int | None, Query()] = None,
     ip: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query(description='next_cursor of the previous page')] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ) -> ResponseModel:
-    logs = await login_log_service.get_select(username=username, status=status, ip=ip)
-    return response_base.success(data=[log.dict() for log in logs])
+    page = await login_log_service.get_page(username=username, status=status, ip=ip, cursor=cursor, limit=limit)
+    return response_base.fast_success(data=page)
+
+# Endpoint to export all matching login logs; rows are streamed, never held in memory at once
+@router.get("/export", summary="Export login logs with optional filters")
+async def export_login_logs(
+    username: Annotated[str | None, Query()] = None,
+    status: Annotated[int | None, Query()] = None,
+    ip: Annotated[str | None, Query()] = None,
+) -> ResponseModel:
+    logs = login_log_service.export(username=username, status=status, ip=ip)
+    return response_base.stream_success(rows=logs)
 
 # Endpoint to delete specific login logs by their primary keys
 @router.delete("", summary="Delete selected login logs")
@@ -18,15 +18,17 @@ from common.response.response_schema import ResponseModel, response_base
 
 router = APIRouter()
 
-# GET: Fetch operation logs (optionally filtered)
+# GET: Fetch operation logs page by page, newest first (username / IP match by prefix)
 @router.get("", summary="Fetch operation logs")
 async def get_opera_logs(
     username: Annotated[str | None, Query()] = None,
     status: Annotated[int | None, Query()] = None,
     ip: Annotated[str | None, Query()] = None,
+    cursor: Annotated[str | None, Query(description='next_cursor of the previous page')] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
 ) -> ResponseModel:
-    logs = await opera_log_service.get_select(username=username, status=status, ip=ip)
-    return response_base.success(data=[log.dict() for log in logs])
+    page = await opera_log_service.get_page(username=username, status=status, ip=ip, cursor=cursor, limit=limit)
+    return response_base.fast_success(data=page)
 
 # DELETE: Delete selected operation logs
 @router.delete("", summary="Delete selected operation logs")
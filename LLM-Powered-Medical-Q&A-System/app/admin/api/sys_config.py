@@ -10,8 +10,9 @@ This is a simplified version, focusing only on agreement-related configs.
 """
 
 from typing import Annotated
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from app.admin.service.config_service import config_service
+from app.admin.service.dict_snapshot import dict_snapshot
 from app.admin.schema.config import SaveConfigParam
 from common.response.response_schema import ResponseModel, response_base
 
@@ -19,22 +20,24 @@ router = APIRouter()
 
 # User agreement
 @router.get("/protocol", summary="Get user agreement")
-async def get_protocol_config() -> ResponseModel:
-    config = await config_service.get_built_in_config("protocol")
-    return response_base.success(data=config)
+async def get_protocol_config(request: Request) -> ResponseModel:
+    config = await dict_snapshot.get_config("protocol")
+    return dict_snapshot.respond(request, config)
 
 @router.post("/protocol", summary="Update user agreement")
 async def save_protocol_config(objs: list[SaveConfigParam]) -> ResponseModel:
     await config_service.save_built_in_config(objs, "protocol")
+    await dict_snapshot.invalidate()
     return response_base.success()
 
 # Privacy policy
 @router.get("/policy", summary="Get privacy policy")
-async def get_policy_config() -> ResponseModel:
-    config = await config_service.get_built_in_config("policy")
-    return response_base.success(data=config)
+async def get_policy_config(request: Request) -> ResponseModel:
+    config = await dict_snapshot.get_config("policy")
+    return dict_snapshot.respond(request, config)
 
 @router.post("/policy", summary="Update privacy policy")
 async def save_policy_config(objs: list[SaveConfigParam]) -> ResponseModel:
     await config_service.save_built_in_config(objs, "policy")
+    await dict_snapshot.invalidate()
     return response_base.success()
@@ -16,6 +16,7 @@ from fastapi import APIRouter, Path, Query
 from app.admin.service.dept_service import dept_service
 from app.admin.schema.dept import CreateDeptParam, UpdateDeptParam, GetDeptListDetails
 from common.response.response_schema import ResponseModel, response_base
+from common.security.user_cache import user_cache
 from utils.serializers import select_as_dict
 
 router = APIRouter()
@@ -49,10 +50,12 @@ async def create_dept(obj: CreateDeptParam) -> ResponseModel:
 @router.put("/{pk}", summary="Update department")
 async def update_dept(pk: Annotated[int, Path(...)], obj: UpdateDeptParam) -> ResponseModel:
     count = await dept_service.update(pk=pk, obj=obj)
+    await user_cache.invalidate_all()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Delete department
 @router.delete("/{pk}", summary="Delete department")
 async def delete_dept(pk: Annotated[int, Path(...)]) -> ResponseModel:
     count = await dept_service.delete(pk=pk)
+    await user_cache.invalidate_all()
     return response_base.success() if count > 0 else response_base.fail()
@@ -12,9 +12,10 @@ Use case:
 """
 
 from typing import Annotated
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
 
 from app.admin.service.dict_data_service import dict_data_service
+from app.admin.service.dict_snapshot import dict_snapshot
 from app.admin.schema.dict_data import CreateDictDataParam, UpdateDictDataParam, GetDictDataListDetails
 from common.response.response_schema import ResponseModel, response_base
 from utils.serializers import select_as_dict
@@ -28,30 +29,34 @@ async def get_dict_data(pk: Annotated[int, Path(...)]) -> ResponseModel:
     data = GetDictDataListDetails(**select_as_dict(dict_data))
     return response_base.success(data=data)
 
-# List all dictionary entries (with filters)
+# List all dictionary entries (with filters), served from the in-memory snapshot
 @router.get("", summary="List dictionary entries")
 async def get_dict_entries(
+    request: Request,
     label: Annotated[str | None, Query()] = None,
     value: Annotated[str | None, Query()] = None,
     status: Annotated[int | None, Query()] = None,
 ) -> ResponseModel:
-    entries = await dict_data_service.get_select(label=label, value=value, status=status)
-    return response_base.success(data=[e.dict() for e in entries])
+    entries = await dict_snapshot.get_dict_data(label=label, value=value, status=status)
+    return dict_snapshot.respond(request, entries)
 
 # Create dictionary entry
 @router.post("", summary="Create dictionary entry")
 async def create_dict_data(obj: CreateDictDataParam) -> ResponseModel:
     await dict_data_service.create(obj=obj)
+    await dict_snapshot.invalidate()
     return response_base.success()
 
 # Update dictionary entry
 @router.put("/{pk}", summary="Update dictionary entry")
 async def update_dict_data(pk: Annotated[int, Path(...)], obj: UpdateDictDataParam) -> ResponseModel:
     count = await dict_data_service.update(pk=pk, obj=obj)
+    await dict_snapshot.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Delete entries
 @router.delete("", summary="Delete dictionary entries")
 async def delete_dict_data(pk: Annotated[list[int], Query(...)]) -> ResponseModel:
     count = await dict_data_service.delete(pk=pk)
+    await dict_snapshot.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
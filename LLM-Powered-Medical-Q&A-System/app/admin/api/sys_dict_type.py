@@ -11,38 +11,43 @@ Use case:
 """
 
 from typing import Annotated
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
 
+from app.admin.service.dict_snapshot import dict_snapshot
 from app.admin.service.dict_type_service import dict_type_service
 from app.admin.schema.dict_type import CreateDictTypeParam, UpdateDictTypeParam, GetDictTypeListDetails
 from common.response.response_schema import ResponseModel, response_base
 
 router = APIRouter()
 
-# List all dictionary types
+# List all dictionary types, served from the in-memory snapshot
 @router.get("", summary="List all dictionary types")
 async def get_dict_types(
+    request: Request,
     name: Annotated[str | None, Query()] = None,
     code: Annotated[str | None, Query()] = None,
     status: Annotated[int | None, Query()] = None,
 ) -> ResponseModel:
-    result = await dict_type_service.get_select(name=name, code=code, status=status)
-    return response_base.success(data=[r.dict() for r in result])
+    result = await dict_snapshot.get_dict_types(name=name, code=code, status=status)
+    return dict_snapshot.respond(request, result)
 
 # Create a new dictionary type
 @router.post("", summary="Create dictionary type")
 async def create_dict_type(obj: CreateDictTypeParam) -> ResponseModel:
     await dict_type_service.create(obj=obj)
+    await dict_snapshot.invalidate()
     return response_base.success()
 
 # Update dictionary type
 @router.put("/{pk}", summary="Update dictionary type")
 async def update_dict_type(pk: Annotated[int, Path(...)], obj: UpdateDictTypeParam) -> ResponseModel:
     count = await dict_type_service.update(pk=pk, obj=obj)
+    await dict_snapshot.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Delete dictionary types
 @router.delete("", summary="Delete dictionary types")
 async def delete_dict_type(pk: Annotated[list[int], Query(...)]) -> ResponseModel:
     count = await dict_type_service.delete(pk=pk)
+    await dict_snapshot.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
@@ -14,6 +14,7 @@ from typing import Annotated
 from fastapi import APIRouter, Path, Query, Request
 
 from app.admin.service.menu_service import menu_service
+from app.admin.service.menu_tree_cache import menu_tree_cache
 from app.admin.schema.menu import CreateMenuParam, UpdateMenuParam, GetMenuListDetails
 from common.response.response_schema import ResponseModel, response_base
 from utils.serializers import select_as_dict
@@ -23,7 +24,7 @@ router = APIRouter()
 # Get current user's sidebar menu
 @router.get("/sidebar", summary="Get current user's sidebar menu")
 async def get_user_sidebar_tree(request: Request) -> ResponseModel:
-    menu = await menu_service.get_user_menu_tree(request=request)
+    menu = await menu_tree_cache.get(request.user, lambda: menu_service.get_user_menu_tree(request=request))
     return response_base.success(data=menu)
 
 # Get single menu detail
@@ -46,16 +47,19 @@ async def get_all_menus(
 @router.post("", summary="Create new menu")
 async def create_menu(obj: CreateMenuParam) -> ResponseModel:
     await menu_service.create(obj=obj)
+    await menu_tree_cache.invalidate()
     return response_base.success()
 
 # Update a menu item
 @router.put("/{pk}", summary="Update menu")
 async def update_menu(pk: Annotated[int, Path(...)], obj: UpdateMenuParam) -> ResponseModel:
     count = await menu_service.update(pk=pk, obj=obj)
+    await menu_tree_cache.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Delete a menu item
 @router.delete("/{pk}", summary="Delete menu")
 async def delete_menu(pk: Annotated[int, Path(...)]) -> ResponseModel:
     count = await menu_service.delete(pk=pk)
+    await menu_tree_cache.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
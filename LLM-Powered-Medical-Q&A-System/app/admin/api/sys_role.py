@@ -15,8 +15,10 @@ from fastapi import APIRouter, Path, Query, Request
 
 from app.admin.service.role_service import role_service
 from app.admin.service.menu_service import menu_service
+from app.admin.service.menu_tree_cache import menu_tree_cache
 from app.admin.schema.role import CreateRoleParam, UpdateRoleParam, UpdateRoleMenuParam, GetRoleListDetails
 from common.response.response_schema import ResponseModel, response_base
+from common.security.user_cache import user_cache
 from utils.serializers import select_as_dict, select_list_serialize
 
 router = APIRouter()
@@ -25,15 +27,14 @@ router = APIRouter()
 @router.get("/all", summary="List all roles")
 async def get_all_roles() -> ResponseModel:
     roles = await role_service.get_all()
-    data = select_list_serialize(roles)
-    return response_base.success(data=data)
+    # select_list_serialize keeps loaded relationships (menus); fast_success only encodes
+    return response_base.fast_success(data=select_list_serialize(roles))
 
 # Get roles for a specific user
 @router.get("/{pk}/all", summary="Get roles for a user")
 async def get_user_all_roles(pk: Annotated[int, Path(...)]) -> ResponseModel:
     roles = await role_service.get_user_roles(pk=pk)
-    data = select_list_serialize(roles)
-    return response_base.success(data=data)
+    return response_base.fast_success(data=select_list_serialize(roles))
 
 # Get menu tree for a role
 @router.get("/{pk}/menus", summary="Get role's menus")
@@ -58,16 +59,22 @@ async def create_role(obj: CreateRoleParam) -> ResponseModel:
 @router.put("/{pk}", summary="Update role")
 async def update_role(pk: Annotated[int, Path(...)], obj: UpdateRoleParam) -> ResponseModel:
     count = await role_service.update(pk=pk, obj=obj)
+    await user_cache.invalidate_all()
+    await menu_tree_cache.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Update role-menu bindings
 @router.put("/{pk}/menu", summary="Update role menus")
 async def update_role_menus(request: Request, pk: int, menu_ids: UpdateRoleMenuParam) -> ResponseModel:
     count = await role_service.update_role_menu(request=request, pk=pk, menu_ids=menu_ids)
+    await user_cache.invalidate_all()
+    await menu_tree_cache.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
 
 # Delete roles
 @router.delete("", summary="Delete roles")
 async def delete_role(pk: Annotated[list[int], Query(...)]) -> ResponseModel:
     count = await role_service.delete(pk=pk)
+    await user_cache.invalidate_all()
+    await menu_tree_cache.invalidate()
     return response_base.success() if count > 0 else response_base.fail()
@@ -14,12 +14,15 @@ Use case:
 from typing import Annotated
 from fastapi import APIRouter, Path, Query, Request
 
+from app.admin.crud.crud_user import user_dao
 from app.admin.service.user_service import user_service
 from app.admin.schema.user import (
     RegisterUserParam, AddUserParam, UpdateUserAllParam,
     GetCurrentUserInfoDetail, GetUserInfoListDetails
 )
 from common.response.response_schema import ResponseModel, response_base
+from common.security.user_cache import user_cache
+from database.db_mysql import async_db_session
 from utils.serializers import select_as_dict
 
 user_router = APIRouter()
@@ -49,10 +52,19 @@ async def get_user(username: Annotated[str, Path(...)]) -> ResponseModel:
 
 @user_router.put("/{username}", summary="Update user info")
 async def update_user(request: Request, username: Annotated[str, Path(...)], obj: UpdateUserAllParam) -> ResponseModel:
+    # Primary key only: the cache is keyed by it, and a missing user is left to the service to report
+    async with async_db_session() as db:
+        user_id = await user_dao.get_id_by_username(db, username)
     count = await user_service.update(request=request, username=username, obj=obj)
+    if user_id is not None:
+        await user_cache.invalidate(user_id)
     return response_base.success() if count > 0 else response_base.fail()
 
 @user_router.delete("/{username}", summary="Delete user")
 async def delete_user(username: Annotated[str, Path(...)]) -> ResponseModel:
+    async with async_db_session() as db:
+        user_id = await user_dao.get_id_by_username(db, username)
     count = await user_service.delete(username=username)
+    if user_id is not None:
+        await user_cache.invalidate(user_id)
     return response_base.success() if count > 0 else response_base.fail()
@@ -0,0 +1,51 @@
+"""
+This module defines the CRUD operations for files uploaded into chat sessions.
+"""
+
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from sqlalchemy_crud_plus import CRUDPlus
+
+from app.admin.model import ChatFile
+from app.admin.schema.chat_file import CreateChatFileParam
+
+
+class CRUDChatFile(CRUDPlus[ChatFile]):
+    async def get_by_ids(self, db: AsyncSession, file_ids: list[str]) -> Sequence[ChatFile]:
+        """
+        Retrieve chat files by their public file ids.
+        """
+        return await self.select_models(db, file_id__in=file_ids)
+
+    async def get_with_content(self, db: AsyncSession, file_id: str) -> ChatFile | None:
+        """
+        Retrieve a chat file together with its deferred legacy inline text.
+        """
+        stmt = select(self.model).where(self.model.file_id == file_id).options(undefer(self.model.file_content))
+        return await db.scalar(stmt)
+
+    async def get_by_file_hash(self, db: AsyncSession, user_id: int, file_hash: str) -> ChatFile | None:
+        """
+        Retrieve a user's earlier upload of the same bytes, served by (user_id, file_hash).
+        """
+        # Not unique: two concurrent uploads of the same file may both have been inserted
+        stmt = (
+            select(self.model)
+            .where(self.model.user_id == user_id, self.model.file_hash == file_hash)
+            .order_by(self.model.id)
+            .limit(1)
+        )
+        return await db.scalar(stmt)
+
+    async def create(self, db: AsyncSession, obj_in: CreateChatFileParam) -> None:
+        """
+        Create a new chat file record.
+        """
+        await self.create_model(db, obj_in)
+
+
+# Data Access Object instance
+chat_file_dao: CRUDChatFile = CRUDChatFile(ChatFile)
@@ -3,27 +3,58 @@ This module defines the CRUD operations for user login logs,
 used to monitor login behavior and security events in the system.
 """
 
-from sqlalchemy import Select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Insert, Select, insert, select
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
-from app.medical.model import LoginLog
-from app.medical.schema.login_log import CreateLoginLogParam
+from app.admin.model import LoginLog
+from app.admin.schema.login_log import CreateLoginLogParam
+from utils.keyset import paginate_keyset
+from utils.timezone import timezone
 
 
 class CRUDLoginLog(CRUDPlus[LoginLog]):
-    async def get_list(self, username: str | None = None, status: int | None = None, ip: str | None = None) -> Select:
-        """
-        Retrieve login log entries filtered by username, status, or IP address.
-        """
-        filters = {}
+    def _filtered(self, *, username: str | None, status: int | None, ip: str | None) -> Select:
+        # Username and IP match by prefix so the composite indexes can be used
+        stmt = select(self.model)
         if username is not None:
-            filters.update(username__like=f'%{username}%')
+            stmt = stmt.where(self.model.username.startswith(username, autoescape=True))
         if status is not None:
-            filters.update(status=status)
+            stmt = stmt.where(self.model.status == status)
         if ip is not None:
-            filters.update(ip__like=f'%{ip}%')
-        return await self.select_order('created_time', 'desc', **filters)
+            stmt = stmt.where(self.model.ip.startswith(ip, autoescape=True))
+        return stmt
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        username: str | None = None,
+        status: int | None = None,
+        ip: str | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> tuple[list[LoginLog], str | None]:
+        """
+        Retrieve one keyset page of login log entries, newest first.
+        """
+        stmt = self._filtered(username=username, status=status, ip=ip)
+        return await paginate_keyset(db, stmt, self.model, cursor=cursor, limit=limit)
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        username: str | None = None,
+        status: int | None = None,
+        ip: str | None = None,
+    ) -> AsyncScalarResult[LoginLog]:
+        """
+        Stream every matching login log entry, newest first, through a server-side cursor.
+        """
+        stmt = self._filtered(username=username, status=status, ip=ip)
+        stmt = stmt.order_by(self.model.created_time.desc(), self.model.id.desc()).execution_options(yield_per=1000)
+        return await db.stream_scalars(stmt)
 
     async def create(self, db: AsyncSession, obj_in: CreateLoginLogParam) -> None:
         """
@@ -31,17 +62,26 @@ class CRUDLoginLog(CRUDPlus[LoginLog]):
         """
         await self.create_model(db, obj_in)
 
-    async def delete(self, db: AsyncSession, pk: list[int]) -> int:
+    def bulk_insert(self, objs_in: list[CreateLoginLogParam]) -> Insert:
         """
-        Delete login logs by ID.
+        Build the multi-row INSERT for several login log entries.
         """
-        return await self.delete_model_by_column(db, allow_multiple=True, id__in=pk)
+        # A Core INSERT skips the model's dataclass defaults, and created_time is part of the
+        # primary key, so it has to be set on every row here
+        now = timezone.now()
+        return insert(self.model).values([{**obj.model_dump(), 'created_time': now} for obj in objs_in])
+
+    async def bulk_create(self, db: AsyncSession, objs_in: list[CreateLoginLogParam]) -> None:
+        """
+        Insert several login log entries with a single multi-row INSERT.
+        """
+        await db.execute(self.bulk_insert(objs_in))
 
-    async def delete_all(self, db: AsyncSession) -> int:
+    async def delete(self, db: AsyncSession, pk: list[int]) -> int:
         """
-        Delete all login log entries.
+        Delete login logs by ID.
         """
-        return await self.delete_model_by_column(db, allow_multiple=True)
+        return await self.delete_model_by_column(db, allow_multiple=True, id__in=pk)
 
 
 # Data Access Object instance
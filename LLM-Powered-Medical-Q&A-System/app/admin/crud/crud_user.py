@@ -3,21 +3,26 @@
 # 用于演示登录注册流程中的数据操作部分（配合 schema.user, model.sys_user 使用）
 
 import bcrypt
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy_crud_plus import CRUDPlus
 
 from app.admin.model import User
 from app.admin.schema.user import RegisterUserParam
-from common.security.jwt import get_hash_password
+from common.security.jwt import get_hash_password_async
 
 
 class CRUDUser(CRUDPlus[User]):
     async def get_by_username(self, db: AsyncSession, username: str) -> User | None:
         return await self.select_model_by_column(db, username=username)
 
+    async def get_id_by_username(self, db: AsyncSession, username: str) -> int | None:
+        # 仅查询主键（用于缓存失效），不加载关联数据；用户不存在时返回 None
+        return await db.scalar(select(self.model.id).where(self.model.username == username))
+
     async def create(self, db: AsyncSession, obj: RegisterUserParam) -> None:
         salt = bcrypt.gensalt()
-        obj.password = get_hash_password(f'{obj.password}', salt)
+        obj.password = await get_hash_password_async(f'{obj.password}', salt)
         dict_obj = obj.model_dump()
         dict_obj.update({'salt': salt, 'is_staff': True})
         db.add(self.model(**dict_obj))
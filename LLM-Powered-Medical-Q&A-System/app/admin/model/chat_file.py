@@ -0,0 +1,37 @@
+# chat_file.py (model version for Medical LLM Demo)
+# -----------------------------------------
+# 📁 Description:
+# SQLAlchemy ORM model for files uploaded into chat sessions.
+# Parsed text lives in the blob store (utils/blob_store.py); the row keeps only its
+# SHA-256 digest in content_hash. file_content is the inline text of rows written
+# before the blob store existed and stays NULL for new uploads. It is deferred, so listing
+# files never loads it; chat_file_dao.get_with_content() is the one query that does.
+# file_hash is the SHA-256 of the uploaded bytes; (user_id, file_hash) lets a repeated
+# upload reuse the existing row instead of being parsed again.
+#
+# Existing tables:
+#   ALTER TABLE chat_file ADD COLUMN content_hash CHAR(64) NULL, MODIFY file_content LONGTEXT NULL;
+#   ALTER TABLE chat_file ADD COLUMN file_hash CHAR(64) NULL, ADD INDEX ix_chat_file_user_hash (user_id, file_hash);
+# -----------------------------------------
+
+from sqlalchemy import Index, String
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.orm import Mapped, mapped_column
+
+from common.model import Base, id_key
+
+
+class ChatFile(Base):
+    __tablename__ = 'chat_file'
+    __table_args__ = (Index('ix_chat_file_user_hash', 'user_id', 'file_hash'),)
+
+    id: Mapped[id_key] = mapped_column(init=False)
+    user_id: Mapped[int] = mapped_column()
+    file_id: Mapped[str] = mapped_column(String(50), unique=True)
+    file_name: Mapped[str] = mapped_column(String(255))
+    file_size: Mapped[int] = mapped_column()
+    file_path: Mapped[str] = mapped_column(String(255))
+    status: Mapped[str] = mapped_column(String(20), default='SUCCESS')
+    file_hash: Mapped[str | None] = mapped_column(String(64), default=None)
+    content_hash: Mapped[str | None] = mapped_column(String(64), default=None)
+    file_content: Mapped[str | None] = mapped_column(LONGTEXT, default=None, deferred=True)
@@ -1,32 +1,46 @@
-# This file defines the login log database operations for demonstration.
-# It showcases a simplified CRUD structure for how login events are stored.
-# Dependencies:
-# - Model: app.model.login_log.LoginLog
-# - Schema: app.schema.login_log.CreateLoginLogParam
+# sys_login_log.py (model version for Medical LLM Demo)
+# -----------------------------------------
+# 📁 Description:
+# SQLAlchemy ORM model for the login log (audit) table.
+# The table grows without bound, so every list query is served by an index:
+# - (created_time, id): keyset pagination, newest first
+# - (username | ip | status, created_time, id): filtered pages, prefix search on username / ip
+# created_time is part of the primary key because the table is RANGE-partitioned by month on it
+# (see retention_service.py); MySQL requires the partitioning column in every unique key.
+# -----------------------------------------
 
-from sqlalchemy import Select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy_crud_plus import CRUDPlus
+from datetime import datetime
 
-from app.model.login_log import LoginLog
-from app.schema.login_log import CreateLoginLogParam
+from sqlalchemy import Index, String
+from sqlalchemy.orm import Mapped, mapped_column
 
+from common.model import DataClassBase, id_key
+from utils.timezone import timezone
 
-class CRUDLoginLog(CRUDPlus[LoginLog]):
-    async def get_list(self, username: str | None = None) -> Select:
-        """
-        Retrieve login log records filtered by username (demo use only)
-        """
-        filters = {}
-        if username is not None:
-            filters.update(username__like=f"%{username}%")
-        return await self.select_order("created_time", "desc", **filters)
 
-    async def create(self, db: AsyncSession, obj_in: CreateLoginLogParam) -> None:
-        """
-        Create a new login log record
-        """
-        await self.create_model(db, obj_in, commit=True)
+class LoginLog(DataClassBase):
+    __tablename__ = 'sys_login_log'
+    __table_args__ = (
+        Index('ix_login_log_created', 'created_time', 'id'),
+        Index('ix_login_log_username_created', 'username', 'created_time', 'id'),
+        Index('ix_login_log_ip_created', 'ip', 'created_time', 'id'),
+        Index('ix_login_log_status_created', 'status', 'created_time', 'id'),
+    )
 
-
-login_log_dao: CRUDLoginLog = CRUDLoginLog(LoginLog)
+    id: Mapped[id_key] = mapped_column(init=False, autoincrement=True)
+    user_uuid: Mapped[str] = mapped_column(String(50))
+    username: Mapped[str] = mapped_column(String(20))
+    status: Mapped[int] = mapped_column(insert_default=0)
+    ip: Mapped[str] = mapped_column(String(50))
+    country: Mapped[str | None] = mapped_column(String(50), default=None)
+    region: Mapped[str | None] = mapped_column(String(50), default=None)
+    city: Mapped[str | None] = mapped_column(String(50), default=None)
+    user_agent: Mapped[str | None] = mapped_column(String(255), default=None)
+    browser: Mapped[str | None] = mapped_column(String(50), default=None)
+    os: Mapped[str | None] = mapped_column(String(50), default=None)
+    device: Mapped[str | None] = mapped_column(String(50), default=None)
+    msg: Mapped[str] = mapped_column(String(255), default='')
+    login_time: Mapped[datetime] = mapped_column(default_factory=timezone.now)
+    created_time: Mapped[datetime] = mapped_column(
+        init=False, primary_key=True, default_factory=timezone.now, insert_default=timezone.now
+    )
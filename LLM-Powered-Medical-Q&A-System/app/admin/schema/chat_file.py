@@ -0,0 +1,36 @@
+# chat_file.py
+# -----------------------------------------
+# 📁 Description:
+# Pydantic schema definitions for chat file uploads.
+# Parsed text is never part of these schemas: it is loaded from the blob store by
+# content_hash only when a turn actually needs it.
+# -----------------------------------------
+
+from datetime import datetime
+from pydantic import ConfigDict
+
+from common.schema import SchemaBase
+
+
+class ChatFileBase(SchemaBase):
+    user_id: int
+    file_id: str
+    file_name: str
+    file_size: int
+    file_path: str
+    status: str = 'SUCCESS'
+
+
+class CreateChatFileParam(ChatFileBase):
+    file_hash: str
+    content_hash: str
+
+
+class GetChatFileDetail(SchemaBase):
+    model_config = ConfigDict(from_attributes=True)
+
+    file_id: str
+    file_name: str
+    file_size: int
+    status: str
+    created_time: datetime
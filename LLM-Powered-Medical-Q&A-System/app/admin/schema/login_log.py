@@ -12,13 +12,13 @@ class LoginLogBase(SchemaBase):
     username: str
     status: int
     ip: str
-    country: str | None
-    region: str | None
-    city: str | None
-    user_agent: str
-    browser: str | None
-    os: str | None
-    device: str | None
+    country: str | None = None
+    region: str | None = None
+    city: str | None = None
+    user_agent: str | None = None
+    browser: str | None = None
+    os: str | None = None
+    device: str | None = None
     msg: str
     login_time: datetime
 
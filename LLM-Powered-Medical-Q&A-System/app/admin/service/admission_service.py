@@ -0,0 +1,160 @@
+# admission_service.py
+# -----------------------------------------
+# 📁 Description:
+# Admission control for LLM generation streams.
+# All chat streams share one Ollama backend, so instead of letting every request
+# slow down together under a spike we:
+# - rate-limit per user and globally with token buckets
+# - run at most LLM_MAX_CONCURRENT_STREAMS generations at once
+# - queue the rest in a bounded priority queue (clinicians ahead of batch jobs)
+# - reject early with 429 + Retry-After once a bucket is empty or the queue is full
+#
+# Waiting callers receive their queue position whenever it changes,
+# which the SSE endpoint forwards as `queue` events.
+# -----------------------------------------
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+
+from common.exception import errors
+from common.metrics import ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED
+from config.settings import settings
+
+PRIORITY_CLINICIAN = 0
+PRIORITY_BATCH = 1
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """Take one token; return 0 on success, otherwise seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        """Return a token taken for a request that was rejected further on."""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class Ticket:
+    def __init__(self, controller: 'AdmissionController', priority: int):
+        self.controller = controller
+        self.priority = priority
+        self.granted = False
+        self.released = False
+        self._changed = asyncio.Event()
+
+    async def wait(self) -> AsyncIterator[int]:
+        """Yield the 1-based queue position each time it changes, until a slot is granted."""
+        while True:
+            # Clear before checking: a grant landing while the caller holds the yielded
+            # position must leave the event set, not be wiped after the fact
+            self._changed.clear()
+            if self.granted:
+                return
+            yield self.controller.position(self)
+            await self._changed.wait()
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.controller.release(self)
+
+
+class AdmissionController:
+    def __init__(self):
+        self.active = 0
+        self._seq = itertools.count()
+        self._queue: list[tuple[int, int, Ticket]] = []
+        self._global = TokenBucket(settings.ADMISSION_GLOBAL_RATE, settings.ADMISSION_GLOBAL_BURST)
+        self._users: OrderedDict[int, TokenBucket] = OrderedDict()
+
+    def _user_bucket(self, user_id: int) -> TokenBucket:
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(settings.ADMISSION_USER_RATE, settings.ADMISSION_USER_BURST)
+            self._users[user_id] = bucket
+            # Idle users' buckets are full anyway, so dropping the oldest is harmless
+            while len(self._users) > 10000:
+                self._users.popitem(last=False)
+        self._users.move_to_end(user_id)
+        return bucket
+
+    @staticmethod
+    def _reject(reason: str, retry_after: float) -> errors.HTTPError:
+        ADMISSION_REJECTED.labels(reason=reason).inc()
+        return errors.HTTPError(
+            code=429,
+            msg='Too many requests, please retry later',
+            headers={'Retry-After': str(max(1, math.ceil(retry_after)))},
+        )
+
+    def admit(self, user_id: int, priority: int) -> Ticket:
+        """Admit or queue a generation; raises HTTPError(429) when it should be shed."""
+        if len(self._queue) >= settings.ADMISSION_QUEUE_SIZE and self.active >= settings.LLM_MAX_CONCURRENT_STREAMS:
+            raise self._reject('queue_full', settings.ADMISSION_RETRY_AFTER_SECONDS)
+        bucket = self._user_bucket(user_id)
+        wait = bucket.try_acquire()
+        if wait:
+            raise self._reject('user_rate', wait)
+        wait = self._global.try_acquire()
+        if wait:
+            # The user's request was not served, so it must not count against them
+            bucket.refund()
+            raise self._reject('global_rate', wait)
+
+        ticket = Ticket(self, priority)
+        heapq.heappush(self._queue, (priority, next(self._seq), ticket))
+        self._dispatch()
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        for index, (_, _, queued) in enumerate(sorted(self._queue, key=lambda e: e[:2])):
+            if queued is ticket:
+                return index + 1
+        return 0
+
+    def _dispatch(self) -> None:
+        while self._queue and self.active < settings.LLM_MAX_CONCURRENT_STREAMS:
+            _, _, ticket = heapq.heappop(self._queue)
+            ticket.granted = True
+            self.active += 1
+            ticket._changed.set()
+        # Everyone still waiting may have moved up
+        for _, _, ticket in self._queue:
+            ticket._changed.set()
+        ADMISSION_QUEUE_DEPTH.set(len(self._queue))
+
+    def release(self, ticket: Ticket) -> None:
+        if ticket.granted:
+            self.active -= 1
+        else:
+            self._queue = [entry for entry in self._queue if entry[2] is not ticket]
+            heapq.heapify(self._queue)
+        self._dispatch()
+
+
+def priority_for(user) -> int:
+    """Clinical roles are served ahead of batch and service accounts."""
+    role_names = {role.name.lower() for role in (user.roles or [])}
+    if role_names & {name.lower() for name in settings.ADMISSION_CLINICIAN_ROLES}:
+        return PRIORITY_CLINICIAN
+    return PRIORITY_BATCH
+
+
+admission_controller = AdmissionController()
@@ -10,51 +10,111 @@
 # - schema: Data models for login input and token output
 # -----------------------------------------
 
+import math
+import time
+from collections import OrderedDict
+
 from fastapi import Request, Response
+from loguru import logger
 from starlette.background import BackgroundTasks
 
 from app.admin.crud.crud_user import user_dao
 from app.admin.schema.token import GetLoginToken
 from app.admin.schema.user import AuthLoginParam
+from app.admin.service.admission_service import TokenBucket
 from app.admin.service.login_log_service import login_log_service
 from common.enums import LoginLogStatusType
 from common.exception import errors
 from common.security.jwt import (
     create_access_token,
     create_refresh_token,
-    password_verify,
+    password_verify_async,
 )
+from config.settings import settings
 from database.db_mysql import async_db_session
+from database.db_redis import redis_client
 from utils.timezone import timezone
 
+
+class LoginRateLimiter:
+    """Per-username throttling, checked before any bcrypt work is done.
+
+    The burst is enforced by a token bucket in this worker; the per-minute budget is a
+    fixed-window counter in Redis so it holds across all workers. If Redis is unreachable
+    only the local bucket applies.
+    """
+
+    def __init__(self, max_usernames: int = 10000):
+        self.max_usernames = max_usernames
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def _local_wait(self, username: str) -> float:
+        bucket = self._buckets.get(username)
+        if bucket is None:
+            bucket = TokenBucket(settings.LOGIN_RATE_PER_MINUTE / 60, settings.LOGIN_RATE_BURST)
+            self._buckets[username] = bucket
+            while len(self._buckets) > self.max_usernames:
+                self._buckets.popitem(last=False)
+        self._buckets.move_to_end(username)
+        return bucket.try_acquire()
+
+    @staticmethod
+    async def _shared_wait(username: str) -> float:
+        now = time.time()
+        key = f'{settings.LOGIN_RATE_REDIS_PREFIX}:{username}:{int(now // 60)}'
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, 120)
+                count, _ = await pipe.execute()
+        except Exception as e:
+            logger.warning(f'Shared login rate limit unavailable: {e}')
+            return 0
+        return 60 - now % 60 if count > settings.LOGIN_RATE_PER_MINUTE else 0
+
+    async def check(self, username: str) -> None:
+        wait = self._local_wait(username) or await self._shared_wait(username)
+        if wait:
+            raise errors.HTTPError(
+                code=429,
+                msg='Too many login attempts, please retry later',
+                headers={'Retry-After': str(math.ceil(wait))},
+            )
+
+
+login_rate_limiter = LoginRateLimiter()
+
+
 class AuthService:
     @staticmethod
     async def login(*, request: Request, response: Response, obj: AuthLoginParam, background_tasks: BackgroundTasks) -> GetLoginToken:
         """Standard login with username and password, returns JWT tokens."""
-        async with async_db_session.begin() as db:
+        await login_rate_limiter.check(obj.username)
+        async with async_db_session() as db:
             user = await user_dao.get_by_username(db, obj.username)
-            if not user or not password_verify(obj.password, user.password):
-                raise errors.AuthorizationError(msg='Invalid username or password')
-            if not user.status:
-                raise errors.AuthorizationError(msg='User is locked')
-            access_token = await create_access_token(str(user.id), user.is_multi_login)
-            refresh_token = await create_refresh_token(str(user.id), user.is_multi_login)
-            background_tasks.add_task(
-                login_log_service.create,
-                db=db,
-                request=request,
-                user_uuid=user.uuid,
-                username=user.username,
-                login_time=timezone.now(),
-                status=LoginLogStatusType.success.value,
-                msg='Login successful',
-            )
+        # bcrypt takes tens of milliseconds: verify with no pooled connection checked out
+        if not user or not await password_verify_async(obj.password, user.password):
+            raise errors.AuthorizationError(msg='Invalid username or password')
+        if not user.status:
+            raise errors.AuthorizationError(msg='User is locked')
+        access_token = await create_access_token(str(user.id), user.is_multi_login)
+        refresh_token = await create_refresh_token(str(user.id), user.is_multi_login)
+        background_tasks.add_task(
+            login_log_service.create,
+            request=request,
+            user_uuid=user.uuid,
+            username=user.username,
+            login_time=timezone.now(),
+            status=LoginLogStatusType.success.value,
+            msg='Login successful',
+        )
+        async with async_db_session.begin() as db:
             await user_dao.update_login_time(db, user.username)
-            await db.refresh(user)
-            return GetLoginToken(
-                access_token=access_token.access_token,
-                access_token_expire_time=access_token.access_token_expire_time,
-                user=user,
-            )
+            user = await user_dao.get_by_username(db, user.username)
+        return GetLoginToken(
+            access_token=access_token.access_token,
+            access_token_expire_time=access_token.access_token_expire_time,
+            user=user,
+        )
 
 auth_service = AuthService()
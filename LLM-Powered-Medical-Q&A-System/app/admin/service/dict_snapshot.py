@@ -0,0 +1,117 @@
+# dict_snapshot.py
+# -----------------------------------------
+# 📁 Description:
+# Process-local snapshot of all dictionary types, dictionary entries and built-in
+# configs (protocol / policy). These change a few times a year but are read on every
+# dropdown render, so readers are served from memory:
+# - A global version key in Redis is bumped by every dict/config write endpoint
+# - Each worker compares versions (see cache_version.py) and reloads lazily on change,
+#   reading from a replica; a bump that failed in Redis is retried, not dropped
+# - Filters match case-insensitively, like the MySQL LIKE queries they replace
+# - Responses carry a content-based ETag; a matching If-None-Match gets 304 Not Modified
+# -----------------------------------------
+
+import asyncio
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+from app.admin.crud.crud_config import config_dao
+from app.admin.crud.crud_dict_data import dict_data_dao
+from app.admin.crud.crud_dict_type import dict_type_dao
+from common.cache_version import CacheVersion
+from common.response.response_schema import response_base
+from database.db_mysql import async_read_session
+from utils.serializers import select_list_serialize
+
+BUILT_IN_CONFIGS = ('protocol', 'policy')
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match is a comma-separated list compared weakly: `W/` is ignored, `*` matches any."""
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def _contains(field: str | None, needle: str | None) -> bool:
+    # casefold(): the default MySQL collations compare case-insensitively
+    return needle is None or (field is not None and needle.casefold() in field.casefold())
+
+
+class DictSnapshot:
+    def __init__(self):
+        self.version = CacheVersion('dict_config')
+        self._loaded_version: str | None = None
+        self._lock = asyncio.Lock()
+        self.dict_types: list[dict] = []
+        self.dict_data: list[dict] = []
+        self.configs: dict[str, list] = {}
+        self.digest = ''
+
+    async def _load(self) -> None:
+        async with async_read_session() as db:
+            rows = await dict_type_dao.select_models(db)
+            dict_types = json.loads(json.dumps(select_list_serialize(rows), default=str))
+            rows = await dict_data_dao.select_models(db)
+            dict_data = json.loads(json.dumps(select_list_serialize(rows), default=str))
+            configs = {}
+            for name in BUILT_IN_CONFIGS:
+                rows = await config_dao.select_models(db, type=name)
+                configs[name] = json.loads(json.dumps(select_list_serialize(rows), default=str))
+        raw = json.dumps([dict_types, dict_data, configs], sort_keys=True, ensure_ascii=False)
+        self.dict_types, self.dict_data, self.configs = dict_types, dict_data, configs
+        self.digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+    async def ensure(self) -> None:
+        """Reload the snapshot if another worker (or this one) bumped the version."""
+        version = await self.version.get()
+        if version == self._loaded_version:
+            return
+        async with self._lock:
+            if version != self._loaded_version:
+                await self._load()
+                self._loaded_version = version
+
+    async def invalidate(self) -> None:
+        """Call after any dictionary or config write; never raises (see CacheVersion.bump)."""
+        await self.version.bump()
+
+    async def get_dict_types(self, *, name: str | None = None, code: str | None = None, status: int | None = None):
+        await self.ensure()
+        return [
+            t for t in self.dict_types
+            if _contains(t.get('name'), name) and _contains(t.get('code'), code)
+            and (status is None or t.get('status') == status)
+        ]
+
+    async def get_dict_data(self, *, label: str | None = None, value: str | None = None, status: int | None = None):
+        await self.ensure()
+        return [
+            d for d in self.dict_data
+            if _contains(d.get('label'), label) and _contains(d.get('value'), value)
+            and (status is None or d.get('status') == status)
+        ]
+
+    async def get_config(self, name: str) -> list:
+        await self.ensure()
+        return self.configs.get(name, [])
+
+    def respond(self, request: Request, data) -> Response:
+        """Success response tagged with an ETag; 304 when the client already has this version."""
+        # Same snapshot + same path and query means same body. Scheme and host are left out so the
+        # ETag stays stable across workers, proxies and the host name the client used
+        target = f'{request.url.path}?{request.url.query}'
+        etag = '"{}-{}"'.format(self.digest, hashlib.sha1(target.encode('utf-8')).hexdigest()[:8])
+        if _etag_matches(request.headers.get('if-none-match', ''), etag):
+            return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+        fast = response_base.fast_success(data=data)
+        fast.headers['ETag'] = etag
+        fast.headers['Cache-Control'] = 'no-cache'
+        return fast
+
+
+dict_snapshot = DictSnapshot()
@@ -0,0 +1,141 @@
+# kb_dedup_service.py
+# -----------------------------------------
+# 📁 Description:
+# Near-duplicate handling for knowledge base ingestion and retrieval.
+# Keeps one MinHash LSH index per knowledge base (see algorithms/llm/retrieval/near_dup.py):
+# - ingest(): registers a document's chunks and returns only the ones that still need
+#   parsing into the vector index; near-duplicates are collapsed onto an existing chunk.
+#   Re-ingesting a chunk id replaces it
+# - suppress(): drops retrieval hits that duplicate a better-ranked hit
+# - report(): documents that are mostly copies/revisions of another document
+#
+# Indexes are saved under <LLM_CHAT_DIR>/kb_index/<kb_id>.dedup.npz. Writers take a file
+# lock so several server workers can ingest into the same knowledge base; readers reload
+# their in-memory copy when the file's mtime changes. A write that fails half-way drops the
+# in-memory copy, so the next call reloads the last saved file instead of reusing it.
+# -----------------------------------------
+
+import asyncio
+import fcntl
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+
+from algorithms.llm.retrieval.near_dup import NearDupIndex
+from common.metrics import KB_CHUNKS_COLLAPSED
+from config.path_conf import LLM_CHAT_DIR
+from config.settings import settings
+
+
+class KBDedupService:
+    def __init__(self, root: str):
+        self.root = root
+        self._indexes: dict[int, tuple[int, NearDupIndex]] = {}  # kb_id -> (file mtime_ns, index)
+        self._locks: dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    def _path(self, kb_id: int) -> str:
+        return os.path.join(self.root, f'{kb_id}.dedup.npz')
+
+    @staticmethod
+    def _new_index() -> NearDupIndex:
+        return NearDupIndex(
+            num_perm=settings.KB_DEDUP_NUM_PERM,
+            threshold=settings.KB_DEDUP_THRESHOLD,
+            shingle_size=settings.KB_DEDUP_SHINGLE_SIZE,
+        )
+
+    def _index(self, kb_id: int) -> NearDupIndex:
+        path = self._path(kb_id)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = 0
+        cached = self._indexes.get(kb_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if mtime:
+            index = NearDupIndex.load(
+                path,
+                num_perm=settings.KB_DEDUP_NUM_PERM,
+                threshold=settings.KB_DEDUP_THRESHOLD,
+                shingle_size=settings.KB_DEDUP_SHINGLE_SIZE,
+            )
+        else:
+            index = self._new_index()
+        self._indexes[kb_id] = (mtime, index)
+        return index
+
+    def _save(self, kb_id: int, index: NearDupIndex) -> None:
+        path = self._path(kb_id)
+        index.save(path)
+        self._indexes[kb_id] = (os.stat(path).st_mtime_ns, index)
+
+    @contextmanager
+    def _write_lock(self, kb_id: int):
+        # Serializes load-modify-save across worker processes
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, f'{kb_id}.dedup.lock'), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _modify(self, kb_id: int):
+        """Locked load-modify-save; on failure the half-modified in-memory index is discarded."""
+        with self._write_lock(kb_id):
+            index = self._index(kb_id)
+            try:
+                yield index
+                self._save(kb_id, index)
+            except BaseException:
+                self._indexes.pop(kb_id, None)
+                raise
+
+    def _ingest(
+        self, kb_id: int, doc_id: str, chunks: list[tuple[str, str]]
+    ) -> tuple[list[tuple[str, str]], list[str]]:
+        with self._modify(kb_id) as index:
+            kept = [(chunk_id, text) for chunk_id, text in chunks if index.add(doc_id, chunk_id, text) is None]
+            promoted = index.take_promoted()
+        return kept, promoted
+
+    async def ingest(
+        self, kb_id: int, doc_id: str, chunks: list[tuple[str, str]]
+    ) -> tuple[list[tuple[str, str]], list[str]]:
+        """Register a document's (chunk_id, text) pairs.
+
+        Returns the pairs that still need embedding, and the ids of chunks already in the
+        index that must be embedded now because the chunk they were collapsed onto was replaced.
+        """
+        async with self._locks[kb_id]:
+            kept, promoted = await asyncio.to_thread(self._ingest, kb_id, doc_id, chunks)
+        KB_CHUNKS_COLLAPSED.labels(stage='index').inc(len(chunks) - len(kept))
+        return kept, promoted
+
+    def _remove_document(self, kb_id: int, doc_id: str) -> list[str]:
+        with self._modify(kb_id) as index:
+            promoted = index.remove_document(doc_id)
+        return promoted
+
+    async def remove_document(self, kb_id: int, doc_id: str) -> list[str]:
+        """Forget a deleted document; returns chunk ids of other documents that must be embedded now."""
+        async with self._locks[kb_id]:
+            return await asyncio.to_thread(self._remove_document, kb_id, doc_id)
+
+    def suppress(self, kb_id: int, hits: list, key=lambda hit: hit['chunk_id']) -> list:
+        """Drop retrieval hits that are near-duplicates of a better-ranked hit."""
+        kept = self._index(kb_id).suppress(hits, key)
+        KB_CHUNKS_COLLAPSED.labels(stage='retrieval').inc(len(hits) - len(kept))
+        return kept
+
+    async def report(self, kb_id: int) -> dict:
+        index = await asyncio.to_thread(self._index, kb_id)
+        return {
+            **index.stats(),
+            'documents_duplicated': index.duplicate_report(settings.KB_DEDUP_REPORT_MIN_RATIO),
+        }
+
+
+kb_dedup_service = KBDedupService(os.path.join(LLM_CHAT_DIR, 'kb_index'))
@@ -0,0 +1,38 @@
+# kb_vector_service.py
+# -----------------------------------------
+# 📁 Description:
+# Per-process handles on each knowledge base's quantized vector index
+# (see algorithms/llm/retrieval/vector_index.py).
+# Indexes live under <LLM_CHAT_DIR>/kb_index/<kb_id>.vectors and are configured by the
+# KB_VECTOR_* settings. The segment data itself is memory-mapped, so every server worker
+# shares one copy through the page cache; only the handle is per process.
+# -----------------------------------------
+
+import os
+
+from algorithms.llm.retrieval.vector_index import QuantizedIndex
+from config.path_conf import LLM_CHAT_DIR
+from config.settings import settings
+
+
+class KBVectorService:
+    def __init__(self, root: str):
+        self.root = root
+        self._indexes: dict[int, QuantizedIndex] = {}
+
+    def index(self, kb_id: int) -> QuantizedIndex:
+        index = self._indexes.get(kb_id)
+        if index is None:
+            index = QuantizedIndex(
+                os.path.join(self.root, f'{kb_id}.vectors'),
+                kind=settings.KB_VECTOR_QUANTIZATION,
+                subvector_dim=settings.KB_VECTOR_PQ_SUBVECTOR_DIM,
+                rerank=settings.KB_VECTOR_RERANK_FACTOR,
+                min_train_vectors=settings.KB_VECTOR_MIN_TRAIN_VECTORS,
+                merge_factor=settings.KB_VECTOR_MERGE_FACTOR,
+            )
+            self._indexes[kb_id] = index
+        return index
+
+
+kb_vector_service = KBVectorService(os.path.join(LLM_CHAT_DIR, 'kb_index'))
@@ -5,27 +5,31 @@
 #   This version is simplified for open-source demonstration and omits proprietary logic such as Celery tasks,
 #   vector indexing, and internal data relationships.
 
+import asyncio
 import os
 import uuid
 from typing import Any, List, Optional
 
 from fastapi import UploadFile
-
-from app.schema.llm import (
-    LLmChat,
-    ChatSessionBase,
-    CreateChatMessageParam,
-    CreateChatFileParam,
-    GetChatFileDetail,
-)
-from app.model import Chat, ChatSession, ChatMessage, ChatFile
-from app.crud import chat_dao, chat_session_dao, chat_message_dao, chat_file_dao
-
-from utils.file_ops import upload_file, build_filename
+from loguru import logger
+
+from app.schema.llm import LLmChat, ChatSessionBase, CreateChatMessageParam
+from app.model import Chat, ChatSession, ChatMessage
+from app.crud import chat_dao, chat_session_dao, chat_message_dao
+from app.admin.crud.crud_chat_file import chat_file_dao
+from app.admin.model import ChatFile
+from app.admin.schema.chat_file import CreateChatFileParam, GetChatFileDetail
+
+from utils.file_ops import build_filename
+from utils.blob_store import chat_blob_store
+from utils.upload_stream import stream_upload
 from config.path_conf import LLM_CHAT_DIR
+from config.settings import settings
 from algorithms.llm.document_loaders import file_parse
-from database.db_mysql import async_db_session
+from algorithms.llm.data_analysis.profiler import profile_table
+from database.db_mysql import async_db_session, async_read_session
 from common.exception import errors
+from common.tracing import span
 
 
 class ChatSessionService:
@@ -68,7 +72,8 @@ class ChatMessageService:
 
     @staticmethod
     async def get_by_session_id(session_id: str) -> List[ChatMessage]:
-        async with async_db_session() as db:
+        # History listing tolerates replica lag
+        async with async_read_session() as db:
             messages = await chat_message_dao.get_by_session_id(db, session_id)
             # Optional: attach file info if needed
             for message in messages:
@@ -87,13 +92,45 @@ class ChatFileService:
         if not os.path.exists(LLM_CHAT_DIR):
             os.makedirs(LLM_CHAT_DIR)
 
+        # Single streaming pass: write, hash and size-check the upload together
+        with span('upload.receive'):
+            upload = await stream_upload(
+                file,
+                LLM_CHAT_DIR,
+                max_size=settings.LLM_UPLOAD_MAX_SIZE,
+                chunk_size=settings.LLM_UPLOAD_CHUNK_SIZE,
+            )
+
+        # Same bytes already uploaded by this user: skip parsing and reuse the existing record
+        async with async_db_session() as db:
+            existing = await chat_file_dao.get_by_file_hash(db, user_id, upload.sha256)
+        if existing:
+            os.remove(upload.path)
+            return {
+                'file_id': existing.file_id,
+                'file_name': existing.file_name,
+                'file_size': existing.file_size,
+            }
+
         filename = build_filename(file)
         file_path = os.path.join(LLM_CHAT_DIR, filename)
-        await upload_file(file, file_path)
+        os.replace(upload.path, file_path)
 
         file_id = str(uuid.uuid4())
-        file_size = os.path.getsize(file_path)
-        file_content = file_parse(file_path)
+        file_size = upload.size
+        # Parsing, compression and profiling are CPU-bound: run them off the event loop.
+        # Parsed text goes to the blob store; the row only references it by hash
+        with span('upload.parse'):
+            parsed = await asyncio.to_thread(file_parse, file_path)
+        with span('upload.store'):
+            content_hash = await asyncio.to_thread(chat_blob_store.put, parsed)
+        # Tables get a schema profile once, reused by every analysis turn
+        if filename.lower().endswith(('.csv', '.xls', '.xlsx')):
+            try:
+                with span('upload.profile'):
+                    await asyncio.to_thread(profile_table, file_path)
+            except Exception as e:
+                logger.warning(f'Schema profiling failed for {filename}: {e}')
 
         file_obj = CreateChatFileParam(
             user_id=user_id,
@@ -102,7 +139,8 @@ class ChatFileService:
             file_name=file.filename,
             file_size=file_size,
             file_path=filename,
-            file_content=file_content,
+            file_hash=upload.sha256,
+            content_hash=content_hash,
         )
 
         async with async_db_session.begin() as db:
@@ -4,22 +4,109 @@
 🩺 Login Log Service (Public Demo Version)
 This is a simplified version for public-facing projects.
 It records only basic login activity without storing sensitive device or regional data.
+
+Records are not written inside the login request. They are queued in an in-process sink
+and flushed in multi-row INSERTs once LOGIN_LOG_BATCH_SIZE records are pending or
+LOGIN_LOG_FLUSH_INTERVAL_SECONDS have passed. The buffer is bounded: when it is full
+(or a batch cannot be written) records are dropped and counted instead of slowing logins.
 """
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
 
 from fastapi import Request
-from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
 
 from app.admin.crud.crud_login_log import login_log_dao
+from app.admin.model import LoginLog
 from app.admin.schema.login_log import CreateLoginLogParam
+from app.admin.service.retention_service import retention_service
+from common.metrics import LOGIN_LOG_DROPPED, LOGIN_LOG_WRITTEN
+from config.settings import settings
+from database.db_mysql import async_db_session, async_read_session
+
+
+class LoginLogSink:
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[CreateLoginLogParam] = asyncio.Queue(maxsize=max_size)
+        self._task: asyncio.Task | None = None
+        self._writing: asyncio.Future | None = None
+
+    def put(self, obj_in: CreateLoginLogParam) -> None:
+        try:
+            self._queue.put_nowait(obj_in)
+        except asyncio.QueueFull:
+            LOGIN_LOG_DROPPED.labels(reason='buffer_full').inc()
+
+    async def _write(self, batch: list[CreateLoginLogParam]) -> None:
+        try:
+            async with async_db_session.begin() as db:
+                await login_log_dao.bulk_create(db, batch)
+            LOGIN_LOG_WRITTEN.inc(len(batch))
+        except Exception as e:
+            LOGIN_LOG_DROPPED.labels(reason='write_error').inc(len(batch))
+            logger.error(f'Failed to write {len(batch)} login logs: {e}')
+
+    def _drain(self, batch: list[CreateLoginLogParam]) -> None:
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = time.monotonic() + self.flush_interval
+                self._drain(batch)
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                    self._drain(batch)
+            finally:
+                # Shielded so that shutdown neither loses the collected batch nor aborts a write
+                self._writing = asyncio.ensure_future(self._write(batch))
+                await asyncio.shield(self._writing)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flusher and write everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writing is not None:
+            await self._writing
+        while not self._queue.empty():
+            batch: list[CreateLoginLogParam] = []
+            self._drain(batch)
+            await self._write(batch)
+
+
+login_log_sink = LoginLogSink(
+    max_size=settings.LOGIN_LOG_BUFFER_SIZE,
+    batch_size=settings.LOGIN_LOG_BATCH_SIZE,
+    flush_interval=settings.LOGIN_LOG_FLUSH_INTERVAL_SECONDS,
+)
 
 
 class LoginLogService:
     @staticmethod
     async def create(
         *,
-        db: AsyncSession,
         request: Request,
         user_uuid: str,
         username: str,
@@ -32,10 +119,49 @@ class LoginLogService:
             username=username,
             status=status,
             ip=request.client.host,  # Minimal: only store IP
+            user_agent=request.headers.get('user-agent'),
             msg=msg,
             login_time=login_time,
         )
-        await login_log_dao.create(db, obj_in)
+        login_log_sink.put(obj_in)
+
+    @staticmethod
+    async def get_page(
+        *,
+        username: str | None = None,
+        status: int | None = None,
+        ip: str | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> dict:
+        async with async_read_session() as db:
+            logs, next_cursor = await login_log_dao.get_page(
+                db, username=username, status=status, ip=ip, cursor=cursor, limit=limit
+            )
+        # Trusted ORM rows: serialized directly by fast_success, no per-row validation
+        return {'items': logs, 'next_cursor': next_cursor}
+
+    @staticmethod
+    async def export(
+        *,
+        username: str | None = None,
+        status: int | None = None,
+        ip: str | None = None,
+    ) -> AsyncIterator[LoginLog]:
+        """Yield every matching login log; the read session stays open while the response streams."""
+        async with async_read_session() as db:
+            async for log in await login_log_dao.stream(db, username=username, status=status, ip=ip):
+                yield log
+
+    @staticmethod
+    async def delete(*, pk: list[int]) -> int:
+        async with async_db_session.begin() as db:
+            return await login_log_dao.delete(db, pk)
+
+    @staticmethod
+    async def delete_all() -> int:
+        # Chunked so that clearing a large table never holds locks for long
+        return await retention_service.purge(LoginLog.__table__)
 
 
 login_log_service: LoginLogService = LoginLogService()
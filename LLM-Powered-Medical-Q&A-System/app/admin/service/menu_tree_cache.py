@@ -0,0 +1,89 @@
+# menu_tree_cache.py
+# -----------------------------------------
+# 📁 Description:
+# Precomputed sidebar menu trees, shared by every user with the same role set.
+# The sidebar depends only on which (enabled) roles a user holds, so trees are keyed by
+# a hash of the sorted role ids ('superuser' for superusers) plus the global menu version.
+# - Local tier: per-process dict, dropped as soon as the version changes
+# - Redis tier: shared by all workers, expires after MENU_CACHE_TTL_SECONDS
+#
+# Any menu write, role write or role-menu rebinding calls `invalidate()`, which bumps the
+# version in Redis; stale trees are never read again and simply expire.
+# While a bump is pending (Redis was down), the version is local to this worker and the Redis
+# tier is skipped, so trees built for it never land under a key other workers read.
+# -----------------------------------------
+
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
+
+from common.cache_version import CacheVersion
+from common.tracing import record_cache
+from config.settings import settings
+from database.db_redis import redis_client
+
+
+def role_set_key(user) -> str:
+    if user.is_superuser:
+        return 'superuser'
+    role_ids = sorted({role.id for role in (user.roles or []) if role.status})
+    return hashlib.sha1(','.join(map(str, role_ids)).encode('utf-8')).hexdigest()[:16]
+
+
+class MenuTreeCache:
+    prefix = f'{settings.MENU_CACHE_REDIS_PREFIX}:'
+
+    def __init__(self):
+        self.version = CacheVersion('menu')
+        self._local_version: str | None = None
+        self._local: dict[str, list[dict]] = {}
+
+    async def get(self, user, build: Callable[[], Awaitable[list[dict]]]) -> list[dict]:
+        """Return the sidebar tree for the user's role set, building it once per version."""
+        version = await self.version.get()
+        if version != self._local_version:
+            self._local.clear()
+            self._local_version = version
+        key = role_set_key(user)
+
+        tree = self._local.get(key)
+        if tree is not None:
+            record_cache('menu_local', 'hit')
+            return tree
+        record_cache('menu_local', 'miss')
+
+        shared = CacheVersion.is_shared(version)
+        redis_key = f'{self.prefix}{version}:{key}'
+        try:
+            raw = await redis_client.get(redis_key) if shared else None
+        except Exception as e:
+            logger.warning(f'Menu cache read failed: {e}')
+            raw = None
+        if raw is not None:
+            record_cache('menu_redis', 'hit')
+            tree = json.loads(raw)
+        else:
+            record_cache('menu_redis', 'miss')
+            # Round-trip through JSON so local and Redis hits return identical data
+            raw = json.dumps(await build(), ensure_ascii=False, default=str)
+            tree = json.loads(raw)
+            try:
+                if shared:
+                    await redis_client.setex(redis_key, settings.MENU_CACHE_TTL_SECONDS, raw)
+            except Exception as e:
+                logger.warning(f'Menu cache write failed: {e}')
+
+        # Only keep it locally if no write happened while it was being built
+        if version == self._local_version:
+            self._local[key] = tree
+        return tree
+
+    async def invalidate(self) -> None:
+        """Call after any menu, role or role-menu change; also recompiles the RBAC permission index."""
+        self._local.clear()
+        self._local_version = await self.version.bump()
+
+
+menu_tree_cache = MenuTreeCache()
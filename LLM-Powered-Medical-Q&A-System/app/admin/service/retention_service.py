@@ -0,0 +1,193 @@
+# retention_service.py
+# -----------------------------------------
+# 📁 Description:
+# Retention for append-only audit tables (login / operation logs).
+# Audit tables are RANGE-partitioned by month on TO_DAYS(created_time), so that:
+# - expiring a month is `ALTER TABLE ... DROP PARTITION` (metadata only, no row locks)
+# - partitions for upcoming months are pre-created by splitting the catch-all `p_future`
+#
+# A background job runs every RETENTION_INTERVAL_SECONDS in one worker at a time
+# (guarded by a MySQL named lock). Tables that are not partitioned yet are either
+# converted (AUDIT_AUTO_PARTITION, rebuilds the table once) or purged row-wise.
+#
+# Ad-hoc purges never issue one unbounded DELETE: rows are removed in chunks of
+# RETENTION_PURGE_CHUNK_SIZE, each in its own transaction, with a pause in between.
+# -----------------------------------------
+
+import asyncio
+import dataclasses
+from datetime import date, timedelta
+
+from loguru import logger
+from sqlalchemy import column, delete, table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from common.metrics import RETENTION_PARTITIONS_DROPPED, RETENTION_ROWS_PURGED
+from config.settings import settings
+from database.db_mysql import async_db_session, async_engine
+from utils.timezone import timezone
+
+_LOCK_NAME = 'medqa:audit_retention'
+_FUTURE = 'p_future'
+
+
+@dataclasses.dataclass
+class RetentionPolicy:
+    table: str
+    keep_days: int
+    column: str = 'created_time'
+
+
+AUDIT_POLICIES = [
+    RetentionPolicy('sys_login_log', settings.AUDIT_RETENTION_DAYS),
+    RetentionPolicy('sys_opera_log', settings.AUDIT_RETENTION_DAYS),
+]
+
+
+def _add_months(month: date, n: int) -> date:
+    years, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def _to_days(day: date) -> int:
+    """Python equivalent of MySQL TO_DAYS()."""
+    return day.toordinal() + 365
+
+
+def _partition_sql(month: date) -> str:
+    return f"PARTITION p{month:%Y%m} VALUES LESS THAN ({_to_days(_add_months(month, 1))})"
+
+
+class RetentionService:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    async def _partitions(conn: AsyncConnection, table_name: str) -> dict[str, int | None]:
+        """Partition name -> upper bound in TO_DAYS (None for MAXVALUE); empty if not partitioned."""
+        rows = await conn.execute(
+            text(
+                'SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS '
+                'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL '
+                'ORDER BY PARTITION_ORDINAL_POSITION'
+            ),
+            {'table': table_name},
+        )
+        return {name: None if bound == 'MAXVALUE' else int(bound) for name, bound in rows}
+
+    @staticmethod
+    async def partition_table(conn: AsyncConnection, policy: RetentionPolicy) -> None:
+        """One-off conversion of an existing table to monthly partitions (rebuilds the table)."""
+        oldest = (
+            await conn.execute(text(f'SELECT MIN(`{policy.column}`) FROM `{policy.table}`'))
+        ).scalar() or timezone.now()
+        month = oldest.date().replace(day=1)
+        last = _add_months(timezone.now().date().replace(day=1), settings.AUDIT_PARTITION_MONTHS_AHEAD)
+        parts = []
+        while month <= last:
+            parts.append(_partition_sql(month))
+            month = _add_months(month, 1)
+        parts.append(f'PARTITION {_FUTURE} VALUES LESS THAN MAXVALUE')
+        # MySQL requires the partitioning column in every unique key, including the primary key
+        await conn.execute(
+            text(
+                f'ALTER TABLE `{policy.table}` DROP PRIMARY KEY, ADD PRIMARY KEY (id, `{policy.column}`) '
+                f'PARTITION BY RANGE (TO_DAYS(`{policy.column}`)) ({", ".join(parts)})'
+            )
+        )
+        logger.info(f'Partitioned {policy.table} into {len(parts)} monthly partitions')
+
+    @staticmethod
+    async def _add_future_partitions(conn: AsyncConnection, policy: RetentionPolicy, bounds: dict) -> None:
+        last_bound = max((b for b in bounds.values() if b is not None), default=None)
+        month = timezone.now().date().replace(day=1)
+        last = _add_months(month, settings.AUDIT_PARTITION_MONTHS_AHEAD)
+        parts = []
+        while month <= last:
+            if last_bound is None or _to_days(_add_months(month, 1)) > last_bound:
+                parts.append(_partition_sql(month))
+            month = _add_months(month, 1)
+        if parts:
+            parts.append(f'PARTITION {_FUTURE} VALUES LESS THAN MAXVALUE')
+            await conn.execute(
+                text(f'ALTER TABLE `{policy.table}` REORGANIZE PARTITION {_FUTURE} INTO ({", ".join(parts)})')
+            )
+
+    @staticmethod
+    async def _drop_expired_partitions(conn: AsyncConnection, policy: RetentionPolicy, bounds: dict) -> None:
+        cutoff = _to_days(timezone.now().date() - timedelta(days=policy.keep_days))
+        # A partition can go once every row it may hold is older than the cutoff
+        expired = [name for name, bound in bounds.items() if bound is not None and bound <= cutoff]
+        if expired:
+            await conn.execute(text(f'ALTER TABLE `{policy.table}` DROP PARTITION {", ".join(expired)}'))
+            RETENTION_PARTITIONS_DROPPED.labels(table=policy.table).inc(len(expired))
+            logger.info(f'Dropped expired partitions of {policy.table}: {expired}')
+
+    async def purge(self, target, *where, chunk_size: int | None = None, pause: float | None = None) -> int:
+        """Delete matching rows in small committed chunks; returns the number of rows removed."""
+        chunk_size = chunk_size or settings.RETENTION_PURGE_CHUNK_SIZE
+        pause = settings.RETENTION_PURGE_PAUSE_SECONDS if pause is None else pause
+        total = 0
+        while True:
+            async with async_db_session.begin() as db:
+                result = await db.execute(delete(target).where(*where).with_dialect_options(mysql_limit=chunk_size))
+            total += result.rowcount
+            RETENTION_ROWS_PURGED.labels(table=target.name).inc(result.rowcount)
+            if result.rowcount < chunk_size:
+                return total
+            await asyncio.sleep(pause)
+
+    async def apply(self, policy: RetentionPolicy) -> None:
+        async with async_engine.connect() as conn:
+            bounds = await self._partitions(conn, policy.table)
+            if not bounds and settings.AUDIT_AUTO_PARTITION:
+                await self.partition_table(conn, policy)
+                bounds = await self._partitions(conn, policy.table)
+            if bounds:
+                await self._add_future_partitions(conn, policy, bounds)
+                await self._drop_expired_partitions(conn, policy, bounds)
+                return
+
+        cutoff = timezone.now() - timedelta(days=policy.keep_days)
+        target = table(policy.table, column(policy.column))
+        purged = await self.purge(target, target.c[policy.column] < cutoff)
+        if purged:
+            logger.info(f'Purged {purged} expired rows from unpartitioned {policy.table}')
+
+    async def run_once(self) -> None:
+        async with async_engine.connect() as lock_conn:
+            # Only one worker per database runs the job
+            if not (await lock_conn.execute(text('SELECT GET_LOCK(:name, 0)'), {'name': _LOCK_NAME})).scalar():
+                return
+            try:
+                for policy in AUDIT_POLICIES:
+                    try:
+                        await self.apply(policy)
+                    except Exception as e:
+                        logger.error(f'Retention failed for {policy.table}: {e}')
+            finally:
+                await lock_conn.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': _LOCK_NAME})
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f'Retention run failed: {e}')
+            await asyncio.sleep(settings.RETENTION_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+retention_service = RetentionService()
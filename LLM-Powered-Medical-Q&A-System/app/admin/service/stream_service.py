@@ -0,0 +1,258 @@
+# stream_service.py
+# -----------------------------------------
+# 📁 Description:
+# Server-side state for SSE answer streams.
+# Each generation runs as a background task that writes coalesced frames into a
+# bounded ring buffer. HTTP responses only tail that buffer, so:
+# - tiny token chunks are batched every few milliseconds before hitting the wire
+# - a reconnecting client resumes from `Last-Event-ID` without regenerating
+# - the model is paused while the slowest listener lags too far behind (backpressure)
+# - generation is cancelled upstream once every listener has been gone for a grace period
+#
+# Event ids have the form "<stream_id>:<seq>" so a bare Last-Event-ID is enough to resume;
+# only the user who started a stream may resume it.
+# Frames carrying an 'event' key (e.g. queue positions) are control events: they are
+# never merged with other frames and are sent under that SSE event name.
+# -----------------------------------------
+
+import asyncio
+import itertools
+import json
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+
+from loguru import logger
+
+from common.exception import errors
+from common.metrics import LLM_CHUNKS_GENERATED, LLM_CHUNKS_WASTED, LLM_GENERATIONS_CANCELLED, LLM_TTFT_SECONDS
+from config.settings import settings
+
+_END = object()
+_ERROR_MESSAGE = 'Error: the answer could not be generated. Please try again.'
+_listener_ids = itertools.count(1)
+
+
+class StreamSession:
+    def __init__(self, stream_id: str, owner_id: int):
+        self.stream_id = stream_id
+        self.owner_id = owner_id
+        self.events: deque[tuple[int, str, str]] = deque(maxlen=settings.SSE_BUFFER_SIZE)
+        self.next_seq = 1
+        self.done = False
+        self.cond = asyncio.Condition()
+        self.task: asyncio.Task | None = None
+        self.listeners: dict[int, int] = {}  # listener id -> last delivered seq
+        self.finished_at: float | None = None
+        self.cancel_event = asyncio.Event()
+        self.orphaned_chunks = 0  # chunks generated while nobody was attached
+        self.started_at = time.monotonic()
+        self.first_token_at: float | None = None
+        self._cancel_handle: asyncio.TimerHandle | None = None
+
+    async def append(self, event: str, data: str) -> None:
+        async with self.cond:
+            # Backpressure: wait while the slowest listener lags a full watermark behind
+            await self.cond.wait_for(
+                lambda: not self.listeners
+                or self.next_seq - min(self.listeners.values()) <= settings.SSE_BACKPRESSURE_EVENTS
+            )
+            self.events.append((self.next_seq, event, data))
+            self.next_seq += 1
+            self.cond.notify_all()
+
+    async def finish(self) -> None:
+        async with self.cond:
+            self.done = True
+            self.finished_at = time.monotonic()
+            self.cond.notify_all()
+
+    def count_chunk(self, item: dict) -> None:
+        if 'event' in item:
+            return
+        LLM_CHUNKS_GENERATED.inc()
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+            LLM_TTFT_SECONDS.observe(self.first_token_at - self.started_at)
+        if not self.listeners:
+            self.orphaned_chunks += 1
+
+    def account_waste(self) -> None:
+        """Report chunks nobody will read; reset so a session is never counted twice."""
+        if self.orphaned_chunks:
+            LLM_CHUNKS_WASTED.inc(self.orphaned_chunks)
+            self.orphaned_chunks = 0
+
+    def _cancel(self) -> None:
+        # Ask the generator to stop cooperatively; hard-cancel the task if it does not
+        self._cancel_handle = None
+        self.cancel_event.set()
+        LLM_GENERATIONS_CANCELLED.inc()
+        loop = asyncio.get_running_loop()
+        loop.call_later(settings.SSE_CANCEL_TIMEOUT_SECONDS, self.task.cancel)
+
+    def _schedule_cancel(self) -> None:
+        if self.task and not self.task.done() and self._cancel_handle is None:
+            loop = asyncio.get_running_loop()
+            self._cancel_handle = loop.call_later(settings.SSE_RESUME_GRACE_SECONDS, self._cancel)
+
+    def _unschedule_cancel(self) -> None:
+        if self._cancel_handle is not None:
+            self._cancel_handle.cancel()
+            self._cancel_handle = None
+
+    async def subscribe(self, after_seq: int = 0) -> AsyncIterator[dict]:
+        """Yield SSE event dicts after the given sequence number until the stream ends."""
+        listener = next(_listener_ids)
+        async with self.cond:
+            self.listeners[listener] = after_seq
+            # Anything buffered while detached is about to be delivered
+            self.orphaned_chunks = 0
+            self._unschedule_cancel()
+        try:
+            while True:
+                async with self.cond:
+                    await self.cond.wait_for(lambda: self.done or self.next_seq - 1 > self.listeners[listener])
+                    last = self.listeners[listener]
+                    pending = [e for e in self.events if e[0] > last]
+                    finished = self.done
+                for seq, event, data in pending:
+                    yield {'id': f'{self.stream_id}:{seq}', 'event': event, 'data': data}
+                    async with self.cond:
+                        self.listeners[listener] = seq
+                        self.cond.notify_all()
+                if finished and not pending:
+                    return
+        finally:
+            async with self.cond:
+                self.listeners.pop(listener, None)
+                self.cond.notify_all()
+                if not self.listeners:
+                    self._schedule_cancel()
+
+
+async def _coalesce(source: AsyncGenerator[dict, None], on_item: Callable[[dict], None]) -> AsyncIterator[dict]:
+    """Batch consecutive same-type chunks until the flush interval or size cap is reached."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_BACKPRESSURE_EVENTS)
+
+    async def pump():
+        try:
+            async for item in source:
+                on_item(item)
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END)
+        finally:
+            # Closing the generator is what stops the model call upstream
+            await source.aclose()
+
+    pump_task = asyncio.create_task(pump())
+    interval = settings.SSE_FLUSH_INTERVAL_MS / 1000
+    pending_type, pending, pending_len, deadline = None, [], 0, None
+    try:
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+
+            control = isinstance(item, dict) and 'event' in item
+            flush = not isinstance(item, dict) or control or (pending and item['type'] != pending_type)
+            if flush and pending:
+                yield {'type': pending_type, 'content': ''.join(pending)}
+                pending_type, pending, pending_len, deadline = None, [], 0, None
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            if item is None:
+                continue
+            if control:
+                yield item
+                continue
+
+            if not pending:
+                pending_type = item['type']
+                deadline = time.monotonic() + interval
+            pending.append(item['content'])
+            pending_len += len(item['content'])
+            if pending_len >= settings.SSE_FLUSH_MAX_CHARS:
+                yield {'type': pending_type, 'content': ''.join(pending)}
+                pending_type, pending, pending_len, deadline = None, [], 0, None
+    finally:
+        pump_task.cancel()
+        # Wait for the pump to close the source, so the upstream call is gone when we return
+        await asyncio.gather(pump_task, return_exceptions=True)
+
+
+class StreamService:
+    def __init__(self):
+        self._sessions: dict[str, StreamSession] = {}
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for stream_id, session in list(self._sessions.items()):
+            if session.finished_at is not None and now - session.finished_at > settings.SSE_RESUME_TTL_SECONDS:
+                session.account_waste()
+                del self._sessions[stream_id]
+
+    def start(self, make_source: Callable[[asyncio.Event], AsyncGenerator[dict, None]], owner_id: int) -> StreamSession:
+        """Start forwarding a token generator into a new buffered stream owned by owner_id.
+
+        make_source receives the session's cancel event, which is set once every client has been gone
+        for the resume grace period; the generator should stop pulling tokens when it is set.
+        """
+        self._evict_expired()
+        session = StreamSession(uuid.uuid4().hex, owner_id)
+        session.task = asyncio.create_task(self._produce(session, make_source(session.cancel_event)))
+        self._sessions[session.stream_id] = session
+        return session
+
+    @staticmethod
+    async def _produce(session: StreamSession, source: AsyncGenerator[dict, None]) -> None:
+        frames = _coalesce(source, session.count_chunk)
+        try:
+            async for frame in frames:
+                event = frame.pop('event', 'message')
+                await session.append(event, json.dumps(frame, ensure_ascii=False))
+            await session.append('done', '{}')
+            if session.cancel_event.is_set():
+                session.account_waste()
+        except asyncio.CancelledError:
+            session.account_waste()
+            logger.info(f'Stream {session.stream_id} cancelled')
+            raise
+        except Exception:
+            # The details stay in the log; clients only learn that the answer failed
+            logger.exception(f'Stream {session.stream_id} failed')
+            await session.append('error', json.dumps({'type': 'text', 'content': _ERROR_MESSAGE}, ensure_ascii=False))
+        finally:
+            await frames.aclose()
+            await session.finish()
+
+    def resume(self, last_event_id: str, user_id: int) -> tuple[StreamSession, int]:
+        """Resolve a Last-Event-ID of the form '<stream_id>:<seq>' for the user who started the stream."""
+        stream_id, _, seq = last_event_id.partition(':')
+        session = self._sessions.get(stream_id)
+        # Someone else's stream looks the same as a missing one
+        if session is None or session.owner_id != user_id or not seq.isdigit():
+            raise errors.NotFoundError(msg='Stream not found or expired')
+        oldest = session.events[0][0] if session.events else session.next_seq
+        if int(seq) + 1 < oldest:
+            raise errors.RequestError(msg='Stream position is no longer buffered')
+        return session, int(seq)
+
+    async def close(self) -> None:
+        """Cancel generations still running at shutdown (their clients are already gone)."""
+        tasks = [s.task for s in self._sessions.values() if s.task and not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._sessions.clear()
+
+
+stream_service = StreamService()
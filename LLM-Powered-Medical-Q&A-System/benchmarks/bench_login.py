@@ -0,0 +1,75 @@
+"""
+📍 Path: benchmarks/bench_login.py
+
+📌 Login throughput benchmark: inline bcrypt vs. the offloaded password executor
+
+Simulates a morning login burst of N concurrent password checks on one event loop and
+compares verifying inline (the old behaviour) with `password_verify_async`. Besides
+logins/s it runs a 10 ms ticker on the same loop and reports the worst scheduling delay,
+which is what open SSE streams on the worker experience during the burst.
+
+Usage:
+    python -m benchmarks.bench_login [--logins 64] [--concurrency 16] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import time
+
+import bcrypt
+
+from common.security.jwt import get_hash_password, password_verify, password_verify_async
+
+PASSWORD = 'correct horse battery staple'
+
+
+async def _ticker(stop: asyncio.Event, delays: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        delays.append(time.perf_counter() - start - 0.01)
+
+
+async def _inline(hashed: str) -> bool:
+    return password_verify(PASSWORD, hashed)
+
+
+async def _offloaded(hashed: str) -> bool:
+    return await password_verify_async(PASSWORD, hashed)
+
+
+async def run(verify, hashed: str, logins: int, concurrency: int) -> tuple[float, float]:
+    """Return (logins/s, worst event loop delay in ms)."""
+    slots = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    delays: list[float] = []
+
+    async def login() -> None:
+        async with slots:
+            assert await verify(hashed)
+
+    ticker = asyncio.create_task(_ticker(stop, delays))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return logins / elapsed, max(delays, default=0) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost factor')
+    args = parser.parse_args()
+
+    hashed = get_hash_password(PASSWORD, bcrypt.gensalt(args.rounds))
+    for name, verify in (('inline', _inline), ('offloaded', _offloaded)):
+        rate, worst = await run(verify, hashed, args.logins, args.concurrency)
+        print(f'{name:<10} {rate:8.1f} logins/s   worst loop delay {worst:8.1f} ms')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+📍 Path: benchmarks/bench_response.py
+
+📌 Serialization benchmark for 10k-row list responses
+
+Compares the ways a list endpoint can encode the same login log rows, both as plain dicts
+and as `LoginLog` ORM instances (what the DAOs actually return; encoded via row_as_dict):
+- validated: detail model per row + ResponseModel + jsonable_encoder + JSONResponse (the default path)
+- fast:      response_base.fast_success (no validation, orjson)
+- stream:    response_base.stream_success (orjson, JSON array sent in chunks)
+
+Reports the best of several runs in milliseconds and the encoded body size.
+
+Usage:
+    python -m benchmarks.bench_response [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.admin.model import LoginLog
+from app.admin.schema.login_log import LoginLogDetail
+from common.response.response_schema import ResponseModel, response_base
+
+
+def build_rows(n: int) -> list[dict]:
+    start = datetime(2026, 1, 1)
+    return [
+        {
+            'id': i,
+            'user_uuid': f'00000000-0000-0000-0000-{i:012d}',
+            'username': f'clinician{i % 300}',
+            'status': i % 2,
+            'ip': f'10.0.{i % 256}.{i % 97}',
+            'country': None,
+            'region': None,
+            'city': None,
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+            'browser': 'Chrome',
+            'os': 'Windows',
+            'device': None,
+            'msg': 'Login successful',
+            'login_time': start + timedelta(seconds=i),
+            'created_time': start + timedelta(seconds=i),
+        }
+        for i in range(n)
+    ]
+
+
+def build_orm_rows(rows: list[dict]) -> list[LoginLog]:
+    """The same rows as LoginLog instances, with every column set as if loaded from the database."""
+    logs = []
+    for row in rows:
+        log = LoginLog(**{key: value for key, value in row.items() if key not in ('id', 'created_time')})
+        log.id, log.created_time = row['id'], row['created_time']
+        logs.append(log)
+    return logs
+
+
+def validated(rows: list) -> bytes:
+    model = ResponseModel(data=[LoginLogDetail.model_validate(row) for row in rows])
+    return JSONResponse(jsonable_encoder(model)).body
+
+
+def fast(rows: list) -> bytes:
+    return response_base.fast_success(data=rows).body
+
+
+def stream(rows: list) -> bytes:
+    async def consume() -> bytes:
+        response = response_base.stream_success(rows=rows)
+        return b''.join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(consume())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    for kind, data in (('dict', rows), ('orm', build_orm_rows(rows))):
+        for name, encode in (('validated', validated), ('fast', fast), ('stream', stream)):
+            best, body = float('inf'), b''
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                body = encode(data)
+                best = min(best, time.perf_counter() - start)
+            print(f'{kind:<5} {name:<10} {best * 1000:8.1f} ms   {len(body) / 1024:8.0f} KiB')
+
+
+if __name__ == '__main__':
+    main()
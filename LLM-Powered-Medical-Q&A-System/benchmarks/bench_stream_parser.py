@@ -0,0 +1,78 @@
+"""
+📍 Path: benchmarks/bench_stream_parser.py
+
+📌 Micro-benchmark for the streaming think/code/text classifier
+
+Replays a synthetic DeepSeek-R1 style answer (think block, prose, fenced code) split into
+small token chunks, with markers deliberately cut across chunk boundaries, and reports how
+many chunks per second one classifier instance sustains. Target: well above 1k tokens/s.
+
+Usage:
+    python -m benchmarks.bench_stream_parser [--tokens 200000]
+"""
+
+import argparse
+import random
+import time
+
+from algorithms.llm.chat.stream_parser import StreamClassifier
+
+THINK = 'The user asks for the mean length of stay for hypertensive patients. '
+TEXT = 'Here is the analysis of the uploaded admission records. '
+CODE = "df[df['diagnosis'] == 'hypertension']['los_days'].mean()\n"
+
+
+def build_stream(n_tokens: int, seed: int = 7) -> tuple[list[str], dict]:
+    """Return roughly n_tokens chunks plus the expected total characters per frame type."""
+    rng = random.Random(seed)
+    parts, expected = [], {'think': 0, 'text': 0, 'code': 0}
+    produced = 0
+    while produced < n_tokens * 4:
+        block = [('<think>', None), (THINK * 20, 'think'), ('</think>', None), (TEXT * 10, 'text'),
+                 ('```python\n', None), (CODE * 10, 'code'), ('```', None), (TEXT * 5, 'text')]
+        for content, kind in block:
+            parts.append(content)
+            if kind:
+                expected[kind] += len(content)
+            produced += len(content)
+
+    raw = ''.join(parts)
+    chunks, i = [], 0
+    while i < len(raw):
+        size = rng.randint(1, 7)  # 1-7 chars per chunk, roughly one token
+        chunks.append(raw[i:i + size])
+        i += size
+    return chunks, expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tokens', type=int, default=200_000)
+    args = parser.parse_args()
+
+    chunks, expected = build_stream(args.tokens)
+    classifier = StreamClassifier()
+    totals = {'think': 0, 'text': 0, 'code': 0}
+    n_frames = 0
+
+    start = time.perf_counter()
+    for chunk in chunks:
+        for frame in classifier.feed(chunk):
+            totals[frame['type']] += len(frame['content'])
+            n_frames += 1
+    for frame in classifier.flush():
+        totals[frame['type']] += len(frame['content'])
+        n_frames += 1
+    elapsed = time.perf_counter() - start
+
+    print(f'chunks:        {len(chunks)}')
+    print(f'frames:        {n_frames}')
+    print(f'elapsed:       {elapsed * 1000:.1f} ms')
+    print(f'throughput:    {len(chunks) / elapsed:,.0f} tokens/s per stream')
+    print(f'per token:     {elapsed / len(chunks) * 1e6:.2f} us')
+    print(f'chars by type: {totals}')
+    assert totals == expected, f'classification mismatch, expected {expected}'
+
+
+if __name__ == '__main__':
+    main()
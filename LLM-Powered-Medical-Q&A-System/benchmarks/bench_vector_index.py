@@ -0,0 +1,90 @@
+"""
+📍 Path: benchmarks/bench_vector_index.py
+
+📌 Quantized retrieval benchmark: recall@k, QPS and bytes per vector against the exact path
+
+Builds the knowledge base vector index over synthetic clustered embeddings (unit-norm,
+like sentence embeddings) with each storage mode and answers the same queries one at a
+time, as retrieval does per chat turn:
+- flat          exact float32 scan (ground truth)
+- sq8 / pq      quantized scan only
+- sq8+rerank /  quantized scan, then float32 re-scoring of k * rerank candidates
+  pq+rerank
+
+bytes/vec is what every query scans (codes, or floats for flat); the float32 copy used
+for re-scoring stays on disk behind the memory map and is only paged in for candidates.
+--batch adds the vectors in batches of that size, like documents ingested one at a time;
+by default they are added in one batch.
+
+Usage:
+    python -m benchmarks.bench_vector_index [--vectors 100000] [--dim 384] [--queries 200]
+                                            [--k 10] [--rerank 4] [--subvector-dim 2] [--batch 0]
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from algorithms.llm.retrieval.vector_index import QuantizedIndex
+
+
+def build_data(n: int, dim: int, queries: int, clusters: int = 256, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(clusters, size=n)] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    q = vectors[rng.integers(n, size=queries)] + 0.3 * rng.normal(size=(queries, dim)).astype(np.float32)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return vectors, q
+
+
+def run(index: QuantizedIndex, queries: np.ndarray, k: int) -> tuple[list[set], float]:
+    index.search(queries[0], k)  # warm the page cache
+    start = time.perf_counter()
+    results = [{chunk_id for chunk_id, _ in index.search(q, k)} for q in queries]
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vectors', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--rerank', type=int, default=4)
+    parser.add_argument('--subvector-dim', type=int, default=2)
+    parser.add_argument('--batch', type=int, default=0, help='vectors per add() call (default: all at once)')
+    args = parser.parse_args()
+
+    vectors, queries = build_data(args.vectors, args.dim, args.queries)
+    ids = [f'chunk-{i}' for i in range(args.vectors)]
+    modes = (
+        ('flat', 'flat', 1),
+        ('sq8', 'sq8', 1),
+        ('sq8+rerank', 'sq8', args.rerank),
+        ('pq', 'pq', 1),
+        ('pq+rerank', 'pq', args.rerank),
+    )
+
+    truth = None
+    print(f'{args.vectors} x {args.dim}d vectors, {args.queries} queries, k={args.k}')
+    print(f'{"mode":<12} {"recall@k":>9} {"QPS":>9} {"bytes/vec":>10} {"build s":>8}')
+    with tempfile.TemporaryDirectory() as root:
+        for name, kind, rerank in modes:
+            index = QuantizedIndex(f'{root}/{name}', kind=kind, subvector_dim=args.subvector_dim, rerank=rerank)
+            start = time.perf_counter()
+            batch = args.batch or args.vectors
+            for i in range(0, args.vectors, batch):
+                index.add(ids[i:i + batch], vectors[i:i + batch])
+            build = time.perf_counter() - start
+            results, qps = run(index, queries, args.k)
+            if truth is None:
+                truth = results
+            recall = np.mean([len(r & t) / args.k for r, t in zip(results, truth)])
+            print(f'{name:<12} {recall:>9.3f} {qps:>9.0f} {index.resident_bytes_per_vector():>10.0f} {build:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
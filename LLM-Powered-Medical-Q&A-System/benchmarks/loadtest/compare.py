@@ -0,0 +1,72 @@
+"""
+📍 Path: benchmarks/loadtest/compare.py
+
+📌 Diff two load test reports
+
+Prints throughput, latency percentiles, TTFT and peak RSS side by side with the relative
+change, and exits with status 1 when any metric regressed by more than --threshold
+(lower throughput, higher latency/TTFT/RSS). Handy as a CI gate between two commits:
+
+    python -m benchmarks.loadtest.compare base.json head.json [--threshold 0.10]
+"""
+
+import argparse
+import json
+import sys
+
+
+def _metrics(report: dict) -> dict[str, tuple[float | None, bool]]:
+    """Flatten a report into {metric: (value, higher_is_better)}."""
+    metrics = {}
+    for name, r in report['scenarios'].items():
+        metrics[f'{name}.throughput_rps'] = (r['throughput_rps'], True)
+        for q, v in r['latency_ms'].items():
+            metrics[f'{name}.latency_{q}_ms'] = (v, False)
+        for q, v in r.get('ttft_ms', {}).items():
+            metrics[f'{name}.ttft_{q}_ms'] = (v, False)
+        errors = r['requests'] - r['ok']
+        metrics[f'{name}.error_rate'] = (errors / r['requests'] if r['requests'] else None, False)
+    if report.get('rss_mib'):
+        metrics['rss.peak_mib'] = (report['rss_mib']['peak'], False)
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change counted as a regression')
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f'{"metric":<28} {base["commit"]:>12} {head["commit"]:>12} {"change":>9}')
+    base_metrics, head_metrics = _metrics(base), _metrics(head)
+    regressions = []
+    for metric, (old, higher_is_better) in base_metrics.items():
+        new = head_metrics.get(metric, (None, higher_is_better))[0]
+        if old is None or new is None:
+            print(f'{metric:<28} {old!s:>12} {new!s:>12} {"":>9}')
+            continue
+        change = (new - old) / old if old else (0.0 if new == old else float('inf'))
+        worse = -change if higher_is_better else change
+        flag = ''
+        if worse > args.threshold:
+            flag = '  <-- regression'
+            regressions.append(metric)
+        print(f'{metric:<28} {old:>12.2f} {new:>12.2f} {change:>+8.1%}{flag}')
+
+    changed = sorted(k for k in base['config'].keys() | head['config'].keys()
+                     if k != 'out' and base['config'].get(k) != head['config'].get(k))
+    if changed:
+        print(f'\nnote: runs used different settings: {", ".join(changed)}')
+    if regressions:
+        print(f'\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
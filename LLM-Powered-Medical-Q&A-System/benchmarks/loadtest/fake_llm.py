@@ -0,0 +1,151 @@
+"""
+📍 Path: benchmarks/loadtest/fake_llm.py
+
+📌 Stand-in model server for load tests
+
+Speaks just enough of two wire protocols to replace the real model during a load test:
+- Ollama   POST /api/chat             NDJSON lines, final line has `done: true`
+- OpenAI   POST /v1/chat/completions  SSE `data:` chunks terminated by `data: [DONE]`
+
+Tokens are emitted at a fixed rate after a configurable time-to-first-token, so the
+app's streaming, flushing and admission paths see realistic pacing without a GPU.
+Per-request overrides are accepted in the JSON body (`options.tokens`,
+`options.tokens_per_second`, `options.ttft`) to mix short and long answers.
+
+Usage:
+    python -m benchmarks.loadtest.fake_llm [--port 11500] [--tokens 256]
+                                           [--tokens-per-second 40] [--ttft 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+WORDS = (
+    'The patient presents with mild symptoms consistent with seasonal allergic rhinitis . '
+    'Recommend saline irrigation , an oral antihistamine and follow-up in two weeks if '
+    'symptoms persist or worsen . '
+).split()
+
+
+class Pacing:
+    def __init__(self, tokens: int, tokens_per_second: float, ttft: float):
+        self.tokens = tokens
+        self.tokens_per_second = tokens_per_second
+        self.ttft = ttft
+
+    def override(self, body: dict) -> 'Pacing':
+        options = body.get('options') or {}
+        return Pacing(
+            int(options.get('tokens', body.get('max_tokens') or self.tokens)),
+            float(options.get('tokens_per_second', self.tokens_per_second)),
+            float(options.get('ttft', self.ttft)),
+        )
+
+    async def tokens_iter(self):
+        """Yield `tokens` words: the first after `ttft`, the rest spaced on a fixed schedule."""
+        await asyncio.sleep(self.ttft)
+        start = time.perf_counter()
+        interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for i in range(self.tokens):
+            # Sleep against the schedule, not per token, so timer overhead doesn't accumulate
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield WORDS[i % len(WORDS)] + ' '
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def build_app(pacing: Pacing) -> Starlette:
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        model = body.get('model', 'fake')
+        p = pacing.override(body)
+        if body.get('stream') is False:
+            text = ''.join([t async for t in p.tokens_iter()])
+            return JSONResponse({
+                'model': model, 'created_at': _now(), 'done': True, 'done_reason': 'stop',
+                'message': {'role': 'assistant', 'content': text}, 'eval_count': p.tokens,
+            })
+
+        async def lines():
+            start = time.perf_counter_ns()
+            async for token in p.tokens_iter():
+                chunk = {'model': model, 'created_at': _now(), 'message': {'role': 'assistant', 'content': token},
+                         'done': False}
+                yield json.dumps(chunk) + '\n'
+            yield json.dumps({
+                'model': model, 'created_at': _now(), 'message': {'role': 'assistant', 'content': ''},
+                'done': True, 'done_reason': 'stop', 'total_duration': time.perf_counter_ns() - start,
+                'prompt_eval_count': 0, 'eval_count': p.tokens,
+            }) + '\n'
+
+        return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+    async def openai_chat(request: Request):
+        body = await request.json()
+        model = body.get('model', 'fake')
+        p = pacing.override(body)
+        completion_id = f'chatcmpl-{uuid.uuid4().hex[:12]}'
+        created = int(time.time())
+        if not body.get('stream'):
+            text = ''.join([t async for t in p.tokens_iter()])
+            return JSONResponse({
+                'id': completion_id, 'object': 'chat.completion', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': p.tokens, 'total_tokens': p.tokens},
+            })
+
+        def event(delta: dict, finish_reason: str | None = None) -> str:
+            chunk = {
+                'id': completion_id, 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            return f'data: {json.dumps(chunk)}\n\n'
+
+        async def events():
+            yield event({'role': 'assistant', 'content': ''})
+            async for token in p.tokens_iter():
+                yield event({'content': token})
+            yield event({}, 'stop')
+            yield 'data: [DONE]\n\n'
+
+        return StreamingResponse(events(), media_type='text/event-stream')
+
+    async def tags(request: Request):
+        return JSONResponse({'models': [{'name': 'fake', 'model': 'fake'}]})
+
+    return Starlette(routes=[
+        Route('/api/chat', ollama_chat, methods=['POST']),
+        Route('/api/tags', tags, methods=['GET']),
+        Route('/v1/chat/completions', openai_chat, methods=['POST']),
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11500)
+    parser.add_argument('--tokens', type=int, default=256)
+    parser.add_argument('--tokens-per-second', type=float, default=40.0)
+    parser.add_argument('--ttft', type=float, default=0.3, help='seconds before the first token')
+    args = parser.parse_args()
+
+    app = build_app(Pacing(args.tokens, args.tokens_per_second, args.ttft))
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,424 @@
+"""
+📍 Path: benchmarks/loadtest/run.py
+
+📌 End-to-end load test: the real app, a stand-in model and throwaway MySQL/Redis
+
+Brings up the whole stack, drives a weighted mix of user journeys against it and writes
+one JSON report that can be diffed against another commit with compare.py:
+1. (--docker) MySQL 8 and Redis 7 containers on local ports, then seed.py for tables + users
+2. fake_llm.py streaming tokens at --tokens-per-second after --ttft
+3. `uvicorn core.registrar:register_app --factory` with OLLAMA_API_URL pointed at the fake
+4. --concurrency virtual users, each logged in once (failed logins are reported under `login`),
+   looping over the --mix scenarios
+   (login, chat SSE, chat file upload, knowledge base ingestion) for --duration seconds
+
+Reported per scenario: requests, errors by status, throughput, p50/p90/p99 latency and,
+for chat, time to first answer token (queue/ping events are not counted as tokens).
+The app's resident memory (summed over its worker processes) is sampled throughout.
+
+Without --docker the app uses whatever MYSQL_* / REDIS_* the environment (or .env)
+provides; with --app-url the suite only drives an already running deployment.
+
+Usage:
+    python -m benchmarks.loadtest.run --docker [--duration 60] [--concurrency 32]
+        [--mix login=1,chat=6,upload=2,ingest=1] [--tokens-per-second 40] [--out report.json]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+SCENARIOS = ('login', 'chat', 'upload', 'ingest')
+MYSQL_CONTAINER = 'mqa-loadtest-mysql'
+REDIS_CONTAINER = 'mqa-loadtest-redis'
+QUESTIONS = (
+    'What are the first-line treatments for type 2 diabetes?',
+    'Summarize the contraindications of ibuprofen.',
+    'How should hypertension be monitored at home?',
+    'What does an elevated CRP usually indicate?',
+)
+
+
+# ---------------------------------------------------------------------------
+# Stack
+# ---------------------------------------------------------------------------
+
+def _wait_until(check, what: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except Exception:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f'timed out after {timeout:.0f}s waiting for {what}')
+
+
+def _http_ok(url: str) -> bool:
+    return httpx.get(url, timeout=2).status_code < 500
+
+
+def start_containers(stack: ExitStack, args) -> dict:
+    """MySQL and Redis in throwaway containers; returns the env that points the app at them."""
+    password = 'loadtest'
+    for name in (MYSQL_CONTAINER, REDIS_CONTAINER):
+        subprocess.run(['docker', 'rm', '-f', name], capture_output=True)
+    subprocess.run([
+        'docker', 'run', '-d', '--rm', '--name', MYSQL_CONTAINER,
+        '-e', f'MYSQL_ROOT_PASSWORD={password}', '-e', 'MYSQL_DATABASE=medical_qa',
+        '-p', f'127.0.0.1:{args.mysql_port}:3306', 'mysql:8.0',
+    ], check=True, capture_output=True)
+    stack.callback(subprocess.run, ['docker', 'rm', '-f', MYSQL_CONTAINER], capture_output=True)
+    subprocess.run([
+        'docker', 'run', '-d', '--rm', '--name', REDIS_CONTAINER,
+        '-p', f'127.0.0.1:{args.redis_port}:6379', 'redis:7', 'redis-server', '--requirepass', password,
+    ], check=True, capture_output=True)
+    stack.callback(subprocess.run, ['docker', 'rm', '-f', REDIS_CONTAINER], capture_output=True)
+
+    # Over TCP so the temporary server MySQL runs during initialization doesn't count as ready
+    _wait_until(lambda: subprocess.run(
+        ['docker', 'exec', MYSQL_CONTAINER, 'mysqladmin', 'ping', '-h127.0.0.1', '-uroot', f'-p{password}', '--silent'],
+        capture_output=True,
+    ).returncode == 0, 'mysql', 120)
+    _wait_until(lambda: subprocess.run(
+        ['docker', 'exec', REDIS_CONTAINER, 'redis-cli', '-a', password, 'ping'], capture_output=True,
+    ).returncode == 0, 'redis', 30)
+    return {
+        'MYSQL_HOST': '127.0.0.1', 'MYSQL_PORT': str(args.mysql_port), 'MYSQL_USER': 'root',
+        'MYSQL_PASSWORD': password, 'MYSQL_DATABASE': 'medical_qa',
+        'REDIS_HOST': '127.0.0.1', 'REDIS_PORT': str(args.redis_port), 'REDIS_PASSWORD': password,
+        'REDIS_DATABASE': '0',
+    }
+
+
+def _spawn(stack: ExitStack, cmd: list[str], env: dict, log_name: str) -> subprocess.Popen:
+    log = stack.enter_context(open(ROOT / 'benchmarks' / 'results' / log_name, 'w'))
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    def stop():
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    stack.callback(stop)
+    return proc
+
+
+def start_stack(stack: ExitStack, args) -> tuple[str, int | None]:
+    """Start everything the run needs; returns the app base URL and its PID (None if external)."""
+    if args.app_url:
+        return args.app_url.rstrip('/'), None
+    (ROOT / 'benchmarks' / 'results').mkdir(exist_ok=True)
+    env = dict(os.environ)
+    if args.docker:
+        env.update(start_containers(stack, args))
+    env.setdefault('ENVIRONMENT', 'pro')
+    env.setdefault('TOKEN_SECRET_KEY', 'loadtest-secret')
+    env['OLLAMA_API_URL'] = f'http://127.0.0.1:{args.fake_llm_port}'
+    # The suite measures the app, not the per-account login limiter
+    env['LOGIN_RATE_PER_MINUTE'] = str(args.login_rate_per_minute)
+    env['LOGIN_RATE_BURST'] = str(args.login_rate_per_minute)
+
+    _spawn(stack, [
+        sys.executable, '-m', 'benchmarks.loadtest.fake_llm', '--port', str(args.fake_llm_port),
+        '--tokens', str(args.tokens), '--tokens-per-second', str(args.tokens_per_second), '--ttft', str(args.ttft),
+    ], env, 'fake_llm.log')
+    _wait_until(lambda: _http_ok(f'http://127.0.0.1:{args.fake_llm_port}/api/tags'), 'fake model server', 30)
+
+    if not args.skip_seed:
+        subprocess.run([
+            sys.executable, '-m', 'benchmarks.loadtest.seed', '--users', str(args.accounts), '--password', args.password,
+        ], cwd=ROOT, env=env, check=True)
+
+    app = _spawn(stack, [
+        sys.executable, '-m', 'uvicorn', 'core.registrar:register_app', '--factory',
+        '--host', '127.0.0.1', '--port', str(args.app_port), '--workers', str(args.workers), '--log-level', 'warning',
+    ], env, 'app.log')
+    base_url = f'http://127.0.0.1:{args.app_port}'
+    _wait_until(lambda: _http_ok(f'{base_url}/docs'), 'app', 60)
+    return base_url, app.pid
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+# ---------------------------------------------------------------------------
+
+def _rss_kib(pid: int) -> int:
+    """VmRSS of a process plus its children (uvicorn --workers forks one process per worker)."""
+    total = 0
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    total += int(line.split()[1])
+                    break
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            for child in f.read().split():
+                total += _rss_kib(int(child))
+    except (FileNotFoundError, ProcessLookupError):
+        pass
+    return total
+
+
+async def sample_rss(pid: int, samples: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        samples.append(_rss_kib(pid))
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.ttft: list[float] = []
+        self.statuses: dict[str, int] = {}
+
+    def add(self, status: int | str, latency: float, ttft: float | None = None) -> None:
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        if isinstance(status, int) and status < 400:
+            self.latencies.append(latency)
+            if ttft is not None:
+                self.ttft.append(ttft)
+
+    def report(self, duration: float) -> dict:
+        ms = lambda v: None if v is None else round(v * 1000, 2)  # noqa: E731
+        report = {
+            'requests': sum(self.statuses.values()),
+            'ok': len(self.latencies),
+            'statuses': self.statuses,
+            'throughput_rps': round(len(self.latencies) / duration, 2),
+            'latency_ms': {q: ms(_percentile(self.latencies, v)) for q, v in (('p50', .5), ('p90', .9), ('p99', .99))},
+        }
+        if self.ttft:
+            report['ttft_ms'] = {q: ms(_percentile(self.ttft, v)) for q, v in (('p50', .5), ('p90', .9), ('p99', .99))}
+        return report
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+class VirtualUser:
+    def __init__(self, index: int, client: httpx.AsyncClient, args, stats: dict[str, Stats]):
+        self.client = client
+        self.args = args
+        self.stats = stats
+        self.username = f'loadtest{index % args.accounts}'
+        self.rng = random.Random(args.seed + index)
+        self.headers: dict[str, str] = {}
+
+    async def _login(self) -> httpx.Response:
+        return await self.client.post(
+            self.args.login_path, json={'username': self.username, 'password': self.args.password}
+        )
+
+    async def setup(self) -> None:
+        """Log in once. A failure is counted under `login` and the user carries on without a token."""
+        start = time.perf_counter()
+        try:
+            response = await self._login()
+        except httpx.HTTPError as e:
+            self.stats.setdefault('login', Stats()).add(type(e).__name__, 0.0)
+            return
+        if response.status_code >= 400:
+            self.stats.setdefault('login', Stats()).add(response.status_code, time.perf_counter() - start)
+            return
+        self.headers = {'Authorization': f'Bearer {response.json()["data"]["access_token"]}'}
+
+    async def login(self) -> None:
+        start = time.perf_counter()
+        response = await self._login()
+        self.stats['login'].add(response.status_code, time.perf_counter() - start)
+
+    async def chat(self) -> None:
+        body = {'question': self.rng.choice(QUESTIONS), 'session_id': uuid.uuid4().hex, 'mode': 'chat'}
+        start = time.perf_counter()
+        ttft = None
+        async with self.client.stream('POST', self.args.chat_path, json=body, headers=self.headers) as response:
+            if response.status_code < 400:
+                event = 'message'
+                async for line in response.aiter_lines():
+                    if line.startswith('event:'):
+                        event = line[6:].strip()
+                    elif line.startswith('data:') and ttft is None and event not in ('queue', 'ping'):
+                        ttft = time.perf_counter() - start
+                    elif not line:
+                        event = 'message'
+            else:
+                await response.aread()
+        self.stats['chat'].add(response.status_code, time.perf_counter() - start, ttft)
+
+    def _document(self, kind: str) -> tuple[str, bytes, str]:
+        size = self.args.upload_kib * 1024
+        if kind == 'upload':
+            # A tabular export like the ones clinicians upload for analysis
+            out = io.StringIO()
+            out.write('patient_id,age,systolic,diastolic,glucose\n')
+            while out.tell() < size:
+                r = self.rng
+                out.write(f'{r.randrange(10**6)},{r.randrange(18, 90)},{r.randrange(95, 180)},'
+                          f'{r.randrange(60, 110)},{r.uniform(3.5, 14):.1f}\n')
+            return f'{uuid.uuid4().hex}.csv', out.getvalue().encode(), 'text/csv'
+        sentence = ' '.join(self.rng.choice(QUESTIONS) for _ in range(8)) + '\n'
+        return f'{uuid.uuid4().hex}.txt', (sentence * (size // len(sentence) + 1)).encode()[:size], 'text/plain'
+
+    async def _post_file(self, scenario: str, path: str) -> None:
+        files = {'file': self._document(scenario)}
+        start = time.perf_counter()
+        response = await self.client.post(path, files=files, headers=self.headers)
+        self.stats[scenario].add(response.status_code, time.perf_counter() - start)
+
+    async def upload(self) -> None:
+        await self._post_file('upload', self.args.upload_path)
+
+    async def ingest(self) -> None:
+        await self._post_file('ingest', self.args.ingest_path.format(kb_id=self.args.kb_id))
+
+    async def run(self, mix: dict[str, float], deadline: float) -> None:
+        names, weights = list(mix), list(mix.values())
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(names, weights)[0]
+            try:
+                await getattr(self, scenario)()
+            except httpx.HTTPError as e:
+                self.stats[scenario].add(type(e).__name__, 0.0)
+            if self.args.think:
+                await asyncio.sleep(self.rng.expovariate(1 / self.args.think))
+
+
+async def drive(base_url: str, app_pid: int | None, args) -> dict:
+    mix = parse_mix(args.mix)
+    stats = {name: Stats() for name in mix}
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.request_timeout, connect=10)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        users = [VirtualUser(i, client, args, stats) for i in range(args.concurrency)]
+        await asyncio.gather(*(u.setup() for u in users))
+
+        rss: list[int] = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(app_pid, rss, stop)) if app_pid else None
+        start = time.monotonic()
+        await asyncio.gather(*(u.run(mix, start + args.duration) for u in users))
+        elapsed = time.monotonic() - start
+        stop.set()
+        if sampler:
+            await sampler
+
+    return {
+        'elapsed_seconds': round(elapsed, 2),
+        'scenarios': {name: s.report(elapsed) for name, s in stats.items()},
+        'rss_mib': {'peak': round(max(rss) / 1024, 1), 'end': round(rss[-1] / 1024, 1)} if rss else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f'unknown scenario {name!r}; expected one of {", ".join(SCENARIOS)}')
+        mix[name.strip()] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def _git(*cmd: str) -> str:
+    return subprocess.run(['git', *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    stack_args = parser.add_argument_group('stack')
+    stack_args.add_argument('--docker', action='store_true', help='run MySQL and Redis in throwaway containers')
+    stack_args.add_argument('--app-url', help='drive an already running app instead of starting one')
+    stack_args.add_argument('--app-port', type=int, default=18000)
+    stack_args.add_argument('--workers', type=int, default=1)
+    stack_args.add_argument('--mysql-port', type=int, default=13306)
+    stack_args.add_argument('--redis-port', type=int, default=16379)
+    stack_args.add_argument('--skip-seed', action='store_true')
+    stack_args.add_argument('--accounts', type=int, default=50)
+    stack_args.add_argument('--password', default='loadtest-password')
+    stack_args.add_argument('--login-rate-per-minute', type=int, default=100_000)
+
+    model_args = parser.add_argument_group('fake model')
+    model_args.add_argument('--fake-llm-port', type=int, default=11500)
+    model_args.add_argument('--tokens', type=int, default=256)
+    model_args.add_argument('--tokens-per-second', type=float, default=40.0)
+    model_args.add_argument('--ttft', type=float, default=0.3)
+
+    load_args = parser.add_argument_group('load')
+    load_args.add_argument('--duration', type=float, default=60)
+    load_args.add_argument('--concurrency', type=int, default=32)
+    load_args.add_argument('--mix', default='login=1,chat=6,upload=2,ingest=1')
+    load_args.add_argument('--think', type=float, default=0.5, help='mean think time between requests (s)')
+    load_args.add_argument('--upload-kib', type=int, default=256)
+    load_args.add_argument('--kb-id', type=int, default=1)
+    load_args.add_argument('--request-timeout', type=float, default=120)
+    load_args.add_argument('--seed', type=int, default=0)
+
+    path_args = parser.add_argument_group('routes')
+    path_args.add_argument('--login-path', default='/api/auth/user/login')
+    path_args.add_argument('--chat-path', default='/api/llm/generate')
+    path_args.add_argument('--upload-path', default='/api/llm/file/upload')
+    path_args.add_argument('--ingest-path', default='/api/knowledge/base/{kb_id}/upload')
+
+    parser.add_argument('--out', type=Path, help='report path (default: benchmarks/results/loadtest-<commit>.json)')
+    args = parser.parse_args()
+
+    commit = _git('rev-parse', '--short', 'HEAD')
+    with ExitStack() as stack:
+        base_url, app_pid = start_stack(stack, args)
+        results = asyncio.run(drive(base_url, app_pid, args))
+
+    report = {
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        **results,
+    }
+    out = args.out or ROOT / 'benchmarks' / 'results' / f'loadtest-{commit}.json'
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+
+    for name, r in results['scenarios'].items():
+        ttft = r.get('ttft_ms', {}).get('p50')
+        print(f'{name:<7} {r["throughput_rps"]:8.2f} req/s   p50 {r["latency_ms"]["p50"]} ms   '
+              f'p99 {r["latency_ms"]["p99"]} ms' + (f'   ttft p50 {ttft} ms' if ttft is not None else '')
+              + f'   {r["statuses"]}')
+    if results['rss_mib']:
+        print(f'rss     peak {results["rss_mib"]["peak"]} MiB   end {results["rss_mib"]["end"]} MiB')
+    print(f'report written to {out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+📍 Path: benchmarks/loadtest/seed.py
+
+📌 Prepare a throwaway database for a load test
+
+Creates all tables and `--users` accounts named `loadtest0..N-1` sharing one password.
+Accounts already present are left alone, so re-running against the same container is cheap.
+Run with the same environment as the app under test (run.py does this for you).
+
+Usage:
+    python -m benchmarks.loadtest.seed [--users 50] [--password loadtest-password]
+"""
+
+import argparse
+import asyncio
+
+import bcrypt
+from sqlalchemy import select
+
+from app.admin.model import User
+from common.security.jwt import get_hash_password
+from database.db_mysql import async_db_session, create_table
+
+
+async def seed(users: int, password: str) -> None:
+    await create_table()
+    # One hash for every account: bcrypt per user would dominate seeding time
+    hashed = get_hash_password(password, bcrypt.gensalt())
+    names = [f'loadtest{i}' for i in range(users)]
+    async with async_db_session.begin() as db:
+        existing = set((await db.scalars(select(User.username).where(User.username.in_(names)))).all())
+        for name in names:
+            if name not in existing:
+                # Multi-login so concurrent virtual users sharing an account don't revoke each other
+                db.add(User(username=name, nickname=name, password=hashed, email=None, is_multi_login=True))
+    print(f'seeded {len(names) - len(existing)} users ({len(existing)} already present)')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--password', default='loadtest-password')
+    args = parser.parse_args()
+    asyncio.run(seed(args.users, args.password))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# cache_version.py
+# -----------------------------------------
+# 📁 Description:
+# Global version counters kept in Redis for derived, rarely-changing caches
+# (menu trees, dictionary/config snapshots).
+# - Writers call `bump()` after committing a change; every worker sees the new version
+# - Readers call `get()`, which re-reads Redis at most every CACHE_VERSION_CHECK_SECONDS
+#   so hot paths do not pay a network hop per request
+# Cache entries are keyed by version, so a bump invalidates them without deleting anything.
+# If Redis is unreachable, bump() keeps the bump pending for every CacheVersion of that name
+# in this process and retries it on the next Redis check, so other workers catch up as soon
+# as Redis is back. Meanwhile this worker reports a local version ('<n>.local<k>'), which
+# never equals a Redis version; use `is_shared()` to keep it out of shared cache keys.
+# -----------------------------------------
+
+import time
+from collections import defaultdict
+
+from loguru import logger
+
+from config.settings import settings
+from database.db_redis import redis_client
+
+# key -> bumps not yet applied in Redis (menu cache and permission index share 'menu')
+_pending_bumps: defaultdict[str, int] = defaultdict(int)
+
+
+class CacheVersion:
+    def __init__(self, name: str):
+        self.key = f'{settings.CACHE_VERSION_PREFIX}:{name}'
+        self._value = 0
+        self._checked_at = float('-inf')
+
+    @staticmethod
+    def is_shared(version: str) -> bool:
+        """False for a local version, which must not be used in keys other workers read."""
+        return '.local' not in version
+
+    def _current(self) -> str:
+        pending = _pending_bumps[self.key]
+        return f'{self._value}.local{pending}' if pending else str(self._value)
+
+    async def _apply_pending(self) -> None:
+        # Any number of missed bumps is applied as one increment
+        pending = _pending_bumps.pop(self.key, 0)
+        if not pending:
+            return
+        try:
+            self._value = await redis_client.incr(self.key)
+        except BaseException:
+            _pending_bumps[self.key] += pending
+            raise
+
+    async def get(self) -> str:
+        now = time.monotonic()
+        if now - self._checked_at < settings.CACHE_VERSION_CHECK_SECONDS:
+            return self._current()
+        try:
+            await self._apply_pending()
+            self._value = int(await redis_client.get(self.key) or 0)
+        except Exception as e:
+            # Keep serving the last known version rather than failing the request
+            logger.warning(f'Cache version read failed for {self.key}: {e}')
+        self._checked_at = now
+        return self._current()
+
+    async def bump(self) -> str:
+        _pending_bumps[self.key] += 1
+        try:
+            await self._apply_pending()
+        except Exception as e:
+            logger.error(f'Cache version bump failed for {self.key}, keeping it pending: {e}')
+        self._checked_at = time.monotonic()
+        return self._current()
@@ -0,0 +1,75 @@
+# metrics.py
+# -----------------------------------------
+# 📁 Description:
+# Prometheus metrics shared across the backend.
+# Keep every metric definition here so names stay unique and discoverable.
+# Under several server workers, main.py sets PROMETHEUS_MULTIPROC_DIR before this
+# module is imported and /metrics aggregates the per-process files.
+# -----------------------------------------
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Requests and stages
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_seconds',
+    'Time until the response starts, per route template',
+    ['method', 'route', 'status'],
+)
+STAGE_SECONDS = Histogram(
+    'request_stage_seconds',
+    'Time spent in instrumented hot-path stages (upload parsing, retrieval, ...)',
+    ['stage'],
+)
+DB_QUERY_SECONDS = Histogram(
+    'db_query_seconds',
+    'SQL statement execution time',
+    ['operation'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+# Database pools
+DB_POOL_WAIT_SECONDS = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent waiting to check out a pooled database connection',
+    ['pool'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Checkouts that gave up after MYSQL_POOL_TIMEOUT', ['pool'])
+
+# LLM generation
+LLM_CHUNKS_WASTED = Counter(
+    'llm_token_chunks_wasted_by_disconnect_total',
+    'Token chunks generated while no client was listening and never delivered',
+)
+LLM_GENERATIONS_CANCELLED = Counter(
+    'llm_generations_cancelled_total',
+    'Generations stopped upstream because the SSE client disconnected',
+)
+LLM_TTFT_SECONDS = Histogram(
+    'llm_time_to_first_token_seconds',
+    'Time from accepting a generation (including queueing and retrieval) to its first token chunk',
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60),
+)
+LLM_CHUNKS_GENERATED = Counter('llm_token_chunks_generated_total', 'Token chunks produced by the LLM')
+
+# Caches
+CACHE_REQUESTS = Counter('cache_requests_total', 'Cache lookups by cache tier and result', ['cache', 'result'])
+
+# Login log sink
+LOGIN_LOG_WRITTEN = Counter('login_log_written_total', 'Login log records written in batches')
+LOGIN_LOG_DROPPED = Counter('login_log_dropped_total', 'Login log records dropped before reaching the database', ['reason'])
+
+# Audit retention
+RETENTION_PARTITIONS_DROPPED = Counter('retention_partitions_dropped_total', 'Expired audit partitions dropped', ['table'])
+RETENTION_ROWS_PURGED = Counter('retention_rows_purged_total', 'Audit rows removed by chunked purges', ['table'])
+
+# Knowledge base near-duplicates
+KB_CHUNKS_COLLAPSED = Counter(
+    'kb_chunks_collapsed_total', 'Near-duplicate chunks collapsed at ingestion or suppressed in results', ['stage']
+)
+
+# Admission control
+ADMISSION_QUEUE_DEPTH = Gauge(
+    'llm_admission_queue_depth', 'Generations waiting for a free LLM slot', multiprocess_mode='livesum'
+)
+ADMISSION_REJECTED = Counter('llm_admission_rejected_total', 'Generations shed with 429', ['reason'])
@@ -12,19 +12,68 @@
 # Supports:
 # - success(): normal response with validation
 # - fail(): failure response
-# - fast_success(): fast JSON response (skip pydantic validation)
+# - fast_success(): fast JSON response (skip pydantic validation, orjson encoding)
+# - stream_success(): large lists streamed as a JSON array, chunk by chunk
+#
+# The fast paths are for trusted data only (ORM rows, dicts built by the service layer):
+# rows are turned into dicts straight from their mapped columns and never re-validated.
 # -----------------------------------------
 
-from datetime import datetime
+from collections.abc import AsyncIterable, Iterable
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any
 
+import orjson
 from fastapi import Response
 from pydantic import BaseModel, ConfigDict
-from starlette.responses import JSONResponse
+from sqlalchemy import inspect
+from starlette.responses import JSONResponse, StreamingResponse
 
 from common.response.response_code import CustomResponse, CustomResponseCode
 from config.settings import settings
 
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_STREAM_CHUNK_ROWS = 500
+_column_keys: dict[type, tuple[str, ...]] = {}
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.strftime(settings.DATETIME_FORMAT)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if hasattr(type(obj), '__mapper__'):
+        return row_as_dict(obj)
+    raise TypeError
+
+
+def row_as_dict(row: Any) -> dict:
+    """Plain dict of an ORM row's mapped columns (no relationships, no validation)."""
+    cls = type(row)
+    keys = _column_keys.get(cls)
+    if keys is None:
+        keys = _column_keys[cls] = tuple(attr.key for attr in inspect(cls).column_attrs)
+    values = inspect(row).dict
+    # Expired or deferred columns are not in the instance state: go through the attribute so they
+    # are loaded (or fail loudly) instead of silently serializing as null
+    return {key: values[key] if key in values else getattr(row, key) for key in keys}
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson; ORM rows and datetimes are handled without Pydantic."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
 
 class ResponseModel(BaseModel):
     """Standard API response"""
@@ -43,7 +92,44 @@ class ResponseBase:
         return ResponseModel(code=res.code, msg=res.msg, data=data)
 
     def fast_success(self, *, res: CustomResponseCode | CustomResponse = CustomResponseCode.HTTP_200, data: Any | None = None) -> Response:
-        return JSONResponse({'code': res.code, 'msg': res.msg, 'data': data})
+        return FastJSONResponse({'code': res.code, 'msg': res.msg, 'data': data})
+
+    def stream_success(
+        self,
+        *,
+        res: CustomResponseCode | CustomResponse = CustomResponseCode.HTTP_200,
+        rows: Iterable[Any] | AsyncIterable[Any],
+    ) -> Response:
+        """Stream `{"code", "msg", "data": [...]}` without materializing the whole body."""
+        head = dumps({'code': res.code, 'msg': res.msg})[:-1] + b',"data":['
+
+        async def body():
+            yield head
+            chunk: list[bytes] = []
+            first = True
+
+            def flush() -> bytes:
+                nonlocal first
+                out = (b'' if first else b',') + b','.join(chunk)
+                first = False
+                chunk.clear()
+                return out
+
+            if isinstance(rows, AsyncIterable):
+                async for row in rows:
+                    chunk.append(dumps(row))
+                    if len(chunk) >= _STREAM_CHUNK_ROWS:
+                        yield flush()
+            else:
+                for row in rows:
+                    chunk.append(dumps(row))
+                    if len(chunk) >= _STREAM_CHUNK_ROWS:
+                        yield flush()
+            if chunk:
+                yield flush()
+            yield b']}'
+
+        return StreamingResponse(body(), media_type='application/json')
 
 
 response_base = ResponseBase()
@@ -4,12 +4,14 @@
 # This module handles JWT-based authentication including:
 # - Token generation (access & refresh)
 # - Token decoding
-# - Password hashing and verification
-# - User fetching via token
+# - Password hashing and verification (offloaded to a bounded thread pool)
+# - User fetching via token (cached, see user_cache.py)
 # -----------------------------------------
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from fastapi import Request
+from fastapi import Depends, Request
 from fastapi.security.utils import get_authorization_scheme_param
 from jose import ExpiredSignatureError, JWTError, jwt
 from pwdlib import PasswordHash
@@ -20,6 +22,7 @@ from app.admin.model import User
 from app.admin.schema.user import CurrentUserIns
 from common.dataclasses import AccessToken, NewToken, RefreshToken
 from common.exception.errors import AuthorizationError, TokenError
+from common.security.user_cache import user_cache
 from config.settings import settings
 from database.db_mysql import async_db_session
 from utils.serializers import select_as_dict
@@ -27,6 +30,11 @@ from utils.timezone import timezone
 
 password_hash = PasswordHash((BcryptHasher(),))
 
+# bcrypt releases the GIL, so a dedicated pool keeps hashing off the event loop.
+# The semaphore bounds how many jobs can be queued on the pool at once.
+_password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+_password_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS * 2)
+
 
 def get_hash_password(password: str, salt: bytes | None) -> str:
     return password_hash.hash(password, salt=salt)
@@ -36,6 +44,18 @@ def password_verify(plain_password: str, hashed_password: str) -> bool:
     return password_hash.verify(plain_password, hashed_password)
 
 
+async def get_hash_password_async(password: str, salt: bytes | None) -> str:
+    async with _password_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, get_hash_password, password, salt)
+
+
+async def password_verify_async(plain_password: str, hashed_password: str) -> bool:
+    async with _password_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, password_verify, plain_password, hashed_password)
+
+
 async def create_access_token(sub: str, multi_login: bool) -> AccessToken:
     expire = timezone.now() + timedelta(seconds=settings.TOKEN_EXPIRE_SECONDS)
     to_encode = {'exp': expire, 'sub': sub}
@@ -81,6 +101,23 @@ async def get_current_user(db: AsyncSession, pk: int) -> User:
 
 async def jwt_authentication(token: str) -> CurrentUserIns:
     user_id = jwt_decode(token)
-    async with async_db_session() as db:
-        current_user = await get_current_user(db, user_id)
-        return CurrentUserIns(**select_as_dict(current_user))
+    user = await user_cache.get(user_id)
+    if user is None:
+        # Read before the load, so set() can tell whether the user changed while we queried
+        generation = await user_cache.generation(user_id)
+        async with async_db_session() as db:
+            current_user = await get_current_user(db, user_id)
+            user = CurrentUserIns(**select_as_dict(current_user))
+        await user_cache.set(user_id, user, generation)
+    return user
+
+
+async def jwt_auth(request: Request) -> CurrentUserIns:
+    """Dependency: authenticate the bearer token and return the current user."""
+    user = await jwt_authentication(get_token(request))
+    # Kept on the request so middleware can reuse it instead of authenticating again
+    request.state.user = user
+    return user
+
+
+DependsJwtAuth = Depends(jwt_auth)
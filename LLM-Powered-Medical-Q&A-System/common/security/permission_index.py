@@ -0,0 +1,135 @@
+# permission_index.py
+# -----------------------------------------
+# 📁 Description:
+# Compiled RBAC permission index used by `rbac.py`.
+# Permission rules live on menus (`menu.perms`), comma-separated, each as
+# "<METHODS>:<path prefix>", e.g. "GET:/api/v1/sys/dict_data" or "GET|POST:/api/v1/llm"
+# ("*" allows every method). A role is granted the rules of its enabled menus.
+#
+# At startup (and whenever the menu/role version changes) all rules are loaded once
+# and compiled into path-prefix tries:
+# - one trie per role set, built on first use and memoized
+# - one global trie that tells which paths are managed by any rule at all
+# A check is then a walk over the request path's segments: no database access.
+# Paths no rule mentions fall back to the coarse checks in rbac.py.
+#
+# A failed build (e.g. the database is down at startup) is not fatal: it is retried on
+# later checks at most every _RETRY_SECONDS. Until a first build succeeds every checked
+# request is denied; after that, a failed rebuild keeps serving the last compiled index.
+# -----------------------------------------
+
+import asyncio
+import time
+from collections.abc import Iterable
+
+from loguru import logger
+
+from app.admin.service.role_service import role_service
+from common.cache_version import CacheVersion
+
+_ALL = '*'
+_RETRY_SECONDS = 5
+
+
+def parse_rules(perms: str | None) -> list[tuple[str, set[str]]]:
+    rules = []
+    for rule in (perms or '').split(','):
+        methods, sep, prefix = rule.strip().partition(':')
+        if not sep or not prefix.startswith('/'):
+            continue
+        rules.append((prefix, {m.strip().upper() for m in methods.split('|') if m.strip()}))
+    return rules
+
+
+class PathTrie:
+    __slots__ = ('children', 'methods')
+
+    def __init__(self):
+        self.children: dict[str, PathTrie] = {}
+        self.methods: set[str] = set()
+
+    def insert(self, prefix: str, methods: Iterable[str]) -> None:
+        node = self
+        for segment in prefix.strip('/').split('/'):
+            if segment:
+                node = node.children.setdefault(segment, PathTrie())
+        node.methods.update(methods)
+
+    def match(self, path: str, method: str | None = None) -> bool:
+        """True if a rule covering `path` allows `method` (any method when None)."""
+        node = self
+        for segment in path.strip('/').split('/'):
+            if node.methods and (method is None or method in node.methods or _ALL in node.methods):
+                return True
+            node = node.children.get(segment)
+            if node is None:
+                return False
+        return bool(node.methods) and (method is None or method in node.methods or _ALL in node.methods)
+
+
+class PermissionIndex:
+    def __init__(self, max_role_sets: int = 1024):
+        self.version = CacheVersion('menu')  # bumped by menu_tree_cache.invalidate() on menu/role writes
+        self.max_role_sets = max_role_sets
+        self._loaded_version: str | None = None
+        self._retry_at = float('-inf')
+        self._lock = asyncio.Lock()
+        self._role_rules: dict[int, list[tuple[str, set[str]]]] = {}
+        self._managed = PathTrie()
+        self._tries: dict[frozenset[int], PathTrie] = {}
+
+    async def rebuild(self) -> None:
+        """Load every role's rules once and reset the compiled tries."""
+        role_rules: dict[int, list[tuple[str, set[str]]]] = {}
+        managed = PathTrie()
+        for role in await role_service.get_all():
+            if not role.status:
+                continue
+            rules = [rule for menu in role.menus if menu.status for rule in parse_rules(menu.perms)]
+            role_rules[role.id] = rules
+            for prefix, methods in rules:
+                managed.insert(prefix, methods)
+        self._role_rules, self._managed, self._tries = role_rules, managed, {}
+        logger.info(f'RBAC permission index compiled for {len(role_rules)} roles')
+
+    async def ensure(self) -> None:
+        version = await self.version.get()
+        if version == self._loaded_version:
+            return
+        async with self._lock:
+            if version != self._loaded_version:
+                await self.rebuild()
+                self._loaded_version = version
+
+    async def try_ensure(self) -> bool:
+        """ensure() that never raises; returns False while no index has been compiled yet."""
+        if time.monotonic() >= self._retry_at:
+            try:
+                await self.ensure()
+            except Exception as e:
+                self._retry_at = time.monotonic() + _RETRY_SECONDS
+                logger.error(f'RBAC permission index build failed, retrying in {_RETRY_SECONDS}s: {e}')
+        return self._loaded_version is not None
+
+    def _trie(self, role_ids: frozenset[int]) -> PathTrie:
+        trie = self._tries.get(role_ids)
+        if trie is None:
+            trie = PathTrie()
+            for role_id in role_ids:
+                for prefix, methods in self._role_rules.get(role_id, ()):
+                    trie.insert(prefix, methods)
+            if len(self._tries) >= self.max_role_sets:
+                self._tries.clear()
+            self._tries[role_ids] = trie
+        return trie
+
+    async def allowed(self, role_ids: frozenset[int], method: str, path: str) -> bool:
+        if not await self.try_ensure():
+            # Without an index there is no telling which paths are protected
+            return False
+        if not self._managed.match(path):
+            return True
+        return self._trie(role_ids).match(path, method)
+
+
+permission_index = PermissionIndex()
@@ -2,7 +2,8 @@
 # -----------------------------------------
 # 📁 Description:
 # This module implements Role-Based Access Control (RBAC) as a FastAPI dependency.
-# It validates JWT scopes, staff status, and basic user role requirements.
+# It validates JWT scopes, staff status, and basic user role requirements,
+# then checks method + path against the compiled permission index (no DB access).
 #
 # Note: Simplified for public demo purposes.
 # -----------------------------------------
@@ -11,6 +12,7 @@ from fastapi import Depends, Request
 
 from common.exception.errors import AuthorizationError, TokenError
 from common.security.jwt import DependsJwtAuth
+from common.security.permission_index import permission_index
 
 
 class RBAC:
@@ -34,6 +36,11 @@ class RBAC:
             if not request.user.is_staff:
                 raise AuthorizationError(msg='User not authorized for admin operations')
 
+        # Per-path permissions granted through the user's role menus
+        role_ids = frozenset(role.id for role in request.user.roles if role.status)
+        if not await permission_index.allowed(role_ids, request.method, path):
+            raise AuthorizationError(msg='Permission denied for this resource')
+
 
 rbac = RBAC()
 DependsRBAC = Depends(rbac.rbac_verify)
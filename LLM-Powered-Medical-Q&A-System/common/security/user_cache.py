@@ -0,0 +1,123 @@
+# user_cache.py
+# -----------------------------------------
+# 📁 Description:
+# Two-tier cache of authenticated users for `jwt_authentication`.
+# - Local tier: small per-process LRU with a very short TTL (no network hop)
+# - Redis tier: shared by all workers with a longer TTL
+#
+# Writes through `sys_user` / `sys_role` / `sys_dept` APIs invalidate entries explicitly.
+# Other workers may serve a stale local entry for at most USER_CACHE_LOCAL_TTL_SECONDS.
+# Every invalidation also bumps a counter (per user, and one for invalidate_all). Loaders read
+# the counters before querying the database and `set()` re-checks them after writing the
+# entry, deleting it again if an invalidation raced with the load; otherwise a miss that read
+# the user just before an update could put the old row back for USER_CACHE_REDIS_TTL_SECONDS.
+# Redis errors degrade to a cache miss, never to an authentication failure; a failed
+# invalidation is logged and the Redis entry lives until its TTL.
+# -----------------------------------------
+
+import time
+from collections import OrderedDict
+
+from loguru import logger
+
+from app.admin.schema.user import CurrentUserIns
+from common.tracing import record_cache
+from config.settings import settings
+from database.db_redis import redis_client
+
+
+class UserCache:
+    prefix = f'{settings.USER_CACHE_REDIS_PREFIX}:'
+    # Outside `prefix`, so invalidate_all() doesn't delete the counters it bumps
+    generation_prefix = f'{settings.USER_CACHE_REDIS_PREFIX}-gen:'
+
+    def __init__(self):
+        self._local: OrderedDict[int, tuple[float, CurrentUserIns]] = OrderedDict()
+
+    def _set_local(self, user_id: int, user: CurrentUserIns) -> None:
+        self._local[user_id] = (time.monotonic() + settings.USER_CACHE_LOCAL_TTL_SECONDS, user)
+        self._local.move_to_end(user_id)
+        while len(self._local) > settings.USER_CACHE_LOCAL_SIZE:
+            self._local.popitem(last=False)
+
+    async def get(self, user_id: int) -> CurrentUserIns | None:
+        entry = self._local.get(user_id)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._local.move_to_end(user_id)
+                record_cache('user_local', 'hit')
+                return entry[1]
+            del self._local[user_id]
+        record_cache('user_local', 'miss')
+
+        try:
+            raw = await redis_client.get(f'{self.prefix}{user_id}')
+        except Exception as e:
+            logger.warning(f'User cache read failed: {e}')
+            return None
+        if raw is None:
+            record_cache('user_redis', 'miss')
+            return None
+        record_cache('user_redis', 'hit')
+        user = CurrentUserIns.model_validate_json(raw)
+        self._set_local(user_id, user)
+        return user
+
+    def _generation_keys(self, user_id: int) -> tuple[str, str]:
+        return f'{self.generation_prefix}{user_id}', f'{self.generation_prefix}all'
+
+    async def generation(self, user_id: int) -> tuple | None:
+        """Invalidation counters for a user; read them before loading the user from the database."""
+        try:
+            return tuple(await redis_client.mget(*self._generation_keys(user_id)))
+        except Exception as e:
+            logger.warning(f'User cache read failed: {e}')
+            return None
+
+    async def set(self, user_id: int, user: CurrentUserIns, generation: tuple | None) -> None:
+        """Cache a user loaded after `generation()` returned `generation`, unless it was invalidated since."""
+        if generation is None:
+            # Redis was unreachable before the load: only the short-lived local tier is safe
+            self._set_local(user_id, user)
+            return
+        key = f'{self.prefix}{user_id}'
+        try:
+            await redis_client.setex(key, settings.USER_CACHE_REDIS_TTL_SECONDS, user.model_dump_json())
+            # Delete-after-write: invalidations bump a counter before deleting, so a bump we
+            # don't see here came after our write and its delete will remove the entry itself
+            if tuple(await redis_client.mget(*self._generation_keys(user_id))) != generation:
+                await redis_client.delete(key)
+                return
+        except Exception as e:
+            logger.warning(f'User cache write failed: {e}')
+            return
+        self._set_local(user_id, user)
+
+    async def _bump_and_delete(self, generation_key: str, *keys: str) -> None:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, settings.USER_CACHE_REDIS_TTL_SECONDS)
+            if keys:
+                pipe.delete(*keys)
+            await pipe.execute()
+
+    async def invalidate(self, user_id: int) -> None:
+        """Drop one user, e.g. after a profile, role assignment or status change."""
+        self._local.pop(user_id, None)
+        try:
+            await self._bump_and_delete(self._generation_keys(user_id)[0], f'{self.prefix}{user_id}')
+        except Exception as e:
+            # The Redis entry stays valid until USER_CACHE_REDIS_TTL_SECONDS; don't fail the write
+            logger.error(f'User cache invalidation failed for user {user_id}: {e}')
+
+    async def invalidate_all(self) -> None:
+        """Drop every user, e.g. after a role or department change that affects many users."""
+        self._local.clear()
+        try:
+            await self._bump_and_delete(f'{self.generation_prefix}all')
+            await redis_client.delete_prefix(self.prefix)
+        except Exception as e:
+            logger.error(f'User cache invalidation failed: {e}')
+
+
+user_cache = UserCache()
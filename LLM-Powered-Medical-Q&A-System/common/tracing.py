@@ -0,0 +1,101 @@
+# tracing.py
+# -----------------------------------------
+# 📁 Description:
+# Lightweight per-request spans for the hot paths (DB queries, upload parsing,
+# retrieval, LLM streaming). Every span is exported to Prometheus as
+# `request_stage_seconds{stage}` and also accumulated on the current request's
+# trace, which the instrumentation middleware turns into a Server-Timing header.
+#
+# Usage:
+#     with span('upload.parse'):
+#         text = file_parse(path)
+# -----------------------------------------
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.metrics import CACHE_REQUESTS, DB_QUERY_SECONDS, STAGE_SECONDS
+
+
+class RequestTrace:
+    __slots__ = ('spans',)
+
+    def __init__(self):
+        self.spans: dict[str, list] = {}  # stage -> [count, total seconds]
+
+    def add(self, stage: str, seconds: float) -> None:
+        entry = self.spans.get(stage)
+        if entry is None:
+            self.spans[stage] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def server_timing(self) -> str:
+        return ', '.join(
+            f'{stage.replace(".", "-")};dur={seconds * 1000:.1f};desc="{count}x"'
+            for stage, (count, seconds) in self.spans.items()
+        )
+
+
+_current: ContextVar[RequestTrace | None] = ContextVar('request_trace', default=None)
+
+
+def start_trace() -> tuple[RequestTrace, Token]:
+    trace = RequestTrace()
+    return trace, _current.set(trace)
+
+
+def end_trace(token: Token) -> None:
+    _current.reset(token)
+
+
+def record(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.labels(stage=stage).observe(seconds)
+    trace = _current.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+def record_cache(cache: str, result: str) -> None:
+    """Count a cache lookup; shows up in Server-Timing as e.g. `cache-user_local-hit`."""
+    CACHE_REQUESTS.labels(cache=cache, result=result).inc()
+    trace = _current.get()
+    if trace is not None:
+        trace.add(f'cache.{cache}.{result}', 0.0)
+
+
+@contextmanager
+def span(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement on the engine; attributed to the request that issued it."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        DB_QUERY_SECONDS.labels(operation=statement.lstrip().split(None, 1)[0].upper()).observe(elapsed)
+        trace = _current.get()
+        if trace is not None:
+            trace.add('db', elapsed)
+
+    @event.listens_for(sync_engine, 'handle_error')
+    def _error(context):
+        # Keep the start-time stack balanced when a statement fails
+        if context.connection is not None and context.connection.info.get('query_start'):
+            context.connection.info['query_start'].pop()
@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     FASTAPI_TITLE: str = 'Medical LLM Q&A'
     FASTAPI_VERSION: str = '0.1.0'
     FASTAPI_API_PREFIX: str = '/api'
+    DATETIME_FORMAT: str = '%Y-%m-%d %H:%M:%S'
 
     # MySQL Database
     MYSQL_HOST: str
@@ -25,12 +26,20 @@ class Settings(BaseSettings):
     MYSQL_USER: str
     MYSQL_PASSWORD: str
     MYSQL_DATABASE: str
+    MYSQL_CHARSET: str = 'utf8mb4'
+    MYSQL_ECHO: bool = False
+    MYSQL_POOL_SIZE: int = 20
+    MYSQL_MAX_OVERFLOW: int = 10
+    MYSQL_POOL_TIMEOUT: int = 10
+    MYSQL_POOL_RECYCLE: int = 1800  # keep below the server's wait_timeout
+    MYSQL_REPLICA_HOSTS: list[str] = []  # "host" or "host:port"
 
     # Redis
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str
     REDIS_DATABASE: int
+    REDIS_TIMEOUT: int = 5
 
     # Token settings
     TOKEN_SECRET_KEY: str
@@ -38,6 +47,101 @@ class Settings(BaseSettings):
     TOKEN_EXPIRE_SECONDS: int = 60 * 60 * 24
     TOKEN_REFRESH_EXPIRE_SECONDS: int = 60 * 60 * 24 * 7
 
+    # File uploads
+    LLM_UPLOAD_MAX_SIZE: int = 100 * 1024 * 1024
+    LLM_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
+    # SSE answer streams
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_FLUSH_INTERVAL_MS: int = 20
+    SSE_FLUSH_MAX_CHARS: int = 512
+    SSE_BUFFER_SIZE: int = 2048
+    SSE_BACKPRESSURE_EVENTS: int = 256
+    SSE_RESUME_GRACE_SECONDS: int = 30
+    SSE_CANCEL_TIMEOUT_SECONDS: int = 2
+    SSE_RESUME_TTL_SECONDS: int = 300
+
+    # Data analysis sandbox
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_CPU_SECONDS: int = 30
+    ANALYSIS_TIMEOUT_SECONDS: int = 60
+    ANALYSIS_MEMORY_LIMIT_MB: int = 2048
+    ANALYSIS_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+    # LangGraph checkpointer
+    CHECKPOINT_BACKEND: Literal['memory', 'sqlite', 'redis'] = 'memory'
+    CHECKPOINT_MAX_THREADS: int = 1000
+    CHECKPOINT_TTL_SECONDS: int = 60 * 60 * 24
+    CHECKPOINT_SQLITE_PATH: str = 'checkpoints.sqlite'
+
+    # Admission control for LLM streams
+    LLM_MAX_CONCURRENT_STREAMS: int = 4
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_GLOBAL_RATE: float = 5.0
+    ADMISSION_GLOBAL_BURST: int = 20
+    ADMISSION_USER_RATE: float = 0.5
+    ADMISSION_USER_BURST: int = 3
+    ADMISSION_RETRY_AFTER_SECONDS: int = 10
+    ADMISSION_CLINICIAN_ROLES: list[str] = ['doctor', 'nurse', 'clinician']
+
+    # Authenticated user cache
+    USER_CACHE_LOCAL_SIZE: int = 10000
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 5
+    USER_CACHE_REDIS_TTL_SECONDS: int = 300
+    USER_CACHE_REDIS_PREFIX: str = 'medqa:user'
+
+    # Versioned caches (menus, dictionaries, configs)
+    CACHE_VERSION_PREFIX: str = 'medqa:version'
+    CACHE_VERSION_CHECK_SECONDS: float = 1.0
+    MENU_CACHE_REDIS_PREFIX: str = 'medqa:menu'
+    MENU_CACHE_TTL_SECONDS: int = 3600
+
+    # Password hashing and login throttling
+    PASSWORD_HASH_WORKERS: int = 4
+    LOGIN_RATE_PER_MINUTE: int = 10
+    LOGIN_RATE_BURST: int = 5
+    LOGIN_RATE_REDIS_PREFIX: str = 'medqa:login'
+
+    # Login log sink
+    LOGIN_LOG_BUFFER_SIZE: int = 10000
+    LOGIN_LOG_BATCH_SIZE: int = 200
+    LOGIN_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Audit log retention
+    AUDIT_RETENTION_DAYS: int = 400
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_AUTO_PARTITION: bool = False
+    RETENTION_INTERVAL_SECONDS: int = 6 * 3600
+    RETENTION_PURGE_CHUNK_SIZE: int = 5000
+    RETENTION_PURGE_PAUSE_SECONDS: float = 0.2
+
+    # Instrumentation
+    METRICS_ENABLED: bool = True
+    # Clients allowed to scrape /metrics; add the Prometheus server's address or network
+    METRICS_ALLOWED_NETWORKS: list[str] = ['127.0.0.1/32', '::1/128']
+    # Server-Timing reveals internal stage timings, so it is only sent to superusers
+    SERVER_TIMING_ENABLED: bool = True
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL_SECONDS: float = 0.001
+
+    # Knowledge base near-duplicate detection
+    KB_DEDUP_THRESHOLD: float = 0.85  # estimated Jaccard similarity of word 5-shingles
+    KB_DEDUP_NUM_PERM: int = 128
+    KB_DEDUP_SHINGLE_SIZE: int = 5
+    KB_DEDUP_REPORT_MIN_RATIO: float = 0.5  # share of a document's chunks duplicated elsewhere
+
+    # Knowledge base vector storage
+    KB_VECTOR_QUANTIZATION: Literal['flat', 'sq8', 'pq'] = 'sq8'
+    KB_VECTOR_PQ_SUBVECTOR_DIM: int = 2  # dimensions per PQ byte: 2 -> 8x smaller than float32, 4 -> 16x
+    KB_VECTOR_RERANK_FACTOR: int = 4  # candidates re-scored with float32 = k * factor
+    KB_VECTOR_MIN_TRAIN_VECTORS: int = 256 * 40  # stored exactly until this many vectors train the quantizer
+    KB_VECTOR_MERGE_FACTOR: int = 8  # segments of similar size merged into one
+
+    # Production server (python main.py --workers N)
+    SERVER_WORKERS: int = 1
+    SERVER_DRAIN_SECONDS: int = 60  # time in-flight SSE answers get to finish on reload/shutdown
+    SERVER_MAX_REQUESTS: int = 0  # recycle a worker after this many requests (0 = never)
+
     # CORS
     CORS_ALLOWED_ORIGINS: list[str] = ['*']
 
@@ -0,0 +1,133 @@
+# core/middleware.py — Request instrumentation: latency metrics, Server-Timing spans, on-demand profiling
+
+import ipaddress
+import time
+
+from loguru import logger
+from starlette.responses import HTMLResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from common.metrics import HTTP_REQUEST_SECONDS
+from common.security.jwt import jwt_authentication
+from common.tracing import end_trace, start_trace
+from config.settings import settings
+
+try:
+    from pyinstrument import Profiler
+except ImportError:  # optional dependency, only needed for X-Profile
+    Profiler = None
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware), so SSE streams are passed through untouched.
+
+    - Observes time to response start per route template, method and status
+    - For superusers (and SERVER_TIMING_ENABLED), adds a Server-Timing header summarizing the
+      request's spans (db, upload-parse, ...); the user is the one authentication already
+      resolved for the request, so this costs no extra lookup
+    - With `X-Profile: 1` from a superuser (and PROFILER_ENABLED), runs the request under a
+      sampling profiler and returns the profile as HTML instead of the normal response
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope['headers'])
+        if b'x-profile' in headers and settings.PROFILER_ENABLED and Profiler is not None:
+            # Profiling has to start before the endpoint runs, so only this opt-in path authenticates here
+            if await self._token_is_superuser(headers):
+                await self._profile(scope, receive, send)
+                return
+        # Shared with the endpoint's request.state, where jwt_auth leaves the authenticated user
+        state = scope.setdefault('state', {})
+
+        trace, token = start_trace()
+        start = time.perf_counter()
+        started = False
+
+        def observe(status: int) -> None:
+            route = scope.get('route')
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope['method'],
+                route=getattr(route, 'path', 'unmatched'),
+                status=str(status),
+            ).observe(time.perf_counter() - start)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started
+            if message['type'] == 'http.response.start':
+                started = True
+                observe(message['status'])
+                if settings.SERVER_TIMING_ENABLED and self._is_superuser(scope, state):
+                    timing = trace.server_timing()
+                    total = f'app;dur={(time.perf_counter() - start) * 1000:.1f}'
+                    message['headers'] = list(message.get('headers', [])) + [
+                        (b'server-timing', f'{timing}, {total}' if timing else total).encode('latin-1')
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not started:
+                observe(500)
+            end_trace(token)
+
+    @staticmethod
+    def _is_superuser(scope: Scope, state: dict) -> bool:
+        # jwt_auth's user, else one set by an authentication middleware (request.user)
+        user = state.get('user') or scope.get('user')
+        return bool(getattr(user, 'is_superuser', False))
+
+    @staticmethod
+    async def _token_is_superuser(headers: dict) -> bool:
+        scheme, _, token = headers.get(b'authorization', b'').decode('latin-1').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return False
+        try:
+            user = await jwt_authentication(token)
+        except Exception:
+            return False
+        return user.is_superuser
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        profiler = Profiler(interval=settings.PROFILER_INTERVAL_SECONDS, async_mode='enabled')
+
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        logger.info(f'Profiled {scope["method"]} {scope["path"]}')
+        await HTMLResponse(profiler.output_html())(scope, receive, send)
+
+
+class NetworkAllowList:
+    """Serve the wrapped ASGI app only to clients from the given networks (403 for everyone else)."""
+
+    def __init__(self, app: ASGIApp, networks: list[str]):
+        self.app = app
+        self.networks = [ipaddress.ip_network(network, strict=False) for network in networks]
+
+    def _allowed(self, scope: Scope) -> bool:
+        client = scope.get('client')
+        if not client:
+            return False
+        try:
+            address = ipaddress.ip_address(client[0])
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http' and not self._allowed(scope):
+            await PlainTextResponse('Forbidden', status_code=403)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
@@ -1,20 +1,46 @@
 # core/registrar.py — Register app modules: logging, middleware, routers, exceptions
 
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination
+from prometheus_client import REGISTRY, CollectorRegistry, make_asgi_app, multiprocess
 
+from algorithms.llm.data_analysis.executor import analysis_executor
+from app.admin.service.login_log_service import login_log_sink
+from app.admin.service.retention_service import retention_service
+from app.admin.service.stream_service import stream_service
 from app.router import route
+from common.security.permission_index import permission_index
+from config.settings import settings
+from core.middleware import InstrumentationMiddleware, NetworkAllowList
+
+@asynccontextmanager
+async def register_init(app: FastAPI):
+    """Compile the permission index, start background writers, and flush them on shutdown."""
+    # Best effort: a database outage at boot must not stop the app; RBAC retries on first use
+    await permission_index.try_ensure()
+    login_log_sink.start()
+    retention_service.start()
+    yield
+    await stream_service.close()
+    await analysis_executor.shutdown()
+    await retention_service.close()
+    await login_log_sink.close()
 
 def register_app() -> FastAPI:
     """Create and configure FastAPI app."""
     app = FastAPI(
         title="Medical LLM QA System",
         description="A demo FastAPI backend for healthcare chatbot",
-        version="0.1.0"
+        version="0.1.0",
+        lifespan=register_init,
     )
 
     register_router(app)
     register_pagination(app)
+    register_instrumentation(app)
 
     return app
 
@@ -25,3 +51,14 @@ def register_router(app: FastAPI):
 def register_pagination(app: FastAPI):
     """Enable pagination in API responses."""
     add_pagination(app)
+
+def register_instrumentation(app: FastAPI):
+    """Request timing / Server-Timing middleware and the Prometheus /metrics endpoint (allow-listed networks only)."""
+    app.add_middleware(InstrumentationMiddleware)
+    if settings.METRICS_ENABLED:
+        registry = REGISTRY
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            # Several server workers: serve the sum over every worker's metric files
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        app.mount("/metrics", NetworkAllowList(make_asgi_app(registry), settings.METRICS_ALLOWED_NETWORKS))
@@ -3,45 +3,112 @@
 # 📁 Description:
 # Initializes the async and sync MySQL engines and sessions for the app.
 # Provides:
-# - AsyncSession for use in FastAPI
-# - SyncSession for migrations or scripts
+# - AsyncSession for use in FastAPI (primary, read-write)
+# - Read-only AsyncSession routed round-robin to MYSQL_REPLICA_HOSTS (falls back to primary)
+# - SyncSession for migrations or scripts, created lazily on first access
 # - Table creation helper
 # - UUID generator for primary keys
+#
+# Pools are sized from settings and recycle connections after MYSQL_POOL_RECYCLE
+# seconds instead of pinging on every checkout. Time spent waiting for a pooled
+# connection is exported as `db_pool_wait_seconds{pool}` to spot pool starvation.
+# Replicas lag the primary: only use the read session for listing/history views,
+# never to read back something the same request just wrote.
 # -----------------------------------------
 
+import itertools
+import time
 from typing import Annotated, AsyncGenerator
 from uuid import uuid4
 from urllib.parse import quote_plus
 
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from fastapi import Depends
 
 from config.settings import settings
+from common.metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT_SECONDS
 from common.model import MappedBase
-
-
-def create_engine_and_session(url: str):
-    engine = create_async_engine(url, echo=settings.MYSQL_ECHO, future=True, pool_pre_ping=True)
+from common.tracing import instrument_engine
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(pool=self.logging_name).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(pool=self.logging_name).observe(time.perf_counter() - start)
+
+
+def _mysql_url(driver: str, host: str, port: int) -> str:
+    return (
+        f'mysql+{driver}://{settings.MYSQL_USER}:{quote_plus(settings.MYSQL_PASSWORD)}@{host}:'
+        f'{port}/{settings.MYSQL_DATABASE}?charset={settings.MYSQL_CHARSET}'
+    )
+
+
+def create_engine_and_session(url: str, pool_name: str = 'primary'):
+    engine = create_async_engine(
+        url,
+        echo=settings.MYSQL_ECHO,
+        future=True,
+        poolclass=TimedAsyncQueuePool,
+        pool_size=settings.MYSQL_POOL_SIZE,
+        max_overflow=settings.MYSQL_MAX_OVERFLOW,
+        pool_timeout=settings.MYSQL_POOL_TIMEOUT,
+        # Recycle before MySQL's wait_timeout closes idle connections; avoids a ping per checkout
+        pool_recycle=settings.MYSQL_POOL_RECYCLE,
+        pool_logging_name=pool_name,
+    )
+    instrument_engine(engine)
     db_session = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
     return engine, db_session
 
 
 # Async engine (for FastAPI)
-SQLALCHEMY_DATABASE_URL = (
-    f'mysql+asyncmy://{settings.MYSQL_USER}:{quote_plus(settings.MYSQL_PASSWORD)}@{settings.MYSQL_HOST}:'
-    f'{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}?charset={settings.MYSQL_CHARSET}'
-)
+SQLALCHEMY_DATABASE_URL = _mysql_url('asyncmy', settings.MYSQL_HOST, settings.MYSQL_PORT)
 async_engine, async_db_session = create_engine_and_session(SQLALCHEMY_DATABASE_URL)
 
-# Sync engine (for Alembic or admin scripts)
-SQLALCHEMY_DATABASE_URL = (
-    f'mysql+pymysql://{settings.MYSQL_USER}:{quote_plus(settings.MYSQL_PASSWORD)}@{settings.MYSQL_HOST}:'
-    f'{settings.MYSQL_PORT}/{settings.MYSQL_DATABASE}?charset={settings.MYSQL_CHARSET}'
-)
-sync_engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SyncSession = sessionmaker(sync_engine)
+# Read replicas ("host" or "host:port"); without any, reads go to the primary
+_replica_sessions = []
+for _index, _replica in enumerate(settings.MYSQL_REPLICA_HOSTS):
+    _host, _, _port = _replica.partition(':')
+    _replica_sessions.append(
+        create_engine_and_session(
+            _mysql_url('asyncmy', _host, int(_port or settings.MYSQL_PORT)), pool_name=f'replica{_index}'
+        )[1]
+    )
+_replica_cycle = itertools.cycle(_replica_sessions or [async_db_session])
+
+
+def async_read_session() -> AsyncSession:
+    """Open a read-only session on the next replica (round-robin)."""
+    return next(_replica_cycle)()
+
+
+# Sync engine (for Alembic or admin scripts), built on first use so web workers never open it
+_sync = {}
+
+
+def __getattr__(name: str):
+    if name in ('sync_engine', 'SyncSession'):
+        if not _sync:
+            engine = create_engine(
+                _mysql_url('pymysql', settings.MYSQL_HOST, settings.MYSQL_PORT),
+                pool_recycle=settings.MYSQL_POOL_RECYCLE,
+            )
+            _sync.update(sync_engine=engine, SyncSession=sessionmaker(engine))
+        return _sync[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # Dependency for FastAPI routes
@@ -50,7 +117,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield current_db
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with async_read_session() as current_db:
+        yield current_db
+
+
 CurrentSession = Annotated[AsyncSession, Depends(get_db)]
+CurrentReadSession = Annotated[AsyncSession, Depends(get_read_db)]
 
 
 async def create_table():
@@ -0,0 +1,37 @@
+# db_redis.py
+# -----------------------------------------
+# 📁 Description:
+# Shared async Redis client.
+# Used for caches that must stay consistent across web workers
+# (authenticated users, dictionary/menu snapshots, version keys).
+# -----------------------------------------
+
+from redis.asyncio.client import Redis
+
+from config.settings import settings
+
+
+class RedisCli(Redis):
+    def __init__(self):
+        super().__init__(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            db=settings.REDIS_DATABASE,
+            socket_timeout=settings.REDIS_TIMEOUT,
+            decode_responses=True,
+        )
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Delete all keys under a prefix in SCAN batches (never KEYS on a live server)."""
+        batch = []
+        async for key in self.scan_iter(match=f'{prefix}*', count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self.delete(*batch)
+                batch.clear()
+        if batch:
+            await self.delete(*batch)
+
+
+redis_client = RedisCli()
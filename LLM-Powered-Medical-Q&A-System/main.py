@@ -1,10 +1,135 @@
 # main.py — Entry point for running the FastAPI app
+#
+#   python main.py                  ENVIRONMENT=dev: one uvicorn process with auto-reload
+#   python main.py --workers 8      gunicorn master + uvicorn workers (default when ENVIRONMENT=pro)
+#
+# Production mode loads the app and its read-only assets (tokenizer ranks, document parser
+# modules) once in the master before forking, so workers share those pages copy-on-write.
+# Anything holding sockets or tasks (DB pools, Redis, background writers) is created per
+# worker by the lifespan. Whenever workers are replaced (HUP, WINCH, SERVER_MAX_REQUESTS), the
+# old ones stop accepting connections and give in-flight SSE answers SERVER_DRAIN_SECONDS to finish.
+#
+# Because the app is preloaded, `kill -HUP <master>` only re-forks workers from the code the
+# master already holds; it does not pick up a new deploy. To deploy new code, swap masters:
+#   kill -USR2 <old master>     start a new master (new code) next to the old one
+#   kill -WINCH <old master>    drain and stop the old workers once the new ones are serving
+#   kill -QUIT <old master>     exit the old master (or kill -HUP it to roll back)
+#
+# Still per worker: live answer streams (resuming one needs sticky routing on X-Stream-Id),
+# the in-memory checkpointer tier and LLM admission slots (LLM_MAX_CONCURRENT_STREAMS counts
+# per worker, so divide the model server's capacity by the number of workers).
 
-from core.registrar import register_app
-import uvicorn
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+
+from loguru import logger
+
+from config.settings import settings
+
+
+def __getattr__(name: str):
+    # `uvicorn main:app` and the dev reloader import the app from here; build it on first access
+    if name == 'app':
+        from core.registrar import register_app
+
+        globals()['app'] = app = register_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def preload_assets() -> None:
+    """Load read-only assets in the master so forked workers share them instead of each loading a copy."""
+    from algorithms.llm.document_loaders.utils import encoder
+
+    encoder.encode('warm up')  # materializes the BPE rank tables
+    import algorithms.llm.document_loaders  # noqa: F401  PDF / Office parsers
+
+
+def keep_streams_on_shutdown() -> None:
+    """sse-starlette ends every open stream as soon as uvicorn gets SIGTERM; restore uvicorn's own
+    handler so in-flight answers finish within the graceful shutdown timeout instead."""
+    from sse_starlette.sse import AppStatus
+    from uvicorn.server import Server
+
+    original = getattr(AppStatus, 'original_handler', None)
+    if original is not None:
+        Server.handle_exit = original
+
+
+def prepare_multiprocess_metrics() -> None:
+    """Per-process metric files for prometheus_client; must run before any metric is defined."""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        # Files left by a previous run would be summed into the new one
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    else:
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = tempfile.mkdtemp(prefix='medqa-metrics-')
+
+
+def serve_production(host: str, port: int, workers: int) -> None:
+    prepare_multiprocess_metrics()
+
+    from gunicorn.app.base import BaseApplication
+    from prometheus_client import multiprocess
+    from uvicorn.workers import UvicornWorker
+
+    class DrainingUvicornWorker(UvicornWorker):
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, 'timeout_graceful_shutdown': settings.SERVER_DRAIN_SECONDS}
+
+    class ProductionServer(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            preload_assets()
+            from core.registrar import register_app
+
+            app = register_app()
+            keep_streams_on_shutdown()
+            # Move everything loaded so far out of the collector's reach: otherwise the first
+            # GC pass in each worker writes to these objects and un-shares their pages
+            gc.freeze()
+            return app
+
+    def child_exit(server, worker):
+        multiprocess.mark_process_dead(worker.pid)
+
+    if workers > 1 and settings.CHECKPOINT_BACKEND == 'memory':
+        logger.warning('CHECKPOINT_BACKEND=memory keeps chat state per worker; use redis for multi-worker deployments')
+
+    ProductionServer({
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'worker_class': DrainingUvicornWorker,
+        'preload_app': True,
+        # Leave the worker a little longer than its own drain before gunicorn kills it
+        'graceful_timeout': settings.SERVER_DRAIN_SECONDS + 10,
+        'max_requests': settings.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': settings.SERVER_MAX_REQUESTS // 10,
+        'child_exit': child_exit,
+    }).run()
 
-app = register_app()
 
 if __name__ == "__main__":
-    #  Launch the app in development mode
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default=settings.APP_HOST)
+    parser.add_argument('--port', type=int, default=settings.APP_PORT)
+    parser.add_argument('--workers', type=int, help=f'run the production server (default {settings.SERVER_WORKERS})')
+    args = parser.parse_args()
+
+    if args.workers is None and settings.ENVIRONMENT == 'dev':
+        #  Launch the app in development mode
+        import uvicorn
+
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True)
+    else:
+        serve_production(args.host, args.port, args.workers or settings.SERVER_WORKERS)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+import pytest
+
+# Needs the full application environment (SQLAlchemy, pydantic and the app's common packages)
+crud = pytest.importorskip('app.admin.crud.crud_login_log')
+mysql = pytest.importorskip('sqlalchemy.dialects.mysql')
+
+from app.admin.schema.login_log import CreateLoginLogParam  # noqa: E402
+
+
+def param(username: str) -> CreateLoginLogParam:
+    return CreateLoginLogParam(
+        user_uuid='uuid', username=username, status=1, ip='127.0.0.1', msg='ok', login_time=datetime.now()
+    )
+
+
+def test_bulk_insert_sets_created_time_on_every_row():
+    stmt = crud.login_log_dao.bulk_insert([param('alice'), param('bob'), param('carol')])
+    compiled = stmt.compile(dialect=mysql.dialect())
+
+    assert compiled.string.count('created_time') == 1
+    created = [value for key, value in compiled.params.items() if key.startswith('created_time')]
+    assert len(created) == 3
+    assert all(isinstance(value, datetime) for value in created)
+    assert [value for key, value in compiled.params.items() if key.startswith('username')] == ['alice', 'bob', 'carol']
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from algorithms.llm.retrieval.near_dup import NearDupIndex
+
+WORDS = (
+    'patient dose tablet daily renal hepatic monitor adverse reaction infusion pediatric adult '
+    'contraindicated pregnancy interaction warfarin clearance baseline follow weeks symptoms'
+).split()
+
+
+def paragraph(seed: int, n: int = 120) -> str:
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) + str(rng.randint(0, 50)) for _ in range(n))
+
+
+def revised(text: str) -> str:
+    # One changed word out of 120 keeps the estimated Jaccard well above 0.85
+    words = text.split()
+    words[60] = 'revised'
+    return ' '.join(words)
+
+
+A, B = paragraph(1), paragraph(2)
+
+
+def test_add_collapses_near_duplicates():
+    index = NearDupIndex()
+    assert index.add('d1', 'c1', A) is None
+    assert index.add('d1', 'c2', B) is None
+    assert index.add('d2', 'c3', revised(A)) == 'c1'
+    assert index.canonical == {'c3': 'c1'}
+    assert index.stats() == {'chunks': 3, 'collapsed': 1, 'documents': 2}
+
+
+def test_re_add_replaces_instead_of_collapsing_onto_itself():
+    index = NearDupIndex()
+    index.add('d1', 'c1', A)
+    assert index.add('d1', 'c1', A) is None
+    assert index.canonical == {}
+    assert index.stats() == {'chunks': 1, 'collapsed': 0, 'documents': 1}
+    # The stale entry is gone, so removal leaves nothing behind
+    assert index.remove_document('d1') == []
+    assert index.stats() == {'chunks': 0, 'collapsed': 0, 'documents': 0}
+    assert not index._buckets
+    assert index.add('d2', 'c2', A) is None
+
+
+def test_re_add_with_new_text_promotes_orphaned_duplicates():
+    index = NearDupIndex()
+    index.add('d1', 'c1', A)
+    assert index.add('d2', 'c2', revised(A)) == 'c1'
+    # c1 now holds unrelated text: c2 stands alone and has to be embedded
+    assert index.add('d1', 'c1', B) is None
+    assert index.take_promoted() == ['c2']
+    assert index.take_promoted() == []
+    assert index.group_of('c2') == 'c2'
+    assert index.group_of('c1') == 'c1'
+
+
+def test_re_add_with_same_text_keeps_group():
+    index = NearDupIndex()
+    index.add('d1', 'c1', A)
+    index.add('d2', 'c2', revised(A))
+    # c2 is promoted when c1 is dropped, then the new c1 collapses onto it
+    assert index.add('d1', 'c1', A) == 'c2'
+    assert index.take_promoted() == ['c2']
+    assert index.canonical == {'c1': 'c2'}
+
+
+def test_remove_document_promotes_collapsed_chunks():
+    index = NearDupIndex()
+    index.add('d1', 'c1', A)
+    index.add('d2', 'c2', revised(A))
+    index.add('d3', 'c3', revised(A) + ' extra')
+    assert index.remove_document('d1') == ['c2']
+    assert index.canonical == {'c3': 'c2'}
+    assert index.remove_document('d2') == ['c3']
+    assert index.canonical == {}
+    assert index.remove_document('unknown') == []
+
+
+def test_suppress_and_report():
+    index = NearDupIndex()
+    for i, text in enumerate([A, B]):
+        index.add('d1', f'a{i}', text)
+        index.add('d2', f'b{i}', revised(text))
+    hits = [{'chunk_id': c} for c in ('b0', 'a0', 'a1')]
+    assert [h['chunk_id'] for h in index.suppress(hits)] == ['b0', 'a1']
+    assert index.duplicate_report() == [
+        {'doc_id': 'd2', 'duplicate_of': 'd1', 'shared_chunks': 2, 'total_chunks': 2, 'ratio': 1.0}
+    ]
+
+
+def test_empty_text_is_its_own_group():
+    index = NearDupIndex()
+    assert index.add('d1', 'c1', '  ...  ') is None
+    assert index.add('d1', 'c1', '') is None
+    assert index.stats() == {'chunks': 1, 'collapsed': 0, 'documents': 1}
+
+
+def test_save_load_round_trip(tmp_path):
+    index = NearDupIndex()
+    index.add('d1', 'c1', A)
+    index.add('d2', 'c2', revised(A))
+    index.add('d2', 'c3', '')
+    path = str(tmp_path / 'kb.dedup.npz')
+    index.save(path)
+
+    loaded = NearDupIndex.load(path)
+    assert loaded.canonical == {'c2': 'c1'}
+    assert loaded.stats() == index.stats()
+    assert loaded.remove_document('d1') == ['c2']
+    with pytest.raises(ValueError):
+        NearDupIndex.load(path, num_perm=64)
@@ -0,0 +1,77 @@
+from algorithms.llm.chat.stream_parser import StreamClassifier
+
+
+def run(chunks):
+    classifier = StreamClassifier()
+    frames = []
+    for chunk in chunks:
+        frames.extend(classifier.feed(chunk))
+    frames.extend(classifier.flush())
+    # Merge across chunks so assertions don't depend on chunk boundaries
+    merged = []
+    for frame in frames:
+        if merged and merged[-1]['type'] == frame['type']:
+            merged[-1]['content'] += frame['content']
+        else:
+            merged.append(dict(frame))
+    return [(f['type'], f['content']) for f in merged]
+
+
+def test_plain_text():
+    assert run(['hello ', 'world']) == [('text', 'hello world')]
+
+
+def test_think_block():
+    assert run(['<think>plan</think>answer']) == [('think', 'plan'), ('text', 'answer')]
+
+
+def test_markers_split_across_chunks():
+    assert run(['a<thi', 'nk>b</th', 'ink>c']) == [('text', 'a'), ('think', 'b'), ('text', 'c')]
+    assert run(['x`', '``py', 'thon\nprint(1)\n`', '``y']) == [('text', 'x'), ('code', 'print(1)\n'), ('text', 'y')]
+
+
+def test_marker_split_one_char_per_chunk():
+    text = 'a<think>b</think>c```sql\nselect 1\n```d'
+    assert run(list(text)) == [('text', 'a'), ('think', 'b'), ('text', 'c'), ('code', 'select 1\n'), ('text', 'd')]
+
+
+def test_partial_marker_that_is_not_a_marker():
+    assert run(['a <th', 'ink about it']) == [('text', 'a <think about it')]
+    assert run(['cost `', '5`']) == [('text', 'cost `5`')]
+
+
+def test_language_tag_is_dropped():
+    assert run(['```python\nx = 1\n```']) == [('code', 'x = 1\n')]
+
+
+def test_single_line_fence():
+    assert run(['code: ```', 'x = 1; y = 2', '```']) == [('text', 'code: '), ('code', 'x = 1; y = 2')]
+    assert run(['```x = 1``` done']) == [('code', 'x = 1'), ('text', ' done')]
+
+
+def test_long_first_line_is_code_not_tag():
+    line = 'df.groupby("ward").agg({"los": "mean"})'
+    assert run(['```', line, '\n```']) == [('code', line + '\n')]
+
+
+def test_short_first_line_of_code_is_not_a_tag():
+    assert run(['```', 'print(df.head())', '\n```']) == [('code', 'print(df.head())\n')]
+    assert run(['```df.describe()\nx=1\n```']) == [('code', 'df.describe()\nx=1\n')]
+    assert run(['```', 'df.desc', 'ribe()\nx=1\n```']) == [('code', 'df.describe()\nx=1\n')]
+    assert run(['```x = 1\n```']) == [('code', 'x = 1\n')]
+
+
+def test_language_tags_with_symbols_are_dropped():
+    assert run(['```c++\nint x;\n```']) == [('code', 'int x;\n')]
+    assert run(['```objective-c\r\nid x;\n```']) == [('code', 'id x;\n')]
+    assert run(['```\nx = 1\n```']) == [('code', 'x = 1\n')]
+
+
+def test_unclosed_think_is_flushed():
+    assert run(['<think>still reasoning']) == [('think', 'still reasoning')]
+    assert run(['<think>partial </thi']) == [('think', 'partial </thi')]
+
+
+def test_unclosed_fence_is_flushed_as_code():
+    assert run(['```python\nx = 1']) == [('code', 'x = 1')]
+    assert run(['```', 'x = 1']) == [('code', 'x = 1')]
@@ -0,0 +1,68 @@
+# blob_store.py
+# -----------------------------------------
+# 📁 Description:
+# Content-addressed store for large parsed document text.
+# Parsed file content is compressed and written to local disk under its
+# SHA-256 digest; database rows keep only the digest, so listing file
+# metadata never pulls multi-MB text blobs through MySQL.
+#
+# Layout: <root>/<digest[:2]>/<digest>.z (zlib-compressed UTF-8)
+# Reads memory-map the compressed file and decompress straight from the
+# mapping, so the page cache is shared across workers.
+# -----------------------------------------
+
+import hashlib
+import mmap
+import os
+import tempfile
+import zlib
+
+from config.path_conf import LLM_CHAT_DIR
+
+
+class BlobStore:
+    def __init__(self, root: str, level: int = 6):
+        self.root = root
+        self.level = level
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], f'{digest}.z')
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def put(self, text: str) -> str:
+        """Store text and return its SHA-256 digest (identical text is stored once)."""
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file in the same directory, then rename atomically
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data, self.level))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> str:
+        """Load text by digest via a read-only memory map."""
+        with open(self._path(digest), 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return zlib.decompress(mm).decode('utf-8')
+
+    def delete(self, digest: str) -> None:
+        path = self._path(digest)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# Store for parsed chat/knowledge file content
+chat_blob_store = BlobStore(os.path.join(LLM_CHAT_DIR, 'blobs'))
@@ -0,0 +1,42 @@
+# build_tree.py
+# -----------------------------------------
+# 📁 Description:
+# Assemble flat parent/child rows (menus, departments) into a nested tree.
+# One pass indexes every node by id, a second attaches each node to its parent,
+# so building is O(n) instead of rescanning the list for every node's children.
+# Siblings keep the order of the input rows, or are sorted by `sort` when present.
+# -----------------------------------------
+
+from collections.abc import Sequence
+from typing import Any
+
+from utils.serializers import select_as_dict
+
+
+def get_tree_data(
+    row_list: Sequence[Any],
+    *,
+    parent_key: str = 'parent_id',
+    remove_null: bool = False,
+) -> list[dict]:
+    nodes = [dict(row) if isinstance(row, dict) else select_as_dict(row) for row in row_list]
+    if remove_null:
+        nodes = [{k: v for k, v in node.items() if v is not None} for node in nodes]
+
+    by_id = {node['id']: node for node in nodes}
+    tree = []
+    for node in nodes:
+        parent_id = node.get(parent_key)
+        if parent_id is None:
+            tree.append(node)
+        elif parent_id in by_id:
+            by_id[parent_id].setdefault('children', []).append(node)
+        # Nodes whose parent is not in the list (e.g. filtered out by role) are left out
+
+    if any('sort' in node for node in nodes):
+        stack = [tree]
+        while stack:
+            siblings = stack.pop()
+            siblings.sort(key=lambda n: n.get('sort') or 0)
+            stack.extend(n['children'] for n in siblings if 'children' in n)
+    return tree
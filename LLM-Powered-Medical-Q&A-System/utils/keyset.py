@@ -0,0 +1,57 @@
+# keyset.py
+# -----------------------------------------
+# 📁 Description:
+# Keyset (seek) pagination on (created_time, id) for append-only audit tables.
+# Instead of OFFSET, each page continues strictly after the last row of the
+# previous one, so page N costs the same as page 1 on a (…, created_time, id) index.
+# The cursor is an opaque url-safe token encoding that last (created_time, id).
+# -----------------------------------------
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.exception import errors
+
+
+def encode_cursor(created_time: datetime, pk: int) -> str:
+    raw = f'{created_time.isoformat()}|{pk}'.encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_time, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_time), int(pk)
+    except ValueError:
+        raise errors.RequestError(msg='Invalid pagination cursor')
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    *,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list, str | None]:
+    """Return one page of rows (newest first) and the cursor of the next page, if any."""
+    if cursor:
+        created_time, pk = decode_cursor(cursor)
+        # Expanded form of (created_time, id) < (:t, :id); MySQL turns it into an index range scan
+        stmt = stmt.where(
+            or_(
+                model.created_time < created_time,
+                and_(model.created_time == created_time, model.id < pk),
+            )
+        )
+    stmt = stmt.order_by(model.created_time.desc(), model.id.desc()).limit(limit + 1)
+    rows = list((await db.scalars(stmt)).all())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_time, rows[-1].id)
+    return rows, next_cursor
@@ -0,0 +1,57 @@
+# upload_stream.py
+# -----------------------------------------
+# 📁 Description:
+# Single-pass upload pipeline for user files.
+# The incoming UploadFile is read in bounded chunks; each chunk is hashed,
+# counted against the size limit and written to a temp file in one go, so
+# the upload is never re-read just to measure or fingerprint it.
+# -----------------------------------------
+
+import dataclasses
+import hashlib
+import os
+import tempfile
+
+from fastapi import UploadFile
+
+from common.exception import errors
+
+
+@dataclasses.dataclass
+class StreamedUpload:
+    path: str
+    sha256: str
+    size: int
+
+
+async def stream_upload(
+    file: UploadFile,
+    dest_dir: str,
+    *,
+    max_size: int,
+    chunk_size: int = 1024 * 1024,
+) -> StreamedUpload:
+    """Write an upload to a temp file in dest_dir while hashing it.
+
+    Raises RequestError as soon as the size limit is crossed; the partial temp file is removed.
+    The caller owns the returned temp file and should rename or remove it.
+    """
+    # Reject early when the client already told us the size
+    if file.size is not None and file.size > max_size:
+        raise errors.RequestError(msg=f'File exceeds the {max_size // (1024 * 1024)} MB upload limit')
+
+    hasher = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, suffix='.upload')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise errors.RequestError(msg=f'File exceeds the {max_size // (1024 * 1024)} MB upload limit')
+                hasher.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return StreamedUpload(path=tmp_path, sha256=hasher.hexdigest(), size=size)